@@ -0,0 +1,86 @@
+"""
+Benchmark: projecting large skill assets as text vs. as copy entries.
+
+Usage:
+    python benchmarks/bench_copy_assets.py [--files 40] [--size-mb 1] [--repeat 3]
+
+Builds a skill with large reference files, then writes it into a fresh
+project. "text" is the previous path: every file read into a string,
+carried in WritePlan.files and written back out. "copy" lists the files and
+puts their source paths in WritePlan.copies; apply_write_plan copies them
+in the kernel (reflink / copy_file_range / sendfile). Peak memory is the
+Python heap high-water mark (tracemalloc).
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.core.adapter_interface import WritePlan  # noqa: E402
+from vibe.core.scaffolding import apply_write_plan  # noqa: E402
+from vibe.templates.store import TemplateStore  # noqa: E402
+
+
+def make_skill(root: Path, files: int, size_mb: float) -> Path:
+    skill = root / "skills" / "big-sdk" / "references"
+    skill.mkdir(parents=True)
+    line = "- Example call: client.generate(prompt, model='fast', timeout=30)\n"
+    body = line * int(size_mb * 1024 * 1024 / len(line))
+    for i in range(files):
+        (skill / f"ref_{i}.md").write_text(f"# Reference {i}\n" + body, encoding="utf-8")
+    return root / "skills"
+
+
+def text_plan(skills_dir: Path) -> WritePlan:
+    store = TemplateStore()
+    plan = WritePlan()
+    for rel_path, content in store.tree(skills_dir).items():
+        plan.files[f".claude/skills/{rel_path}"] = content
+    return plan
+
+
+def copy_plan(skills_dir: Path) -> WritePlan:
+    store = TemplateStore()
+    plan = WritePlan()
+    for rel_path, path in store.listing(skills_dir).items():
+        plan.copies[f".claude/skills/{rel_path}"] = path
+    return plan
+
+
+def measure(build, skills_dir: Path, repeat: int):
+    best, peak = float("inf"), 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as project, redirect_stdout(StringIO()):
+            tracemalloc.start()
+            start = time.perf_counter()
+            apply_write_plan(build(skills_dir), Path(project), fsync=False)
+            best = min(best, time.perf_counter() - start)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        skills_dir = make_skill(Path(tmp), args.files, args.size_mb)
+        print(f"{args.files} files x {args.size_mb} MB\n")
+        print(f"{'plan':>5} {'ms':>9} {'peak MB':>9}")
+        for label, build in (("text", text_plan), ("copy", copy_plan)):
+            seconds, peak = measure(build, skills_dir, args.repeat)
+            print(f"{label:>5} {seconds * 1000:>9.1f} {peak / 1024 / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: single-pass FileIndex vs. one regex scan per requested file.
+
+Usage:
+    python benchmarks/bench_parser.py [--blocks 48] [--sizes 1,4,16]
+
+Sizes are response sizes in MB. Time per MB should stay flat for the
+single-pass parser as responses grow (linear scan).
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.llm.parser import parse_file_blocks  # noqa: E402
+
+
+def legacy_extract(response: str, filename: str):
+    pattern = re.compile(rf"\|\|\|FILE: {re.escape(filename)}\|\|\|(.*?)\|\|\|END_FILE\|\|\|", re.DOTALL)
+    match = pattern.search(response)
+    return match.group(1).strip() if match else None
+
+
+def build_response(size_mb: float, blocks: int) -> str:
+    body_size = int(size_mb * 1024 * 1024 / blocks)
+    line = "Lorem ipsum dolor sit amet | consectetur || adipiscing élit.\n"
+    body = (line * (body_size // len(line) + 1))[:body_size]
+    parts = ["Here are the files you asked for.\n"]
+    for i in range(blocks):
+        parts.append(f"|||FILE: file_{i}.md|||\n{body}\n|||END_FILE|||\n")
+    return "".join(parts)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=48)
+    parser.add_argument("--sizes", default="1,4,16")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'blocks':>7} {'index ms':>10} {'ms/MB':>8} {'regex ms':>10} {'speedup':>8}")
+    for size_mb in (float(s) for s in args.sizes.split(",")):
+        response = build_response(size_mb, args.blocks)
+        names = [f"file_{i}.md" for i in range(args.blocks)]
+
+        def single_pass():
+            index = parse_file_blocks(response)
+            for name in names:
+                index.view(index.get(name))
+
+        def per_file_regex():
+            for name in names:
+                legacy_extract(response, name)
+
+        indexed = best_of(single_pass, args.repeat)
+        legacy = best_of(per_file_regex, args.repeat)
+        print(f"{size_mb:>6.1f}MB {args.blocks:>7} {indexed * 1000:>10.1f} {indexed * 1000 / size_mb:>8.2f} "
+              f"{legacy * 1000:>10.1f} {legacy / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: compiled placeholder rendering vs. chained str.replace.
+
+Usage:
+    python benchmarks/bench_render.py [--sizes 0.01,0.1,1] [--repeat 20]
+
+Renders product contexts of the given sizes (MB) into the three prompt
+templates and the setup guides, the way `create` builds its prompts.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.config.paths import PROMPTS_DIR, TEMPLATES_DIR  # noqa: E402
+from vibe.templates.render import compile_template  # noqa: E402
+from vibe.utils.files import read_template  # noqa: E402
+
+
+def chained_replace(template: str, values: dict) -> str:
+    for key, value in values.items():
+        template = template.replace("{{" + key + "}}", value)
+    return template
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="0.01,0.1,1")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    templates = [read_template(name, PROMPTS_DIR) for name in ("analyst.md", "architect.md", "project_manager.md")]
+    templates += [read_template(name, TEMPLATES_DIR) for name in ("SETUP_GUIDE.md", "SETUP_GUIDE_ZH.md")]
+
+    print(f"{'context':>9} {'replace ms':>11} {'compiled ms':>12} {'speedup':>8}")
+    for size_mb in (float(s) for s in args.sizes.split(",")):
+        chunk = "- 用户可以创建、编辑和删除待办事项 (todo items)。\n"
+        text = (chunk * (int(size_mb * 1024 * 1024) // len(chunk.encode("utf-8")) + 1))
+        values = {
+            "user_request": text[: len(text) // 4],
+            "product_context": text,
+            "system_patterns": text,
+            "project_name": "demo-project",
+            # Unused by most templates: chained replace still scans for them
+            "SKILLS_DIR": ".agent/skills",
+        }
+
+        def replaced():
+            for template in templates:
+                chained_replace(template, values)
+
+        def compiled():
+            for template in templates:
+                compile_template(template).render(values)
+
+        assert all(chained_replace(t, values) == compile_template(t).render(values) for t in templates)
+        legacy = best_of(replaced, args.repeat)
+        fast = best_of(compiled, args.repeat)
+        print(f"{size_mb:>7.2f}MB {legacy * 1000:>11.3f} {fast * 1000:>12.3f} {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
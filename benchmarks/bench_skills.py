@@ -0,0 +1,88 @@
+"""
+Benchmark: eager skill loading vs. lazy skill handles.
+
+Usage:
+    python benchmarks/bench_skills.py [--skills 10,100,500] [--emitted 4] [--repeat 3]
+
+Builds synthetic skill libraries (SKILL.md.j2 + 5 reference files of ~20 KB
+each per skill) and materialises the content of --emitted skills, as an
+adapter projection would. "eager" is the previous loader: one walk that reads
+every file of every skill into memory. "lazy" lists the library, binds the
+handles and reads only the emitted skills. Peak memory is the Python heap
+high-water mark (tracemalloc).
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.core.skills import list_skills  # noqa: E402
+from vibe.templates.store import TemplateStore  # noqa: E402
+
+
+def make_library(root: Path, skills: int) -> None:
+    reference = "- Call the API with retries and a timeout; log the request id.\n" * 320
+    for i in range(skills):
+        skill = root / f"skill_{i:04d}"
+        (skill / "references").mkdir(parents=True)
+        (skill / "SKILL.md.j2").write_text(f"# Skill {i} for {{{{project_name}}}}\n", encoding="utf-8")
+        for j in range(5):
+            (skill / "references" / f"ref_{j}.md").write_text(reference, encoding="utf-8")
+
+
+def eager(root: Path, emitted: int) -> int:
+    files = TemplateStore().tree(root)
+    skills = {}
+    for rel_path, content in files.items():
+        name, _, file_name = rel_path.partition("/")
+        skills.setdefault(name, {})[file_name] = content
+    return sum(len(skills[name]) for name in sorted(skills)[:emitted])
+
+
+def lazy(root: Path, emitted: int) -> int:
+    library = list_skills(root, store=TemplateStore())
+    count = 0
+    for name in sorted(library)[:emitted]:
+        handle = library[name].bind({"project_name": "demo"})
+        count += sum(1 for file_name in handle if handle[file_name] is not None)
+    return count
+
+
+def measure(fn, root: Path, emitted: int, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(root, emitted)
+        best = min(best, time.perf_counter() - start)
+    # Memory in a separate pass: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    fn(root, emitted)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", default="10,100,500")
+    parser.add_argument("--emitted", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'skills':>7} {'eager ms':>9} {'eager MB':>9} {'lazy ms':>8} {'lazy MB':>8}")
+    for count in (int(n) for n in args.skills.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            make_library(root, count)
+            eager_s, eager_peak = measure(eager, root, args.emitted, args.repeat)
+            lazy_s, lazy_peak = measure(lazy, root, args.emitted, args.repeat)
+            print(f"{count:>7} {eager_s * 1000:>9.1f} {eager_peak / 1024 / 1024:>9.1f} "
+                  f"{lazy_s * 1000:>8.1f} {lazy_peak / 1024 / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: single-pass stack detection vs. per-keyword scans.
+
+Usage:
+    python benchmarks/bench_stack_detect.py [--sizes 0.01,0.1,1] [--repeat 10]
+
+Sizes are architecture document sizes in MB. "first-hit" is the old
+detector: one substring scan per keyword until the first hit, which is fast
+but matches "go" inside "google" and never scores more than one stack.
+"per-keyword" does the same word-boundary scoring as the new detector with
+one regex scan per keyword; "single-pass" is the new detector.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.core.stack_detect import STACK_DETECTOR, STACK_KEYWORDS  # noqa: E402
+
+LEGACY_MAPPING = {
+    "django": "02_stack_python_django.md",
+    "node": "02_stack_nodejs_express.md",
+    "express": "02_stack_nodejs_express.md",
+    "react": "02_stack_react_vite.md",
+    "vite": "02_stack_react_vite.md",
+    "go": "02_stack_go_gin.md",
+    "gin": "02_stack_go_gin.md",
+    "telegram": "02_stack_telegram_bot.md",
+    "bot": "02_stack_telegram_bot.md",
+    "postgres": "02_stack_postgresql.md",
+}
+
+
+def legacy_detect(text: str) -> str:
+    lower = text.lower()
+    for keyword, rule in LEGACY_MAPPING.items():
+        if keyword in lower:
+            return rule
+    return "02_stack_python_fastapi.md"
+
+
+WORD_PATTERNS = [re.compile(r"\b" + re.escape(keyword) + r"\b")
+                 for keywords in STACK_KEYWORDS.values() for keyword, _ in keywords]
+
+
+def per_keyword_words(text: str) -> list:
+    # Same word-boundary scoring, one regex scan per keyword
+    lower = text.lower()
+    return [len(pattern.findall(lower)) for pattern in WORD_PATTERNS]
+
+
+def build_document(size_mb: float, mention: str) -> str:
+    paragraph = ("The service exposes a REST API behind a load balancer; requests are validated, "
+                 "queued and persisted. Background workers process uploads and send notifications.\n")
+    body = paragraph * (int(size_mb * 1024 * 1024) // len(paragraph) + 1)
+    return body + mention
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="0.01,0.1,1")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'first-hit ms':>13} {'per-keyword ms':>15} {'single-pass ms':>15}")
+    for size_mb in (float(s) for s in args.sizes.split(",")):
+        document = build_document(size_mb, "Database: PostgreSQL with FastAPI.\n")
+        first_hit = best_of(lambda: legacy_detect(document), args.repeat)
+        per_keyword = best_of(lambda: per_keyword_words(document), args.repeat)
+        single = best_of(lambda: STACK_DETECTOR.detect(document), args.repeat)
+        print(f"{size_mb:>6.2f}MB {first_hit * 1000:>13.2f} {per_keyword * 1000:>15.2f} {single * 1000:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: cold template loading from the directory vs. the template pack.
+
+Usage:
+    python benchmarks/bench_templates.py [--latency-ms 0,1,5] [--repeat 5]
+
+Replays the template reads of one `create` (prompts, setup guides, rules,
+scripts and skills) with a cold TemplateStore. --latency-ms adds a delay to
+every filesystem call (stat, open, directory listing) to model a slow
+network filesystem; the pack only pays for opening one file.
+"""
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.config.paths import PROMPTS_DIR, RULES_DIR, TEMPLATES_DIR  # noqa: E402
+from vibe.core.scaffolding import load_static_assets  # noqa: E402
+from vibe.templates.pack import TemplatePack, build_pack  # noqa: E402
+from vibe.templates.store import TEMPLATE_STORE  # noqa: E402
+from vibe.utils.files import read_template  # noqa: E402
+
+CREATE_TEMPLATES = [
+    ("analyst.md", PROMPTS_DIR),
+    ("architect.md", PROMPTS_DIR),
+    ("project_manager.md", PROMPTS_DIR),
+    ("SETUP_GUIDE.md", TEMPLATES_DIR),
+    ("SETUP_GUIDE_ZH.md", TEMPLATES_DIR),
+    ("preflight.py", TEMPLATES_DIR),
+    ("02_stack_python_fastapi.md", RULES_DIR),
+]
+
+
+@contextmanager
+def slow_filesystem(latency_s: float):
+    """Delays every filesystem call and counts them."""
+    calls = {"n": 0}
+    patched = [(os, "stat"), (os, "scandir"), (os, "listdir"), (builtins, "open")]
+    originals = [(module, name, getattr(module, name)) for module, name in patched]
+
+    def delayed(fn):
+        def wrapper(*args, **kwargs):
+            calls["n"] += 1
+            if latency_s:
+                time.sleep(latency_s)
+            return fn(*args, **kwargs)
+        return wrapper
+
+    for module, name, fn in originals:
+        setattr(module, name, delayed(fn))
+    try:
+        yield calls
+    finally:
+        for module, name, fn in originals:
+            setattr(module, name, fn)
+
+
+def cold_create(pack_path):
+    TEMPLATE_STORE.clear()
+    TEMPLATE_STORE.pack = TemplatePack(pack_path) if pack_path else None
+    for filename, folder in CREATE_TEMPLATES:
+        read_template(filename, folder)
+    load_static_assets()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", default="0,1,5")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    original_pack = TEMPLATE_STORE.pack
+    with tempfile.TemporaryDirectory() as tmp:
+        pack_path = Path(tmp) / "templates.pack"
+        count = build_pack(TEMPLATES_DIR, pack_path)
+        print(f"{count} templates, pack {pack_path.stat().st_size} bytes\n")
+        print(f"{'latency':>8} {'dir ms':>9} {'dir calls':>10} {'pack ms':>9} {'pack calls':>11} {'speedup':>8}")
+        for latency_ms in (float(v) for v in args.latency_ms.split(",")):
+            results = {}
+            for label, path in (("dir", None), ("pack", pack_path)):
+                best, calls = float("inf"), 0
+                for _ in range(args.repeat):
+                    with slow_filesystem(latency_ms / 1000) as counter:
+                        start = time.perf_counter()
+                        cold_create(path)
+                        best = min(best, time.perf_counter() - start)
+                    calls = counter["n"]
+                results[label] = (best, calls)
+            (dir_s, dir_calls), (pack_s, pack_calls) = results["dir"], results["pack"]
+            print(f"{latency_ms:>6.1f}ms {dir_s * 1000:>9.2f} {dir_calls:>10} {pack_s * 1000:>9.2f} "
+                  f"{pack_calls:>11} {dir_s / pack_s:>7.1f}x")
+    TEMPLATE_STORE.clear()
+    TEMPLATE_STORE.pack = original_pack
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: serial vs. parallel atomic apply_write_plan.
+
+Usage:
+    python benchmarks/bench_write_plan.py [--files 300] [--latency-ms 0,1,5] [--repeat 3]
+
+Writes a plan of skill files (one folder per skill, as the Claude and
+Antigravity adapters produce) into an empty directory. "serial" is the
+previous writer: exists + mkdir + open/write per file, one after another.
+Both print the per-file status line, as apply_write_plan does.
+--latency-ms adds a delay to every filesystem call (mkdir, stat, open,
+rename) to model a network filesystem, where the per-call round trip
+dominates and concurrent writes overlap.
+"""
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vibe.core.adapter_interface import WritePlan  # noqa: E402
+from vibe.core.scaffolding import apply_write_plan, console  # noqa: E402
+
+
+@contextmanager
+def slow_filesystem(latency_s: float):
+    """Delays every filesystem call (sleep releases the GIL, like real I/O)."""
+    patched = [(os, "stat"), (os, "mkdir"), (os, "open"), (os, "replace"), (builtins, "open")]
+    originals = [(module, name, getattr(module, name)) for module, name in patched]
+
+    def delayed(fn):
+        def wrapper(*args, **kwargs):
+            if latency_s:
+                time.sleep(latency_s)
+            return fn(*args, **kwargs)
+        return wrapper
+
+    for module, name, fn in originals:
+        setattr(module, name, delayed(fn))
+    try:
+        yield
+    finally:
+        for module, name, fn in originals:
+            setattr(module, name, fn)
+
+
+def build_plan(files: int) -> WritePlan:
+    plan = WritePlan()
+    for i in range(files):
+        plan.files[f".claude/skills/skill_{i // 3}/file_{i % 3}.md"] = f"# Skill {i}\n" + "- rule\n" * 40
+    return plan
+
+
+def serial_apply(plan: WritePlan, root: Path) -> None:
+    for rel_path, content in plan.files.items():
+        full_path = root / rel_path
+        if full_path.exists():
+            continue
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        console.print(f"[green]✅ Created/Updated:[/green] {rel_path}")
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            fn(Path(tmp))
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--latency-ms", default="0,1,5")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plan = build_plan(args.files)
+    print(f"{args.files} files\n")
+    print(f"{'latency':>8} {'serial ms':>10} {'parallel ms':>12} {'+fsync ms':>10} {'speedup':>8}")
+    for latency_ms in (float(v) for v in args.latency_ms.split(",")):
+        with slow_filesystem(latency_ms / 1000), redirect_stdout(StringIO()):
+            serial = best_of(lambda root: serial_apply(plan, root), args.repeat)
+            parallel = best_of(lambda root: apply_write_plan(plan, root, fsync=False), args.repeat)
+            durable = best_of(lambda root: apply_write_plan(plan, root, fsync=True), args.repeat)
+        print(f"{latency_ms:>6.1f}ms {serial * 1000:>10.1f} {parallel * 1000:>12.1f} {durable * 1000:>10.1f} "
+              f"{serial / parallel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
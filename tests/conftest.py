@@ -1,7 +1,9 @@
 """
 Pytest configuration and fixtures.
 """
+import os
 import pytest
+import tempfile
 from unittest.mock import Mock, MagicMock
 from pathlib import Path
 import sys
@@ -9,6 +11,9 @@ import sys
 # Add package root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Keep LLM caches and history out of the user's home directory
+os.environ.setdefault("VIBE_CACHE_DIR", tempfile.mkdtemp(prefix="vibe-test-cache-"))
+
 @pytest.fixture
 def mock_llm_client():
     """Mock LLM Client."""
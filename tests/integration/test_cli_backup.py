@@ -0,0 +1,28 @@
+"""
+Integration tests for `vibe backup`.
+"""
+from typer.testing import CliRunner
+from vibe.cli.app import app
+from vibe.core.adapter_interface import WritePlan
+from vibe.core.backup import BackupStore
+from vibe.core.scaffolding import apply_write_plan
+
+runner = CliRunner()
+
+def test_backup_list_and_restore(tmp_path):
+    (tmp_path / "CLAUDE.md").write_text("my notes", encoding="utf-8")
+    apply_write_plan(WritePlan(files={"CLAUDE.md": "generated"}), tmp_path, mode="force")
+
+    result = runner.invoke(app, ["backup", "list", str(tmp_path)])
+    assert result.exit_code == 0, result.stdout
+    assert "CLAUDE.md" in result.stdout
+
+    [run] = BackupStore(tmp_path).runs()
+    result = runner.invoke(app, ["backup", "restore", run.run_id, str(tmp_path)])
+    assert result.exit_code == 0, result.stdout
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "my notes"
+
+def test_backup_restore_unknown_run(tmp_path):
+    (tmp_path / ".vibe").mkdir()
+    result = runner.invoke(app, ["backup", "restore", "19700101-000000", str(tmp_path)])
+    assert result.exit_code == 1
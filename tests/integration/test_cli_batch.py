@@ -0,0 +1,82 @@
+"""
+Integration tests for `create-batch`.
+"""
+import json
+from collections import Counter
+from typer.testing import CliRunner
+from unittest.mock import patch
+from vibe.cli.app import app
+
+runner = CliRunner()
+
+RESPONSES = {
+    "需求分析师": "|||FILE: productContext.md|||# Goal|||END_FILE|||",
+    "系统架构师": "|||FILE: systemPatterns.md|||Stack: Python FastAPI|||END_FILE|||",
+    "项目经理": "|||FILE: activeContext.md|||# Plan|||END_FILE|||",
+}
+
+# Prompts only embed the request for the Analyst and Architect; enough to tell projects apart
+PROMPTS = {
+    "analyst.md": "{{user_request}}",
+    "architect.md": "{{user_request}} {{product_context}}",
+    "project_manager.md": "{{product_context}} {{system_patterns}}",
+}
+
+def test_create_batch_retries_and_reports(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({
+        "defaults": {"no_plan": True},
+        "projects": [
+            {"path": "ok", "prompt": "todo app"},
+            {"path": "flaky", "prompt": "flaky app"},
+            {"path": "broken", "prompt": "broken app"},
+        ],
+    }), encoding="utf-8")
+    calls = Counter()
+
+    def fake_call(prompt_text, step_name, on_event=None, stop_after=None):
+        calls[(step_name, "flaky" in prompt_text, "broken" in prompt_text)] += 1
+        if step_name == "系统架构师" and "broken" in prompt_text:
+            raise SystemExit(1)
+        if step_name == "系统架构师" and "flaky" in prompt_text and calls[(step_name, True, False)] == 1:
+            raise SystemExit(1)
+        return RESPONSES[step_name]
+
+    with patch("vibe.cli.app.call_llm", side_effect=fake_call), \
+         patch("vibe.cli.app.read_template", side_effect=lambda name, folder: PROMPTS.get(name, name)):
+        result = runner.invoke(app, ["create-batch", str(manifest), "--workers", "2", "--retries", "1"])
+
+    assert result.exit_code == 1
+    assert "2/3 succeeded" in result.stdout
+    assert (tmp_path / "ok" / ".context" / "systemPatterns.md").exists()
+    assert (tmp_path / "flaky" / ".context" / "systemPatterns.md").exists()
+    # The retry resumed the flaky project: its Analyst ran only once
+    assert calls[("需求分析师", True, False)] == 1
+    assert calls[("系统架构师", True, False)] == 2
+    assert calls[("系统架构师", False, True)] == 2
+
+def test_create_batch_rejects_invalid_manifest(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps([{"path": "a"}]), encoding="utf-8")
+    result = runner.invoke(app, ["create-batch", str(manifest)])
+    assert result.exit_code == 1
+    assert "prompt or promptfile" in result.stdout
+
+def test_create_batch_leaves_existing_projects_untouched(tmp_path):
+    context_dir = tmp_path / "existing" / ".context"
+    context_dir.mkdir(parents=True)
+    (context_dir / "productContext.md").write_text("# Hand-written goal", encoding="utf-8")
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({
+        "defaults": {"no_plan": True},
+        "projects": [{"path": "existing", "prompt": "todo app"}],
+    }), encoding="utf-8")
+
+    with patch("vibe.cli.app.call_llm", side_effect=lambda *a, **k: RESPONSES[a[1]]) as mock_call:
+        result = runner.invoke(app, ["create-batch", str(manifest), "--retries", "0"], env={"COLUMNS": "200"})
+
+    assert result.exit_code == 1
+    assert "already a Vibe project" in result.stdout
+    mock_call.assert_not_called()
+    assert (context_dir / "productContext.md").read_text(encoding="utf-8") == "# Hand-written goal"
+    assert sorted(p.name for p in context_dir.iterdir()) == ["productContext.md"]
@@ -0,0 +1,62 @@
+"""
+Integration test: local scaffolding work overlaps the first LLM call.
+"""
+import threading
+from typer.testing import CliRunner
+from unittest.mock import patch
+from vibe.cli import app as app_module
+from vibe.cli.app import app
+
+runner = CliRunner()
+
+RESPONSES = {
+    "需求分析师": "|||FILE: productContext.md|||# Goal|||END_FILE|||",
+    "系统架构师": "|||FILE: systemPatterns.md|||Stack: Python FastAPI|||END_FILE|||",
+}
+
+def test_static_assets_load_while_analyst_runs(tmp_path):
+    loaded = threading.Event()
+    seen_during_llm = []
+    real_loader = app_module.load_static_assets
+
+    def loader():
+        bundle = real_loader()
+        loaded.set()
+        return bundle
+
+    def fake_call(prompt_text, step_name, on_event=None, stop_after=None):
+        if step_name == "需求分析师":
+            # The skills walk finishes without waiting for the LLM to return
+            seen_during_llm.append(loaded.wait(timeout=5))
+        return RESPONSES[step_name]
+
+    project_dir = tmp_path / "overlap"
+    with patch("vibe.cli.app.call_llm", side_effect=fake_call), \
+         patch("vibe.cli.app.load_static_assets", side_effect=loader):
+        result = runner.invoke(app, ["create", str(project_dir), "--prompt", "todo app", "--no-plan"], input="y\n")
+
+    assert result.exit_code == 0, result.stdout
+    assert seen_during_llm == [True]
+    assert (project_dir / ".git").exists()
+    assert (project_dir / "NEXT_STEPS.md").exists()
+    assert "overlap" in (project_dir / "SETUP_GUIDE.md").read_text(encoding="utf-8")
+
+def test_prefetch_executor_shut_down_when_llm_fails(tmp_path):
+    started = []
+    real_start = app_module._start_prefetch
+
+    def start(*args, **kwargs):
+        prefetch = real_start(*args, **kwargs)
+        started.append(prefetch["executor"])
+        return prefetch
+
+    def failing_call(prompt_text, step_name, on_event=None, stop_after=None):
+        raise SystemExit(1)
+
+    with patch("vibe.cli.app.call_llm", side_effect=failing_call), \
+         patch("vibe.cli.app._start_prefetch", side_effect=start):
+        result = runner.invoke(app, ["create", str(tmp_path / "failed"), "--prompt", "todo app", "--no-plan"], input="y\n")
+
+    assert result.exit_code == 1
+    assert len(started) == 1
+    assert started[0]._shutdown
@@ -0,0 +1,106 @@
+"""
+Integration tests for incremental `rebuild` / `plan`.
+"""
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from vibe.cli.app import app
+
+runner = CliRunner()
+
+RESPONSES = {
+    "需求分析师": "|||FILE: productContext.md|||# Goal|||END_FILE|||",
+    "系统架构师": "|||FILE: systemPatterns.md|||Stack: Python FastAPI|||END_FILE|||",
+    "项目经理": "|||FILE: activeContext.md|||# Plan|||END_FILE|||",
+}
+
+@pytest.fixture
+def project(tmp_path):
+    calls = []
+
+    def fake_call(prompt_text, step_name, on_event=None, stop_after=None):
+        calls.append(step_name)
+        return RESPONSES[step_name]
+
+    project_dir = tmp_path / "incremental"
+    with patch("vibe.cli.app.call_llm", side_effect=fake_call), \
+         patch("vibe.cli.app.apply_write_plan") as mock_apply:
+        result = runner.invoke(app, ["create", str(project_dir), "--prompt", "todo app"], input="y\n")
+        assert result.exit_code == 0, result.stdout
+        calls.clear()
+        mock_apply.reset_mock()
+        yield project_dir, calls, mock_apply
+
+def test_rebuild_noop_when_up_to_date(project):
+    project_dir, calls, mock_apply = project
+    result = runner.invoke(app, ["rebuild", str(project_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert calls == []
+    assert result.stdout.count("up to date") == 4
+    mock_apply.assert_not_called()
+
+def test_rebuild_runs_only_downstream_of_edit(project):
+    project_dir, calls, mock_apply = project
+    patterns = project_dir / ".context" / "systemPatterns.md"
+    patterns.write_text(patterns.read_text(encoding="utf-8") + "\nUse Redis for caching.\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["rebuild", str(project_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert calls == ["项目经理"]
+    assert "systemPatterns.md changed" in result.stdout
+    # Same stack selection, so IDE rules are left alone
+    mock_apply.assert_not_called()
+
+    calls.clear()
+    assert runner.invoke(app, ["rebuild", str(project_dir)]).exit_code == 0
+    assert calls == []
+
+def test_rebuild_reprojects_rules_when_stack_changes(project):
+    project_dir, calls, mock_apply = project
+    (project_dir / ".context" / "systemPatterns.md").write_text("Stack: Django\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["rebuild", str(project_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert "stack selection changed" in result.stdout
+    mock_apply.assert_called_once()
+
+def test_rebuild_keeps_hand_edited_outputs(project):
+    project_dir, calls, _ = project
+    context_dir = project_dir / ".context"
+    (context_dir / "productContext.md").write_text("# Goal v2", encoding="utf-8")
+    (context_dir / "systemPatterns.md").write_text("Stack: FastAPI, edited", encoding="utf-8")
+
+    result = runner.invoke(app, ["rebuild", str(project_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert "but it was edited" in result.stdout
+    assert calls == ["项目经理"]
+    assert (context_dir / "systemPatterns.md").read_text(encoding="utf-8") == "Stack: FastAPI, edited"
+
+    calls.clear()
+    result = runner.invoke(app, ["rebuild", str(project_dir), "--force"])
+    assert calls == ["系统架构师", "项目经理"]
+
+def test_plan_skips_when_inputs_unchanged(project):
+    project_dir, calls, _ = project
+    result = runner.invoke(app, ["plan", str(project_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert calls == []
+    assert "up to date" in result.stdout
+
+    result = runner.invoke(app, ["plan", str(project_dir), "--refresh"])
+    assert calls == ["项目经理"]
+
+def test_plan_replans_after_agent_updates_active_context(project):
+    project_dir, calls, _ = project
+    active = project_dir / ".context" / "activeContext.md"
+    active.write_text("# Plan\n- [x] Phase 1 done\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["plan", str(project_dir)])
+    assert result.exit_code == 0, result.stdout
+    assert calls == ["项目经理"]
+    assert "edited by hand" not in result.stdout
+
+    calls.clear()
+    result = runner.invoke(app, ["plan", str(project_dir), "--force"])
+    assert result.exit_code == 0, result.stdout
+    assert calls == ["项目经理"]
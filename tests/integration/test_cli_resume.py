@@ -0,0 +1,75 @@
+"""
+Integration tests for checkpoint / resume of `create`.
+"""
+import pytest
+from typer.testing import CliRunner
+from unittest.mock import patch
+from vibe.cli.app import app
+
+runner = CliRunner()
+
+RESPONSES = {
+    "需求分析师": "|||FILE: productContext.md|||# Goal|||END_FILE|||",
+    "系统架构师": "|||FILE: systemPatterns.md|||Stack: Python FastAPI|||END_FILE|||",
+    "项目经理": "|||FILE: activeContext.md|||# Plan|||END_FILE|||",
+}
+
+@pytest.fixture
+def fake_llm():
+    calls = []
+    failing = set()
+
+    def fake_call(prompt_text, step_name, on_event=None, stop_after=None):
+        calls.append(step_name)
+        if step_name in failing:
+            raise SystemExit(1)
+        return RESPONSES[step_name]
+
+    with patch("vibe.cli.app.call_llm", side_effect=fake_call):
+        yield calls, failing
+
+def test_resume_skips_completed_stages(tmp_path, fake_llm):
+    calls, failing = fake_llm
+    project_dir = tmp_path / "resumable"
+
+    failing.add("系统架构师")
+    result = runner.invoke(app, ["create", str(project_dir), "--prompt", "todo app"])
+    assert result.exit_code != 0
+    assert (project_dir / ".vibe" / "state" / "productContext.json").exists()
+
+    # A plain re-run still refuses the existing project
+    result = runner.invoke(app, ["create", str(project_dir), "--prompt", "todo app"])
+    assert result.exit_code == 1
+    assert "--resume" in result.stdout
+
+    failing.clear()
+    calls.clear()
+    result = runner.invoke(app, ["resume", str(project_dir)], input="y\n")
+    assert result.exit_code == 0, result.stdout
+    assert calls == ["系统架构师", "项目经理"]
+    assert "跳过 productContext.md" in result.stdout
+    assert (project_dir / ".context" / "productContext.md").read_text(encoding="utf-8") == "# Goal"
+
+def test_resume_reruns_changed_request(tmp_path, fake_llm):
+    calls, _ = fake_llm
+    project_dir = tmp_path / "changed"
+    assert runner.invoke(app, ["create", str(project_dir), "--prompt", "todo app"], input="y\n").exit_code == 0
+
+    calls.clear()
+    result = runner.invoke(app, ["create", str(project_dir), "--prompt", "chat app", "--resume"], input="y\n")
+    assert result.exit_code == 0, result.stdout
+    # Upstream stages re-ran, but they produced the same architecture, so the plan is reused
+    assert calls == ["需求分析师", "系统架构师"]
+    assert "跳过 activeContext.md" in result.stdout
+
+def test_resume_refuses_project_without_recorded_run(tmp_path, fake_llm):
+    calls, _ = fake_llm
+    context_dir = tmp_path / "existing" / ".context"
+    context_dir.mkdir(parents=True)
+    (context_dir / "productContext.md").write_text("# Hand-written goal", encoding="utf-8")
+
+    result = runner.invoke(app, ["create", str(tmp_path / "existing"), "--prompt", "todo app", "--resume"])
+
+    assert result.exit_code == 1
+    assert calls == []
+    assert (context_dir / "productContext.md").read_text(encoding="utf-8") == "# Hand-written goal"
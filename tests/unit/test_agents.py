@@ -36,7 +36,7 @@ class TestAnalystAgent:
     @patch("vibe.agents.analyst.read_template")
     def test_execute_parsing_failure(self, mock_read, mock_call_llm):
         # Setup mocks
-        mock_read.return_value = "Template"
+        mock_read.return_value = "Template {{user_request}}"
         mock_call_llm.return_value = "Raw content without markers"
         
         agent = AnalystAgent()
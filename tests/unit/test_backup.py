@@ -0,0 +1,87 @@
+"""
+Unit tests for the content-addressed backup store.
+"""
+import os
+from vibe.core.adapter_interface import WritePlan
+from vibe.core.backup import BackupStore
+from vibe.core.scaffolding import apply_write_plan
+
+def _force_edit_cycle(project, text):
+    (project / "CLAUDE.md").write_text(text, encoding="utf-8")
+    return apply_write_plan(WritePlan(files={"CLAUDE.md": "generated"}), project, mode="force")
+
+def test_identical_backups_share_one_object(tmp_path):
+    for _ in range(3):
+        _force_edit_cycle(tmp_path, "my notes")
+
+    store = BackupStore(tmp_path)
+    runs = store.runs()
+    assert len(runs) == 3
+    assert len({run.files["CLAUDE.md"]["sha256"] for run in runs}) == 1
+    assert len(list((tmp_path / ".vibe" / "backup" / "objects").rglob("*"))) == 2  # prefix dir + object
+
+def test_hardlinked_object_survives_replace(tmp_path):
+    report = _force_edit_cycle(tmp_path, "my notes")
+    assert report.written == ["CLAUDE.md"]
+
+    store = BackupStore(tmp_path)
+    [run] = store.runs()
+    sha = run.files["CLAUDE.md"]["sha256"]
+    assert store.read(sha) == b"my notes"
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "generated"
+    # The object no longer shares its inode with the working file
+    assert os.stat(store.object_path(sha)).st_ino != os.stat(tmp_path / "CLAUDE.md").st_ino
+
+def test_release_detaches_links_of_files_not_replaced(tmp_path):
+    target = tmp_path / "CLAUDE.md"
+    target.write_text("my notes", encoding="utf-8")
+    store = BackupStore(tmp_path)
+    run = store.new_run()
+    sha = run.add("CLAUDE.md", target, link=True)
+
+    run.release(["CLAUDE.md"])
+
+    assert store.object_path(sha).name.endswith(".z")
+    target.write_text("edited in place", encoding="utf-8")
+    assert store.read(sha) == b"my notes"
+
+def test_files_with_other_names_are_copied_not_linked(tmp_path):
+    (tmp_path / "shared.md").write_text("hardlinked notes", encoding="utf-8")
+    os.link(tmp_path / "shared.md", tmp_path / "CLAUDE.md")
+    (tmp_path / "linked.md").write_text("symlinked notes", encoding="utf-8")
+    (tmp_path / "AGENTS.md").symlink_to(tmp_path / "linked.md")
+
+    apply_write_plan(WritePlan(files={"CLAUDE.md": "generated", "AGENTS.md": "generated"}), tmp_path, mode="force")
+
+    store = BackupStore(tmp_path)
+    [run] = store.runs()
+    for entry in run.files.values():
+        assert store.object_path(entry["sha256"]).name.endswith(".z")
+    (tmp_path / "shared.md").write_text("edited later", encoding="utf-8")
+    assert sorted(store.read(entry["sha256"]) for entry in run.files.values()) == [b"hardlinked notes", b"symlinked notes"]
+
+def test_retention_keeps_newest_runs_and_collects_objects(tmp_path):
+    for i in range(5):
+        _force_edit_cycle(tmp_path, f"notes {i}")
+
+    store = BackupStore(tmp_path, keep_runs=2)
+    assert store.prune() == (3, 3)
+    runs = store.runs()
+    assert [store.read(run.files["CLAUDE.md"]["sha256"]) for run in runs] == [b"notes 4", b"notes 3"]
+
+    store.keep_runs, store.max_bytes = 10, 1
+    assert store.prune() == (1, 1)
+    assert len(store.runs()) == 1  # The newest run is always kept
+
+def test_restore_puts_files_back_and_backs_up_current(tmp_path):
+    _force_edit_cycle(tmp_path, "my notes")
+    store = BackupStore(tmp_path)
+    [run] = store.runs()
+
+    report = store.restore(run.run_id)
+
+    assert report.written == ["CLAUDE.md"]
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "my notes"
+    newest = store.runs()[0]
+    assert newest.run_id != run.run_id
+    assert store.read(newest.files["CLAUDE.md"]["sha256"]) == b"generated"
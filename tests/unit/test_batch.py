@@ -0,0 +1,49 @@
+"""
+Unit tests for batch manifests.
+"""
+import json
+import pytest
+from vibe.core.batch import BatchOutcome, BatchEntry, load_manifest, summarize
+
+def test_load_yaml_manifest_with_defaults(tmp_path):
+    (tmp_path / "req.md").write_text("# Chat", encoding="utf-8")
+    manifest = tmp_path / "batch.yaml"
+    manifest.write_text(
+        "defaults:\n  ide: claude\nprojects:\n"
+        "  - path: apps/todo\n    prompt: todo app\n"
+        "  - path: apps/chat\n    promptfile: req.md\n    ide: cursor\n",
+        encoding="utf-8",
+    )
+    entries = load_manifest(manifest)
+    assert [e.ide for e in entries] == ["claude", "cursor"]
+    assert entries[0].path == str(tmp_path / "apps" / "todo")
+    assert entries[1].promptfile == str(tmp_path / "req.md")
+
+def test_load_json_list_manifest(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps([{"path": "a", "prompt": "x"}]), encoding="utf-8")
+    assert load_manifest(manifest)[0].ide == "antigravity"
+
+@pytest.mark.parametrize("projects, message", [
+    ([], "non-empty"),
+    ([{"path": "a"}], "prompt or promptfile"),
+    ([{"path": "a", "prompt": "x", "colour": "red"}], "unknown keys"),
+    ([{"path": "a", "promptfile": "missing.md"}], "promptfile not found"),
+    ([{"path": "a", "prompt": "x"}, {"path": "./a", "prompt": "y"}], "duplicate"),
+])
+def test_invalid_manifests(tmp_path, projects, message):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps({"projects": projects}), encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        load_manifest(manifest)
+
+def test_summarize():
+    outcomes = [
+        BatchOutcome(BatchEntry("a"), True, 1, 2.0),
+        BatchOutcome(BatchEntry("b"), True, 2, 4.0),
+        BatchOutcome(BatchEntry("c"), False, 2, 1.0, "boom"),
+    ]
+    summary = summarize(outcomes, wall_s=5.0)
+    assert (summary.total, summary.succeeded, summary.failed) == (3, 2, 1)
+    assert summary.median_s == 3.0
+    assert summary.failures[0].error == "boom"
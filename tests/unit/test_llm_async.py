@@ -0,0 +1,99 @@
+"""
+Unit tests for the asyncio LLM API.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import pytest
+from vibe.llm import client as llm_client
+from vibe.llm.client import LLMError, LLMTimeoutError
+from vibe.llm.retry import NO_RETRY
+from vibe.agents.analyst import AnalystAgent
+
+class SlowClient:
+    """Streams one event per `delay` seconds and tracks concurrency."""
+    def __init__(self, text, delay=0.05):
+        self.text = text
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.closed = 0
+
+    async def stream_async(self, prompt, model_alias="default"):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            for ch in self.text:
+                await asyncio.sleep(self.delay)
+                yield SimpleNamespace(delta=ch, usage=None, error=None)
+        finally:
+            self.active -= 1
+            self.closed += 1
+
+class FailingClient:
+    async def stream_async(self, prompt, model_alias="default"):
+        raise RuntimeError("503 Service Unavailable")
+        yield  # pragma: no cover
+
+@pytest.fixture
+def fake_pool():
+    pool = Mock()
+    llm_client.configure_cache(enabled=False)
+    with patch.object(llm_client, "get_client_pool", return_value=pool):
+        yield pool
+    llm_client.configure_cache()
+    llm_client.set_llm_concurrency(llm_client.DEFAULT_CONCURRENCY)
+
+def test_acall_llm_respects_concurrency(fake_pool):
+    client = SlowClient("abc", delay=0.01)
+    fake_pool.get.return_value = client
+    llm_client.set_llm_concurrency(2)
+
+    async def main():
+        return await asyncio.gather(*(llm_client.acall_llm("p", f"s{i}") for i in range(5)))
+
+    assert asyncio.run(main()) == ["abc"] * 5
+    assert client.peak == 2
+
+def test_acall_llm_deadline_cancels_stream(fake_pool):
+    client = SlowClient("x" * 100, delay=0.05)
+    fake_pool.get.return_value = client
+
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(llm_client.acall_llm("p", "slow", timeout=0.1, retry_policy=NO_RETRY))
+    assert client.active == 0
+    assert client.closed == 1
+
+def test_acall_llm_cancellation_propagates(fake_pool):
+    client = SlowClient("x" * 100, delay=0.05)
+    fake_pool.get.return_value = client
+
+    async def main():
+        task = asyncio.create_task(llm_client.acall_llm("p", "cancel-me"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert client.active == 0
+
+def test_acall_llm_wraps_provider_errors(fake_pool):
+    fake_pool.get.return_value = FailingClient()
+    with pytest.raises(LLMError, match="503"):
+        asyncio.run(llm_client.acall_llm("p", "fail", retry_policy=NO_RETRY))
+
+def test_call_llm_exits_on_error(fake_pool):
+    fake_pool.get.return_value = FailingClient()
+    with pytest.raises(SystemExit):
+        llm_client.call_llm("p", "fail", retry_policy=NO_RETRY)
+
+@patch("vibe.agents.analyst.read_template")
+def test_agent_aexecute(mock_read, fake_pool):
+    mock_read.return_value = "Template {{user_request}}"
+    fake_pool.get.return_value = SlowClient("|||FILE: productContext.md|||\n# Async\n|||END_FILE|||", delay=0)
+
+    result = asyncio.run(AnalystAgent().aexecute({"user_request": "test"}))
+
+    assert result.success is True
+    assert result.content == "# Async"
@@ -0,0 +1,59 @@
+"""
+Unit tests for the LLM response cache.
+"""
+import os
+import time
+from vibe.llm.cache import ResponseCache, make_cache_key
+
+def test_cache_key_depends_on_all_inputs():
+    base = make_cache_key("prompt", "default", "1.0.0")
+    assert base == make_cache_key("prompt", "default", "1.0.0")
+    assert base != make_cache_key("prompt!", "default", "1.0.0")
+    assert base != make_cache_key("prompt", "other", "1.0.0")
+    assert base != make_cache_key("prompt", "default", "1.0.1")
+
+def test_cache_roundtrip_and_stats(tmp_path):
+    cache = ResponseCache(tmp_path)
+    key = make_cache_key("p", "default")
+
+    assert cache.get(key) is None
+    cache.put(key, "|||FILE: a.md|||A|||END_FILE|||")
+    assert cache.get(key) == "|||FILE: a.md|||A|||END_FILE|||"
+
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.writes == 1
+
+def test_cache_ttl_expiry(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=0)
+    cache.put("k", "value")
+    time.sleep(0.01)
+    assert cache.get("k") is None
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    # Make "a" the least recently used entry
+    past = time.time() - 100
+    os.utime(tmp_path / "a.json", (past, past))
+    cache.put("c", "C")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "B"
+    assert cache.get("c") == "C"
+    assert cache.stats.evictions == 1
+
+def test_cache_max_bytes(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=1)
+    cache.put("a", "A" * 100)
+    assert cache.get("a") is None
+
+def test_cache_stats_are_thread_safe(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    cache = ResponseCache(tmp_path)
+    cache.put("k", "v")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: cache.get("k" if i % 2 else "missing"), range(2000)))
+    assert cache.stats.hits == 1000
+    assert cache.stats.misses == 1000
@@ -0,0 +1,96 @@
+"""
+Unit tests for hedged LLM requests.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import pytest
+from vibe.llm import client as llm_client
+from vibe.llm.hedging import HedgePolicy, hedged_stream, percentile
+from vibe.llm.telemetry import CallRecord, StageHistory
+
+def _event(text):
+    return SimpleNamespace(delta=text, usage=None, error=None)
+
+class RacingClient:
+    """First stream is slow to start, later streams answer immediately."""
+    def __init__(self, slow_delay=1.0):
+        self.slow_delay = slow_delay
+        self.opened = 0
+        self.closed = []
+
+    async def stream_async(self, prompt, model_alias="default"):
+        index = self.opened
+        self.opened += 1
+        try:
+            if index == 0:
+                await asyncio.sleep(self.slow_delay)
+            yield _event(f"stream{index}")
+        finally:
+            self.closed.append(index)
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 95) == 95
+    assert percentile(samples, 50) == 50
+    assert percentile([7], 99) == 7
+
+def test_threshold_needs_history():
+    policy = HedgePolicy(enabled=True, min_samples=5, min_threshold_s=0)
+    assert policy.threshold([100] * 4) is None
+    assert policy.threshold([100] * 4 + [900]) == 0.9
+
+def test_hedged_stream_takes_faster_stream():
+    client = RacingClient()
+    record = CallRecord(step_name="Architect")
+
+    async def main():
+        stream = hedged_stream(lambda: client.stream_async("p"), 0.05, lambda: True, record)
+        return [e.delta async for e in stream]
+
+    assert asyncio.run(main()) == ["stream1"]
+    assert record.hedged and record.hedge_won
+    assert sorted(client.closed) == [0, 1]
+
+def test_hedged_stream_respects_budget():
+    client = RacingClient(slow_delay=0.1)
+
+    async def main():
+        stream = hedged_stream(lambda: client.stream_async("p"), 0.01, lambda: False)
+        return [e.delta async for e in stream]
+
+    assert asyncio.run(main()) == ["stream0"]
+    assert client.opened == 1
+
+def test_stage_history_hedge_budget(tmp_path):
+    history = StageHistory(tmp_path / "history.json")
+    assert not history.hedge_allowed(0.1)
+    for _ in range(10):
+        history.count_call(hedged=False)
+    assert history.hedge_allowed(0.1)
+    history.count_call(hedged=True)
+    assert not history.hedge_allowed(0.1)
+
+def test_acall_llm_hedges_slow_first_token(tmp_path):
+    history = StageHistory(tmp_path / "history.json")
+    for _ in range(20):
+        history.observe_latency("Architect", 50.0, 500.0)
+        history.count_call(hedged=False)
+    client = RacingClient()
+    pool = Mock()
+    pool.get.return_value = client
+
+    llm_client.configure_cache(enabled=False)
+    llm_client.configure_hedging(HedgePolicy(enabled=True, min_threshold_s=0.05))
+    try:
+        with patch.object(llm_client, "get_client_pool", return_value=pool), \
+             patch.object(llm_client, "get_stage_history", return_value=history):
+            result = asyncio.run(llm_client.acall_llm("p", "Architect"))
+    finally:
+        llm_client.configure_cache()
+        llm_client.configure_hedging(HedgePolicy())
+
+    assert result == "stream1"
+    record = llm_client.telemetry.last("Architect")
+    assert record.hedged and record.hedge_won
+    assert len(history.latencies("Architect")) == 21
@@ -0,0 +1,52 @@
+"""
+Unit tests for the single-pass file block parser.
+"""
+from vibe.llm.parser import extract_file_content, parse_file_blocks
+
+RESPONSE = (
+    "Sure, here you go.\n"
+    "|||FILE: a.md|||\n# A\nfirst\n|||END_FILE|||\n"
+    "|||FILE: b.py|||\n```python\nprint('héllo')\n```\n|||END_FILE|||\n"
+    "|||FILE: a.md|||\nsecond\n|||END_FILE|||\n"
+    "|||FILE: c.md|||\ntruncated"
+)
+
+def test_index_lists_all_blocks():
+    index = parse_file_blocks(RESPONSE)
+    assert [b.name for b in index] == ["a.md", "b.py", "a.md", "c.md"]
+    assert index.names() == ["a.md", "b.py", "c.md"]
+    assert index.duplicates() == {"a.md": 2}
+
+def test_duplicates_first_wins():
+    index = parse_file_blocks(RESPONSE)
+    assert index.text(index.get("a.md")) == "# A\nfirst"
+    assert [index.text(b) for b in index.all("a.md")] == ["# A\nfirst", "second"]
+    assert extract_file_content(RESPONSE, "a.md") == "# A\nfirst"
+
+def test_unterminated_block_is_flagged():
+    index = parse_file_blocks(RESPONSE)
+    assert index.get("c.md") is None
+    block = index.get("c.md", allow_unterminated=True)
+    assert not block.terminated
+    assert index.text(block) == "truncated"
+    assert extract_file_content(RESPONSE, "c.md") is None
+
+def test_missing_end_before_next_block():
+    index = parse_file_blocks("|||FILE: a|||x\n|||FILE: b|||y|||END_FILE|||")
+    assert not index.all("a")[0].terminated
+    assert index.text(index.get("b")) == "y"
+
+def test_fenced_content_and_views():
+    index = parse_file_blocks(RESPONSE)
+    block = index.get("b.py")
+    assert block.fenced
+    assert index.text(block).startswith("```python")
+    assert index.text(block, unfence=True) == "print('héllo')"
+    view = index.view(block, unfence=True)
+    assert isinstance(view, memoryview)
+    assert bytes(view).decode("utf-8") == "print('héllo')"
+
+def test_matches_legacy_semantics():
+    assert extract_file_content("no blocks here", "a.md") is None
+    assert extract_file_content("|||FILE: a.md|||  \n  x  \n|||END_FILE|||", "a.md") == "x"
+    assert extract_file_content("|||FILE: |||x|||END_FILE||| |||FILE: a.md|||y|||END_FILE|||", "a.md") == "y"
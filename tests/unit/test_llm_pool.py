@@ -0,0 +1,59 @@
+"""
+Unit tests for the LLM client pool.
+"""
+import os
+from unittest.mock import Mock
+from vibe.llm.pool import ClientPool
+
+def test_pool_reuses_clients(tmp_path):
+    user_conf = tmp_path / "config.yaml"
+    user_conf.write_text("a: 1", encoding="utf-8")
+    factory = Mock(side_effect=lambda u, p: Mock())
+
+    pool = ClientPool(factory)
+    first = pool.get(str(user_conf), "missing.yaml")
+    second = pool.get(str(user_conf), "missing.yaml")
+
+    assert first is second
+    assert factory.call_count == 1
+    assert pool.stats.created == 1
+    assert pool.stats.reuses == 1
+
+def test_pool_keys_by_model(tmp_path):
+    pool = ClientPool(lambda u, p: Mock())
+    a = pool.get("u.yaml", "p.yaml", "default")
+    b = pool.get("u.yaml", "p.yaml", "gemini-2.5-flash")
+    assert a is not b
+    assert len(pool) == 2
+
+def test_pool_reloads_on_config_change(tmp_path):
+    user_conf = tmp_path / "config.yaml"
+    user_conf.write_text("a: 1", encoding="utf-8")
+    pool = ClientPool(lambda u, p: Mock())
+
+    first = pool.get(str(user_conf), "p.yaml")
+    stat = user_conf.stat()
+    os.utime(user_conf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = pool.get(str(user_conf), "p.yaml")
+
+    assert first is not second
+    first.close.assert_called_once()
+    assert pool.stats.reloads == 1
+
+def test_pool_shutdown_closes_clients():
+    pool = ClientPool(lambda u, p: Mock())
+    client = pool.get("u.yaml", "p.yaml")
+    pool.shutdown()
+
+    client.close.assert_called_once()
+    assert len(pool) == 0
+    assert pool.stats.shutdowns == 1
+
+def test_config_paths_pick_up_local_config_created_later(tmp_path, monkeypatch):
+    from vibe.config.settings import Settings
+    monkeypatch.chdir(tmp_path)
+    user_config, _ = Settings.resolve_config_paths()
+    assert user_config != "./config.yaml"
+
+    (tmp_path / "config.yaml").write_text("models: {}", encoding="utf-8")
+    assert Settings.resolve_config_paths()[0] == "./config.yaml"
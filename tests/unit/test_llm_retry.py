@@ -0,0 +1,120 @@
+"""
+Unit tests for LLM retry handling.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import pytest
+from vibe.llm import client as llm_client
+from vibe.llm.client import LLMError, LLMTimeoutError
+from vibe.llm.retry import RetryPolicy, is_retryable_error
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        self.status_code = status_code
+        super().__init__(f"HTTP {status_code}")
+
+def test_is_retryable_error_classification():
+    assert is_retryable_error(StatusError(429))
+    assert is_retryable_error(StatusError(503))
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(LLMTimeoutError("Architect exceeded its 30s deadline"))
+    assert is_retryable_error(Exception("RESOURCE_EXHAUSTED: quota"))
+    assert not is_retryable_error(StatusError(400))
+    assert not is_retryable_error(ValueError("Model alias 'x' not found in registry."))
+
+def test_is_retryable_error_ignores_numbers_and_words_out_of_context():
+    assert is_retryable_error(Exception("Error code: 529 - overloaded"))
+    assert is_retryable_error(Exception("HTTP 502 from upstream"))
+    assert is_retryable_error(Exception("status_code=503"))
+    assert is_retryable_error(Exception("Request timed out."))
+    assert not is_retryable_error(ValueError("max_tokens must be <= 500"))
+    assert not is_retryable_error(ValueError("invalid timeout parameter"))
+    assert not is_retryable_error(ValueError("model is unavailable in this region"))
+
+def test_is_retryable_error_follows_cause():
+    try:
+        try:
+            raise StatusError(502)
+        except StatusError as inner:
+            raise LLMError("wrapped") from inner
+    except LLMError as outer:
+        assert is_retryable_error(outer)
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(backoff_base=1.0, backoff_cap=4.0, jitter=0.5)
+    for retry in range(1, 8):
+        delay = policy.backoff(retry)
+        ceiling = min(4.0, 2 ** (retry - 1))
+        assert ceiling * 0.5 <= delay <= ceiling
+    assert RetryPolicy(jitter=0).backoff(3) == 4.0
+
+class FlakyClient:
+    """Fails with the given errors before streaming the response."""
+    def __init__(self, errors, text="ok"):
+        self.errors = list(errors)
+        self.text = text
+        self.calls = 0
+
+    async def stream_async(self, prompt, model_alias="default"):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        yield SimpleNamespace(delta=self.text, usage=None, error=None)
+
+@pytest.fixture
+def fake_pool():
+    pool = Mock()
+    llm_client.configure_cache(enabled=False)
+    with patch.object(llm_client, "get_client_pool", return_value=pool):
+        yield pool
+    llm_client.configure_cache()
+
+FAST = RetryPolicy(max_attempts=3, backoff_base=0.001, backoff_cap=0.01)
+
+def test_acall_llm_retries_transient_errors(fake_pool):
+    client = FlakyClient([StatusError(503), StatusError(429)])
+    fake_pool.get.return_value = client
+
+    result = asyncio.run(llm_client.acall_llm("p", "flaky", retry_policy=FAST))
+
+    assert result == "ok"
+    assert client.calls == 3
+    record = llm_client.telemetry.last("flaky")
+    assert record.attempts == 3
+    assert record.retry_wait_s > 0
+
+def test_acall_llm_gives_up_after_max_attempts(fake_pool):
+    client = FlakyClient([StatusError(503)] * 5)
+    fake_pool.get.return_value = client
+
+    with pytest.raises(LLMError):
+        asyncio.run(llm_client.acall_llm("p", "down", retry_policy=FAST))
+    assert client.calls == 3
+
+def test_acall_llm_does_not_retry_permanent_errors(fake_pool):
+    client = FlakyClient([StatusError(401)])
+    fake_pool.get.return_value = client
+
+    with pytest.raises(LLMError):
+        asyncio.run(llm_client.acall_llm("p", "auth", retry_policy=FAST))
+    assert client.calls == 1
+
+def test_acall_llm_respects_overall_deadline(fake_pool):
+    client = FlakyClient([StatusError(503)] * 5)
+    fake_pool.get.return_value = client
+    policy = RetryPolicy(max_attempts=10, backoff_base=1.0, jitter=0, deadline=0.5)
+
+    with pytest.raises(LLMError):
+        asyncio.run(llm_client.acall_llm("p", "deadline", retry_policy=policy))
+    assert client.calls == 1
+
+def test_telemetry_window_keeps_retry_totals():
+    from vibe.llm.telemetry import Telemetry
+    collector = Telemetry(max_records=3)
+    for _ in range(10):
+        record = collector.start("step")
+        record.attempts = 2
+        record.retry_wait_s = 0.5
+    assert len(collector.records) == 3
+    assert collector.retry_totals() == {"retries": 10, "wait_s": 5.0}
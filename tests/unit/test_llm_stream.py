@@ -0,0 +1,169 @@
+"""
+Unit tests for streaming LLM calls and incremental block parsing.
+"""
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import pytest
+from vibe.llm import client as llm_client
+from vibe.llm.stream import IncrementalFileParser, ContextStreamWriter
+
+RESPONSE = (
+    "Sure, here you go.\n"
+    "|||FILE: productContext.md|||\n# Goal\nBuild it\n|||END_FILE|||\n"
+    "|||FILE: systemPatterns.md|||\n# Arch\n|||END_FILE|||\n"
+    "Anything else?"
+)
+
+def _collect(parser, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 13, len(RESPONSE)])
+def test_parser_handles_any_chunk_split(size):
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+    events = _collect(IncrementalFileParser(), chunks)
+
+    ends = [(e.filename, e.text) for e in events if e.kind == "end"]
+    assert ends == [("productContext.md", "# Goal\nBuild it"), ("systemPatterns.md", "# Arch")]
+
+    chunk_text = "".join(e.text for e in events if e.kind == "chunk" and e.filename == "productContext.md")
+    assert chunk_text.strip() == "# Goal\nBuild it"
+
+def test_parser_reports_open_block():
+    parser = IncrementalFileParser()
+    parser.feed("|||FILE: a.md|||partial")
+    assert parser.current_file == "a.md"
+    assert parser.completed == []
+
+def test_context_writer_writes_selected_files(tmp_path):
+    writer = ContextStreamWriter(tmp_path, ["productContext.md"])
+    for event in _collect(IncrementalFileParser(), [RESPONSE[:40], RESPONSE[40:]]):
+        writer(event)
+
+    assert (tmp_path / "productContext.md").read_text(encoding="utf-8") == "# Goal\nBuild it"
+    assert not (tmp_path / "systemPatterns.md").exists()
+
+def test_context_writer_rejects_path_escape(tmp_path):
+    writer = ContextStreamWriter(tmp_path / "ctx")
+    for event in IncrementalFileParser().feed("|||FILE: ../evil.md|||x|||END_FILE|||"):
+        writer(event)
+    assert not (tmp_path / "evil.md").exists()
+
+class FakeClient:
+    """Minimal stand-in for LLMClient.stream_async()."""
+    def __init__(self, events):
+        self.events = events
+        self.consumed = 0
+
+    async def stream_async(self, prompt, model_alias="default"):
+        for event in self.events:
+            self.consumed += 1
+            yield event
+
+def _events(text, size=10, usage=None):
+    events = [SimpleNamespace(delta=text[i:i + size], usage=None, error=None)
+              for i in range(0, len(text), size)]
+    events.append(SimpleNamespace(delta="", usage=usage, error=None))
+    return events
+
+def _pool_for(client):
+    pool = Mock()
+    pool.get.return_value = client
+    return pool
+
+@pytest.fixture
+def no_cache():
+    llm_client.configure_cache(enabled=False)
+    yield
+    llm_client.configure_cache()
+
+def test_call_llm_wraps_stream(tmp_path, no_cache):
+    client = FakeClient(_events(RESPONSE, size=25, usage=SimpleNamespace(output_tokens=42)))
+    writer = ContextStreamWriter(tmp_path)
+
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)):
+        response = llm_client.call_llm("prompt", "Analyst", on_event=writer)
+
+    assert response == RESPONSE
+    assert (tmp_path / "systemPatterns.md").read_text(encoding="utf-8") == "# Arch"
+    record = llm_client.telemetry.last("Analyst")
+    assert record.output_tokens == 42
+    assert record.ttft_ms is not None
+
+def test_sync_stream_llm_yields_deltas(no_cache):
+    client = FakeClient(_events(RESPONSE))
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)):
+        assert "".join(llm_client.stream_llm("prompt", "Analyst")) == RESPONSE
+
+def test_call_llm_stops_after_block(tmp_path, no_cache):
+    from vibe.llm.telemetry import StageHistory
+    history = StageHistory(tmp_path / "history.json")
+    history.observe_trailing("Analyst", 100)
+    client = FakeClient(_events(RESPONSE))
+
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)), \
+         patch.object(llm_client, "get_stage_history", return_value=history):
+        response = llm_client.call_llm("prompt", "Analyst", stop_after="productContext.md")
+
+    assert "|||END_FILE|||" in response
+    assert "systemPatterns.md" not in response
+    # The provider stream was not drained
+    assert client.consumed < len(client.events)
+    record = llm_client.telemetry.last("Analyst")
+    assert record.early_stopped is True
+    assert record.saved_tokens == 100
+
+def test_call_llm_learns_trailing_chatter(tmp_path, no_cache):
+    from vibe.llm.telemetry import StageHistory
+    history = StageHistory(tmp_path / "history.json")
+    client = FakeClient(_events(RESPONSE))
+
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)), \
+         patch.object(llm_client, "get_stage_history", return_value=history):
+        llm_client.call_llm("prompt", "Architect", stop_after="systemPatterns.md")
+
+    # No history yet: the first call runs to completion to calibrate
+    assert client.consumed == len(client.events)
+    assert history.expected_trailing("Architect") == len("Anything else?") // 4 + 1
+    assert StageHistory(tmp_path / "history.json").expected_trailing("Architect") is not None
+
+@pytest.fixture
+def tmp_cache(tmp_path):
+    from vibe.llm.cache import ResponseCache
+    cache = ResponseCache(tmp_path / "cache")
+    llm_client.configure_cache()
+    with patch.object(llm_client, "get_response_cache", return_value=cache):
+        yield cache
+
+def test_failed_stream_is_not_cached(tmp_path, tmp_cache):
+    def failing_writer(event):
+        raise OSError("disk full")
+
+    client = FakeClient(_events(RESPONSE))
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)):
+        with pytest.raises(OSError):
+            llm_client.call_llm("prompt", "Analyst", on_event=failing_writer)
+    assert tmp_cache.stats.writes == 0
+
+    # The next call goes to the provider and caches the complete response
+    client = FakeClient(_events(RESPONSE))
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)):
+        assert llm_client.call_llm("prompt", "Analyst") == RESPONSE
+    assert client.consumed == len(client.events)
+    assert tmp_cache.get(llm_client.make_cache_key("prompt", "default")) == RESPONSE
+
+def test_deliberate_stop_is_cached_with_its_block(tmp_path, tmp_cache):
+    from vibe.llm.telemetry import StageHistory
+    history = StageHistory(tmp_path / "history.json")
+    history.observe_trailing("Analyst", 100)
+    client = FakeClient(_events(RESPONSE))
+
+    with patch.object(llm_client, "get_client_pool", return_value=_pool_for(client)), \
+         patch.object(llm_client, "get_stage_history", return_value=history):
+        response = llm_client.call_llm("prompt", "Analyst", stop_after="productContext.md")
+
+    assert client.consumed < len(client.events)
+    assert tmp_cache.get(llm_client.make_cache_key("prompt", "default")) == response
+    assert "|||END_FILE|||" in response
@@ -0,0 +1,81 @@
+"""
+Unit tests for the generated-files manifest and skip-unchanged writes.
+"""
+import json
+import os
+from vibe.core.adapter_interface import WritePlan
+from vibe.core.backup import BackupStore
+from vibe.core.manifest import MANIFEST_PATH, Manifest, content_hash
+from vibe.core.scaffolding import apply_write_plan
+
+def test_reapplying_identical_plan_writes_nothing(tmp_path):
+    plan = WritePlan(files={"CLAUDE.md": "rules", ".claude/rules/01.md": "workflow"})
+    first = apply_write_plan(plan, tmp_path, mode="force")
+    assert sorted(first.written) == [".claude/rules/01.md", "CLAUDE.md"]
+    mtime = (tmp_path / "CLAUDE.md").stat().st_mtime_ns
+
+    second = apply_write_plan(plan, tmp_path, mode="force")
+
+    assert second.written == []
+    assert sorted(second.unchanged) == [".claude/rules/01.md", "CLAUDE.md"]
+    assert (tmp_path / "CLAUDE.md").stat().st_mtime_ns == mtime
+    assert not (tmp_path / ".vibe" / "backup").exists()
+
+def test_manifest_records_hash_and_template_version(tmp_path):
+    apply_write_plan(WritePlan(files={"CLAUDE.md": "rules"}), tmp_path, template_version="9.9")
+
+    data = json.loads((tmp_path / MANIFEST_PATH).read_text(encoding="utf-8"))
+    entry = data["files"]["CLAUDE.md"]
+    assert entry["sha256"] == content_hash("rules")
+    assert entry["template_version"] == "9.9"
+    assert entry["size"] == len("rules")
+
+def test_untouched_generated_file_is_updated_in_safe_mode(tmp_path):
+    apply_write_plan(WritePlan(files={"CLAUDE.md": "v1"}), tmp_path)
+    report = apply_write_plan(WritePlan(files={"CLAUDE.md": "v2"}), tmp_path, mode="safe")
+
+    assert report.written == ["CLAUDE.md"]
+    assert report.conflicted == []
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "v2"
+    assert Manifest(tmp_path).get("CLAUDE.md").sha256 == content_hash("v2")
+
+def test_user_modified_file_is_a_conflict(tmp_path):
+    apply_write_plan(WritePlan(files={"CLAUDE.md": "v1"}), tmp_path)
+    (tmp_path / "CLAUDE.md").write_text("v1 + my notes", encoding="utf-8")
+
+    safe = apply_write_plan(WritePlan(files={"CLAUDE.md": "v2"}), tmp_path, mode="safe")
+    assert (safe.written, safe.conflicted) == ([], ["CLAUDE.md"])
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "v1 + my notes"
+
+    forced = apply_write_plan(WritePlan(files={"CLAUDE.md": "v2"}), tmp_path, mode="force")
+    assert (forced.written, forced.conflicted) == (["CLAUDE.md"], ["CLAUDE.md"])
+    store = BackupStore(tmp_path)
+    [run] = store.runs()
+    assert store.read(run.files["CLAUDE.md"]["sha256"]) == b"v1 + my notes"
+
+def test_touched_generated_file_still_matches_its_hash(tmp_path):
+    plan = WritePlan(files={"CLAUDE.md": "line 1\nline 2\n"})
+    apply_write_plan(plan, tmp_path)
+    # Bytes on disk are the hashed bytes (no newline translation)
+    assert (tmp_path / "CLAUDE.md").read_bytes() == b"line 1\nline 2\n"
+    # A checkout or touch changes the mtime; the content hash must still match
+    os.utime(tmp_path / "CLAUDE.md", ns=(0, 0))
+
+    report = apply_write_plan(WritePlan(files={"CLAUDE.md": "line 1\nline 2\nline 3\n"}), tmp_path, mode="safe")
+    assert (report.written, report.conflicted) == (["CLAUDE.md"], [])
+
+def test_disk_hash_trusts_matching_stat(tmp_path):
+    target = tmp_path / "CLAUDE.md"
+    target.write_text("on disk", encoding="utf-8")
+    manifest = Manifest(tmp_path)
+    manifest.record("CLAUDE.md", "recorded-hash")
+
+    # Same size and mtime: the recorded hash is used without reading the file
+    assert manifest.disk_hash("CLAUDE.md", os.stat(target)) == "recorded-hash"
+    os.utime(target, ns=(0, 0))
+    assert manifest.disk_hash("CLAUDE.md", os.stat(target)) == content_hash("on disk")
+
+def test_corrupt_manifest_is_ignored(tmp_path):
+    (tmp_path / ".vibe").mkdir()
+    (tmp_path / MANIFEST_PATH).write_text("{not json", encoding="utf-8")
+    assert Manifest(tmp_path).entries == {}
@@ -1,9 +1,12 @@
 """
 Unit tests for Pipeline.
 """
+import time
+import pytest
 from unittest.mock import Mock
 from vibe.core.pipeline import Pipeline, PipelineStage
 from vibe.agents.base import AgentResult
+from vibe.core.state import StateStore
 
 def test_pipeline_execution():
     # Setup mock agents
@@ -55,3 +58,106 @@ def test_pipeline_interactive():
     results = pipeline.run({}, interactive_callback=callback)
     
     assert results[0].content == "New Content"
+
+def _agent(filename, content):
+    agent = Mock()
+    agent.name = filename
+    agent.output_filename = filename
+    agent.build_prompt.side_effect = lambda ctx: f"{filename}:{sorted(ctx.items())}"
+    agent.execute.return_value = AgentResult(content=content, filename=filename, success=True)
+    return agent
+
+def test_pipeline_resumes_unchanged_stages(tmp_path):
+    store = StateStore(tmp_path)
+    first, second = _agent("f1.md", "Res1"), _agent("f2.md", "Res2")
+    Pipeline([PipelineStage(agent=first), PipelineStage(agent=second)], state_store=store).run({"start": "val"})
+
+    first2, second2 = _agent("f1.md", "New1"), _agent("f2.md", "New2")
+    pipeline = Pipeline([PipelineStage(agent=first2), PipelineStage(agent=second2)], state_store=store)
+    results = pipeline.run({"start": "val"})
+
+    assert pipeline.skipped == ["f1", "f2"]
+    assert [r.content for r in results] == ["Res1", "Res2"]
+    first2.execute.assert_not_called()
+    second2.execute.assert_not_called()
+
+def test_pipeline_reruns_when_inputs_change(tmp_path):
+    store = StateStore(tmp_path)
+    Pipeline([PipelineStage(agent=_agent("f1.md", "Res1")), PipelineStage(agent=_agent("f2.md", "Res2"))],
+             state_store=store).run({"start": "val"})
+
+    first, second = _agent("f1.md", "Res1"), _agent("f2.md", "Res2")
+    pipeline = Pipeline([PipelineStage(agent=first), PipelineStage(agent=second)], state_store=store)
+    pipeline.run({"start": "changed"})
+
+    assert pipeline.skipped == []
+    first.execute.assert_called_once()
+
+def test_pipeline_builds_each_prompt_once_on_a_worker(tmp_path):
+    import threading
+    threads = []
+    agent = _agent("f1.md", "Res1")
+    build = agent.build_prompt.side_effect
+
+    def tracked(ctx):
+        threads.append(threading.current_thread())
+        return build(ctx)
+
+    agent.build_prompt.side_effect = tracked
+    Pipeline([PipelineStage(agent=agent)], state_store=StateStore(tmp_path)).run({"start": "val"})
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+    assert agent.execute.call_args.kwargs["prompt"] == "f1.md:[('start', 'val')]"
+
+def test_state_store_ignores_failed_results(tmp_path):
+    store = StateStore(tmp_path)
+    store.save("f1", "h", AgentResult(content="", filename="f1.md", success=False, error="boom"))
+    assert store.load("f1").result.error == "boom"
+    assert store.lookup("f1", "h") is None
+
+def _sleeper(key, delay, log):
+    def action(ctx):
+        log.append(("start", key, sorted(ctx)))
+        time.sleep(delay)
+        return {key: key.upper()}
+    action.__name__ = key
+    return action
+
+def test_pipeline_runs_independent_stages_concurrently():
+    log = []
+    stages = [
+        PipelineStage(action=_sleeper("a", 0.2, log), inputs=[], outputs=["a"]),
+        PipelineStage(action=_sleeper("b", 0.2, log), inputs=[], outputs=["b"]),
+        PipelineStage(action=_sleeper("c", 0.05, log), inputs=["a", "b"], outputs=["c"]),
+    ]
+    pipeline = Pipeline(stages, max_parallel=2)
+    start = time.monotonic()
+    pipeline.run({})
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.4
+    # c only starts once both of its inputs exist
+    assert log[-1] == ("start", "c", ["a", "b"])
+    assert pipeline.timings["c"].start >= max(pipeline.timings["a"].end, pipeline.timings["b"].end)
+    assert pipeline.critical_path()[-1] == "c"
+    assert len(pipeline.critical_path()) == 2
+
+def test_pipeline_respects_max_parallel():
+    log = []
+    stages = [PipelineStage(action=_sleeper(k, 0.1, log), inputs=[], outputs=[k]) for k in "ab"]
+    pipeline = Pipeline(stages, max_parallel=1)
+    pipeline.run({})
+    assert pipeline.timings["b"].start >= pipeline.timings["a"].end or \
+        pipeline.timings["a"].start >= pipeline.timings["b"].end
+
+def test_pipeline_rejects_unknown_inputs():
+    stage = PipelineStage(action=lambda ctx: None, name="x", inputs=["missing"])
+    with pytest.raises(ValueError, match="missing"):
+        Pipeline([stage]).run({})
+
+def test_pipeline_propagates_stage_errors():
+    def boom(ctx):
+        raise RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        Pipeline([PipelineStage(action=boom, inputs=[])]).run({})
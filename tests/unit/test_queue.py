@@ -0,0 +1,68 @@
+"""
+Unit tests for the SQLite job queue.
+"""
+import time
+from vibe.core.queue import JobQueue
+
+def test_enqueue_deduplicates_active_jobs(tmp_path):
+    queue = JobQueue(tmp_path / "q.db")
+    assert queue.enqueue("create", "/p/a", {"path": "/p/a"}) == 1
+    assert queue.enqueue("create", "/p/a", {"path": "/p/a"}) is None
+    assert queue.enqueue("plan", "/p/a", {"path": "/p/a"}) == 2
+    assert queue.counts()["pending"] == 2
+
+def test_claim_complete_and_retry(tmp_path):
+    queue = JobQueue(tmp_path / "q.db")
+    queue.enqueue("create", "/p/a", {"path": "/p/a"}, max_attempts=2)
+    queue.enqueue("create", "/p/b", {"path": "/p/b"})
+
+    job = queue.claim("w1:1")
+    assert (job.target, job.state, job.attempts) == ("/p/a", "running", 1)
+    assert queue.fail(job.id, "boom", "w1:1") == "pending"
+
+    # Failed job is retried before newer work, keeping FIFO order
+    again = queue.claim("w1:1")
+    assert (again.id, again.attempts) == (job.id, 2)
+    assert queue.fail(again.id, "boom again", "w1:1") == "failed"
+
+    other = queue.claim("w1:1")
+    queue.complete(other.id, "w1:1")
+    assert queue.claim("w1:1") is None
+    assert queue.counts() == {"pending": 0, "running": 0, "done": 1, "failed": 1}
+    assert queue.jobs("failed")[0].error == "boom again"
+
+    assert queue.retry_failed() == 1
+    assert queue.jobs("pending")[0].attempts == 0
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(tmp_path / "q.db", lease_seconds=0.05)
+    queue.enqueue("create", "/p/a", {"path": "/p/a"})
+    first = queue.claim("other-host:1")
+    time.sleep(0.1)
+    second = queue.claim("w2:2")
+    assert second.id == first.id
+    assert second.attempts == 2
+    assert second.error == "lease expired"
+    # The stale worker can no longer complete or extend the job
+    assert not queue.heartbeat(first.id, "other-host:1")
+
+def test_dead_local_worker_is_reclaimed(tmp_path):
+    import socket
+    queue = JobQueue(tmp_path / "q.db")
+    queue.enqueue("create", "/p/a", {"path": "/p/a"})
+    # PID far above any realistic pid_max: never alive
+    queue.claim(f"{socket.gethostname()}:999999999")
+    job = queue.claim("w2:2")
+    assert job is not None and "died" in job.error
+
+def test_stats_report_throughput(tmp_path):
+    queue = JobQueue(tmp_path / "q.db")
+    for name in "abc":
+        queue.enqueue("create", f"/p/{name}", {"path": f"/p/{name}"})
+    job = queue.claim("w:1")
+    queue.complete(job.id, "w:1")
+    stats = queue.stats()
+    assert stats.done_in_window == 1
+    assert stats.backlog == 2
+    assert stats.per_minute > 0
+    assert stats.eta_s is not None
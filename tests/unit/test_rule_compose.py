@@ -0,0 +1,88 @@
+"""
+Unit tests for multi-stack rule composition.
+"""
+from vibe.core.rule_compose import (
+    bundle_token_report, compose_stack_rules, estimate_tokens, parse_stack_rule,
+)
+from vibe.core.scaffolding import build_rule_bundle, select_stack_rules
+
+RULE_A = """---
+description: Alpha Best Practices
+globs: *.py
+---
+
+# Rule 02: Alpha Best Practices
+
+## Code Style
+- Use `black`.
+- Write tests first.
+
+## Testing
+- Use `pytest`.
+"""
+
+RULE_B = """---
+description: Beta Best Practices
+globs: *.ts, *.py
+---
+
+# Rule 02: Beta Best Practices
+
+## Testing
+- Write tests first.
+- Use `vitest`.
+
+## Deployment
+- Ship containers.
+"""
+
+def test_parse_stack_rule():
+    rule = parse_stack_rule("02_stack_alpha.md", RULE_A)
+    assert rule.label == "Alpha"
+    assert rule.globs == ["*.py"]
+    assert [heading for heading, _ in rule.sections] == ["Code Style", "Testing"]
+
+def test_single_rule_is_verbatim():
+    composition = compose_stack_rules([("a.md", RULE_A)])
+    assert composition.content == RULE_A
+    assert composition.included == ["a.md"]
+
+def test_compose_merges_sections_and_dedupes():
+    composition = compose_stack_rules([("a.md", RULE_A), ("b.md", RULE_B)])
+    content = composition.content
+    assert composition.included == ["a.md", "b.md"]
+    assert "globs: *.py, *.ts" in content
+    assert content.count("## Testing") == 1
+    assert content.count("Write tests first.") == 1
+    # Headings in first-appearance order, one sub-heading per stack
+    assert content.index("## Code Style") < content.index("## Testing") < content.index("## Deployment")
+    assert content.index("### Alpha\n- Use `pytest`.") < content.index("### Beta\n- Use `vitest`.")
+    assert composition.tokens == estimate_tokens(content)
+
+def test_budget_drops_lower_ranked_stacks():
+    budget = estimate_tokens(RULE_A) + 10
+    composition = compose_stack_rules([("a.md", RULE_A), ("b.md", RULE_B)], budget=budget)
+    assert composition.included == ["a.md"]
+    assert composition.dropped == ["b.md"]
+    assert composition.content == RULE_A
+
+def test_estimate_tokens_counts_cjk_per_character():
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("需求分析") == 4
+
+def test_bundle_includes_every_detected_stack():
+    patterns = "Frontend: React + Vite. Backend: FastAPI. Database: PostgreSQL."
+    assert select_stack_rules(patterns) == [
+        "02_stack_react_vite.md", "02_stack_postgresql.md", "02_stack_python_fastapi.md",
+    ]
+    bundle = build_rule_bundle({"system_patterns": patterns})
+    assert bundle.stacks == select_stack_rules(patterns)
+    stack_rule = bundle.rules["02_stack.md"]
+    for label in ("### React (Vite)", "### PostgreSQL", "### Python FastAPI"):
+        assert label in stack_rule
+    report = bundle_token_report(bundle.rules)
+    assert report["total"] == sum(v for k, v in report.items() if k != "total")
+
+def test_weak_secondary_stacks_are_ignored():
+    # A single "go" (half weight) does not pull in the Go rule
+    assert select_stack_rules("Django app; we go live in May") == ["02_stack_python_django.md"]
@@ -0,0 +1,66 @@
+"""
+Unit tests for skill template rendering.
+"""
+from vibe.core.adapter_registry import AdapterRegistry
+from vibe.core.scaffolding import build_rule_bundle, load_static_assets
+from vibe.core.skill_renderer import SkillRenderer, skill_context
+
+import vibe.core.adapters  # noqa: F401  (registers adapters)
+
+def test_skill_context():
+    assert skill_context("demo", "02_stack_go_gin.md") == {"project_name": "demo", "stack": "go_gin"}
+    assert skill_context("", "02_tech_stack_standards.md") == {}
+
+def test_render_skills_strips_suffix_and_caches():
+    renderer = SkillRenderer()
+    skills = {"demo": {
+        "SKILL.md.j2": "# {{project_name}} on {{stack}}\nRun {{SKILLS_DIR}}/demo/run.py {{ target_file }}",
+        "references/notes.md": "{{project_name}} stays verbatim",
+    }}
+    context = {"project_name": "shop", "stack": "go_gin"}
+
+    out = renderer.render_skills(skills, context)
+    assert out == {"demo": {
+        "SKILL.md": "# shop on go_gin\nRun {{SKILLS_DIR}}/demo/run.py {{ target_file }}",
+        "references/notes.md": "{{project_name}} stays verbatim",
+    }}
+    assert (renderer.hits, renderer.misses) == (0, 1)
+
+    renderer.render_skills(skills, dict(context))
+    assert (renderer.hits, renderer.misses) == (1, 1)
+
+    renderer.render_skills(skills, {"project_name": "blog", "stack": "go_gin"})
+    assert renderer.misses == 2
+
+def test_render_cache_is_bounded():
+    renderer = SkillRenderer(max_entries=2)
+    for name in ("a", "b", "c"):
+        renderer.render("{{project_name}}", {"project_name": name})
+    assert len(renderer._cache) == 2
+
+def test_projected_skills_use_ide_skills_dir():
+    bundle = build_rule_bundle(
+        {"system_patterns": "FastAPI service", "project_name": "acme"},
+        load_static_assets(),
+    )
+    doc_skill = bundle.skills["doc-maintainer"]
+    assert "SKILL.md" in doc_skill and "SKILL.md.j2" not in doc_skill
+    assert "**acme**" in doc_skill["SKILL.md"]
+
+    plan = AdapterRegistry.get("claude").project(bundle)
+    skill_md = plan.files[".claude/skills/lint_autofix/SKILL.md"]
+    assert "python .claude/skills/lint_autofix/scripts/fix_python.py {{ target_file }}" in skill_md
+    assert "{{SKILLS_DIR}}" not in skill_md
+
+    plan = AdapterRegistry.get("antigravity").project(bundle)
+    assert "python .agent/skills/test_generator/scripts/scaffold.py" in plan.files[".agent/skills/test_generator/SKILL.md"]
+
+def test_verbatim_skill_files_become_copies():
+    bundle = build_rule_bundle({"system_patterns": "FastAPI service"}, load_static_assets())
+    for ide, skills_dir in (("claude", ".claude/skills"), ("cursor", ".cursor/skills"), ("antigravity", ".agent/skills")):
+        plan = AdapterRegistry.get(ide).project(bundle)
+        source = plan.copies[f"{skills_dir}/my-llm-sdk/references/README.md"]
+        assert source.name == "README.md" and source.exists()
+        assert f"{skills_dir}/my-llm-sdk/references/README.md" not in plan.files
+        # Rendered skills stay text
+        assert f"{skills_dir}/doc-maintainer/SKILL.md" in plan.files
@@ -0,0 +1,72 @@
+"""
+Unit tests for lazy skill handles and skill selection.
+"""
+from pathlib import Path
+from vibe.core.adapter_registry import AdapterRegistry
+from vibe.core.scaffolding import build_rule_bundle, load_static_assets
+from vibe.core.skills import SkillHandle, list_skills, select_skills
+from vibe.templates.store import TemplateStore
+
+import vibe.core.adapters.claude  # noqa: F401  (registers the adapter)
+
+def _library(root):
+    (root / "py-lint" / "scripts").mkdir(parents=True)
+    (root / "py-lint" / "SKILL.md.j2").write_text("Lint {{project_name}} at {{SKILLS_DIR}}", encoding="utf-8")
+    (root / "py-lint" / "scripts" / "fix.py").write_text("print('fix')", encoding="utf-8")
+    (root / "notes").mkdir()
+    (root / "notes" / "SKILL.md").write_text("plain", encoding="utf-8")
+    (root / "README.md").write_text("loose file", encoding="utf-8")
+
+def test_list_skills_reads_nothing(tmp_path):
+    _library(tmp_path)
+    store = TemplateStore()
+    skills = list_skills(tmp_path, store=store)
+
+    assert list(skills) == ["notes", "py-lint"]
+    assert skills["py-lint"].files == ["SKILL.md.j2", "scripts/fix.py"]
+    assert skills["py-lint"].requires() == {"skills", "scripts"}
+    assert skills["notes"].requires() == {"skills"}
+    assert store.misses == 0 and len(store) == 0
+
+def test_bound_handle_loads_on_first_access(tmp_path):
+    _library(tmp_path)
+    store = TemplateStore()
+    handle = list_skills(tmp_path, store=store)["py-lint"].bind({"project_name": "shop"})
+
+    assert "SKILL.md" in handle and "SKILL.md.j2" not in handle
+    assert handle.loaded == []
+    assert handle["SKILL.md"] == "Lint shop at {{SKILLS_DIR}}"
+    assert handle["scripts/fix.py"] == tmp_path / "py-lint" / "scripts" / "fix.py"
+    assert store.misses == 1  # The script is copied later, never read
+    assert handle.size == len("Lint {{project_name}} at {{SKILLS_DIR}}") + len("print('fix')")
+
+def test_select_skills_by_stack_and_capabilities(tmp_path):
+    skills = {
+        "lint_autofix": SkillHandle("lint_autofix", {"SKILL.md": tmp_path / "a", "scripts/fix.py": tmp_path / "b"}),
+        "doc": SkillHandle("doc", {"SKILL.md": tmp_path / "c"}),
+    }
+
+    selected, skipped = select_skills(skills, ["02_stack_react_vite.md"])
+    assert list(selected) == ["doc"]
+    assert "react_vite" in skipped["lint_autofix"]
+
+    selected, _ = select_skills(skills, ["02_stack_react_vite.md", "02_stack_python_fastapi.md"])
+    assert list(selected) == ["lint_autofix", "doc"]
+
+    selected, skipped = select_skills(skills, ["02_stack_python_django.md"], frozenset({"skills"}))
+    assert list(selected) == ["doc"]
+    assert skipped["lint_autofix"] == "adapter lacks scripts"
+
+def test_bundle_emits_and_reads_only_selected_skills():
+    static = load_static_assets()
+    bundle = build_rule_bundle({"system_patterns": "React + Vite frontend", "project_name": "web"}, static)
+
+    assert set(bundle.skipped_skills) == {"lint_autofix", "test_generator"}
+    assert "doc-maintainer" in bundle.skills
+
+    plan = AdapterRegistry.get("claude").project(bundle)
+    emitted = {Path(p).parts[2] for p in list(plan.files) + list(plan.copies) if p.startswith(".claude/skills/")}
+    assert emitted == set(bundle.skills)
+    # Unselected skills are never read
+    assert static.skills["lint_autofix"].loaded == []
+    assert sorted(bundle.skills["doc-maintainer"].loaded) == sorted(bundle.skills["doc-maintainer"].files)
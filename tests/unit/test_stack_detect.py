@@ -0,0 +1,42 @@
+"""
+Unit tests for stack detection.
+"""
+import pytest
+from vibe.agents.injector import InjectorAgent
+from vibe.core.scaffolding import select_stack_rule
+from vibe.core.stack_detect import DEFAULT_STACK_RULE, KeywordMatcher, StackDetector
+
+def test_matcher_respects_word_boundaries():
+    matcher = KeywordMatcher(["go", "golang", "node.js", "postgres", "postgresql"])
+    text = "Go and golang, not google or good. Node.js talks to PostgreSQL (postgres)."
+    assert matcher.counts(text) == {"go": 1, "golang": 1, "node.js": 1, "postgresql": 1, "postgres": 1}
+    assert matcher.counts("chatbot gopher goes") == {}
+
+def test_detect_scores_all_stacks():
+    detector = StackDetector()
+    matches = detector.detect("Frontend: React + Vite. Backend: FastAPI. Database: PostgreSQL, postgres 16.")
+    rules = [m.rule for m in matches]
+    assert rules == ["02_stack_react_vite.md", "02_stack_postgresql.md", "02_stack_python_fastapi.md"]
+    assert matches[0].score == 2.0
+    assert matches[0].keywords == ("react", "vite")
+
+def test_ties_follow_priority_and_default():
+    detector = StackDetector()
+    assert detector.primary("Django with React") == "02_stack_python_django.md"
+    assert detector.primary("A plain Python service") == DEFAULT_STACK_RULE
+    assert detector.detect("") == []
+
+@pytest.mark.parametrize("text, rule", [
+    ("We use Google Cloud for a good user experience", DEFAULT_STACK_RULE),
+    ("Go 1.22 service with the Gin framework", "02_stack_go_gin.md"),
+    ("Telegram bot built with aiogram", "02_stack_telegram_bot.md"),
+    ("Express API on Node.js", "02_stack_nodejs_express.md"),
+])
+def test_call_sites_agree(text, rule):
+    assert select_stack_rule(text) == rule
+    assert InjectorAgent().detect_stack_rule(text) == rule
+
+def test_injector_keeps_legacy_attributes():
+    assert InjectorAgent.DEFAULT_STACK_RULE == DEFAULT_STACK_RULE
+    assert InjectorAgent.STACK_RULES_MAPPING["node"] == "02_stack_nodejs_express.md"
+    assert InjectorAgent.STACK_RULES_MAPPING["postgres"] == "02_stack_postgresql.md"
@@ -0,0 +1,77 @@
+"""
+Unit tests for the compiled placeholder renderer.
+"""
+import importlib
+import io
+import pytest
+from rich.console import Console
+from vibe.agents import AnalystAgent, ArchitectAgent, ProjectManagerAgent
+from vibe.config.paths import PROMPTS_DIR
+from vibe.core.skill_renderer import SkillRenderer
+from vibe.templates.render import TemplateRenderError, compile_template, render, render_checked
+from vibe.utils.files import read_template
+
+# vibe.templates re-exports the render() function under the module's name
+render_module = importlib.import_module("vibe.templates.render")
+
+def test_render_single_pass():
+    template = "Request: {{user_request}}\nContext: {{product_context}}"
+    # Values are not expanded again, even if they contain placeholders
+    out = render(template, user_request="use {{product_context}} literally", product_context="PRD")
+    assert out == "Request: use {{product_context}} literally\nContext: PRD"
+
+def test_unfilled_and_spaced_placeholders_are_kept():
+    template = "{{SKILLS_DIR}}/x and {{ target_file }} and {{other}}"
+    assert render(template, SKILLS_DIR=".agent/skills") == ".agent/skills/x and {{ target_file }} and {{other}}"
+    assert compile_template(template).placeholders == {"SKILLS_DIR", "other"}
+
+def test_check_and_strict_mode():
+    compiled = compile_template("Hi {{name}}, {{name}} from {{place}}")
+    assert compiled.check({"name": "A", "extra": 1}) == (["place"], ["extra"])
+    with pytest.raises(TemplateRenderError) as exc:
+        compiled.render({"name": "A", "extra": 1}, strict=True)
+    assert exc.value.missing == ["place"]
+    assert exc.value.unknown == ["extra"]
+    assert compiled.render({"name": "A", "place": 3}, strict=True) == "Hi A, A from 3"
+
+def test_compile_is_cached():
+    text = "cached {{x}}"
+    assert compile_template(text) is compile_template(text)
+
+@pytest.mark.parametrize("template_name, values", [
+    ("analyst.md", {"user_request"}),
+    ("architect.md", {"user_request", "product_context"}),
+    ("project_manager.md", {"product_context", "system_patterns"}),
+])
+def test_prompt_templates_match_agent_values(template_name, values):
+    compiled = compile_template(read_template(template_name, PROMPTS_DIR))
+    assert compiled.check(dict.fromkeys(values, "")) == ([], [])
+
+
+@pytest.fixture
+def warnings_out(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(render_module, "console", Console(file=out, width=200))
+    render_module._warn_unfilled.cache_clear()
+    return out
+
+def test_render_checked_warns_once_about_unfilled_slots(warnings_out):
+    template = "Run {{SKILS_DIR}}/x for {{project_name}}"
+    for _ in range(2):
+        out = render_checked(template, "01_workflow.md", {"SKILLS_DIR": ".agent/skills", "project_name": "shop"})
+    assert out == "Run {{SKILS_DIR}}/x for shop"
+    assert warnings_out.getvalue().count("01_workflow.md: no value for placeholder(s) SKILS_DIR") == 1
+
+def test_skill_renderer_leaves_skills_dir_quietly(warnings_out):
+    renderer = SkillRenderer()
+    out = renderer.render("# {{project_name}} at {{SKILLS_DIR}}", {"project_name": "shop", "stack": "go_gin"}, source="demo/SKILL.md.j2")
+    assert out == "# shop at {{SKILLS_DIR}}"
+    assert warnings_out.getvalue() == ""
+    renderer.render("# {{projectname}}", {"project_name": "shop"}, source="demo/README.md.j2")
+    assert "demo/README.md.j2: no value for placeholder(s) projectname" in warnings_out.getvalue()
+
+@pytest.mark.parametrize("agent_cls", [AnalystAgent, ArchitectAgent, ProjectManagerAgent])
+def test_agent_prompts_render_strictly(agent_cls):
+    context = {"user_request": "build a shop", "product_context": "PRD", "system_patterns": "SP"}
+    prompt = agent_cls().build_prompt(context)
+    assert "{{" not in prompt.replace("{{ ", "")
@@ -41,3 +41,209 @@ def test_render():
     template = "Hello {{name}}!"
     rendered = loader.render(template, name="World")
     assert rendered == "Hello World!"
+
+def test_store_caches_until_file_changes(tmp_path):
+    import os
+    from vibe.templates.store import TemplateStore
+    store = TemplateStore()
+    path = tmp_path / "rule.md"
+    path.write_text("v1", encoding="utf-8")
+
+    assert store.read(path) == "v1"
+    assert store.read(path) == "v1"
+    assert (store.hits, store.misses) == (1, 1)
+
+    path.write_text("version 2", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.read(path) == "version 2"
+    assert store.misses == 2
+
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        store.read(path)
+    assert len(store) == 0
+
+def test_store_preload_tree(tmp_path):
+    from vibe.templates.store import TemplateStore
+    (tmp_path / "skills" / "demo" / "scripts").mkdir(parents=True)
+    (tmp_path / "skills" / "demo" / "SKILL.md.j2").write_text("skill", encoding="utf-8")
+    (tmp_path / "skills" / "demo" / "scripts" / "run.py").write_text("print()", encoding="utf-8")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "x.pyc").write_bytes(b"\x00\xff")
+    (tmp_path / "logo.bin").write_bytes(b"\xff\xfe\x00")
+
+    store = TemplateStore()
+    assert store.preload(tmp_path) == 2
+    assert store.tree(tmp_path / "skills" / "demo") == {"SKILL.md.j2": "skill", "scripts/run.py": "print()"}
+    assert store.misses == 2
+
+def test_loader_reads_through_store(tmp_path):
+    from vibe.templates.store import TemplateStore
+    (tmp_path / "a.md").write_text("A", encoding="utf-8")
+    store = TemplateStore()
+    loader = TemplateLoader(tmp_path, store=store)
+    loader.load("a.md")
+    loader.load("a.md")
+    assert store.hits == 1
+
+def test_static_assets_match_template_tree():
+    from vibe.core.scaffolding import load_static_assets
+    from vibe.config.paths import TEMPLATES_DIR
+    bundle = load_static_assets()
+    # Skill templates keep their .j2 suffix until build_rule_bundle renders them
+    assert "SKILL.md.j2" in bundle.skills["doc-maintainer"]
+    assert "scripts/analyze.py.j2" in bundle.skills["doc-maintainer"]
+    expected = (TEMPLATES_DIR / "skills" / "doc-maintainer" / "SKILL.md.j2").read_text(encoding="utf-8")
+    assert bundle.skills["doc-maintainer"]["SKILL.md.j2"] == expected
+    # Verbatim files are only referenced by path
+    assert bundle.skills["my-llm-sdk"]["SKILL.md"] == TEMPLATES_DIR / "skills" / "my-llm-sdk" / "SKILL.md"
+
+def _template_tree(root):
+    (root / "rules").mkdir(parents=True)
+    (root / "rules" / "a.md").write_text("rule é", encoding="utf-8")
+    (root / "skills" / "demo").mkdir(parents=True)
+    (root / "skills" / "demo" / "SKILL.md.j2").write_text("skill", encoding="utf-8")
+    (root / "loader.py").write_text("# module, not a template", encoding="utf-8")
+
+def test_pack_round_trip(tmp_path):
+    import hashlib
+    from vibe.templates.pack import TemplatePack, build_pack
+    root = tmp_path / "templates"
+    _template_tree(root)
+    assert build_pack(root, tmp_path / "t.pack") == 2
+
+    pack = TemplatePack(tmp_path / "t.pack", root=root)
+    assert pack.names() == ["rules/a.md", "skills/demo/SKILL.md.j2"]
+    assert pack.read("rules/a.md") == "rule é"
+    assert pack.sha256("rules/a.md") == hashlib.sha256("rule é".encode("utf-8")).hexdigest()
+    assert pack.tree("skills") == {"demo/SKILL.md.j2": "skill"}
+    assert pack.relative(tmp_path / "elsewhere.md") is None
+    pack.close()
+
+def test_store_serves_unchanged_templates_from_pack(tmp_path):
+    import os
+    from vibe.templates.pack import TemplatePack, build_pack
+    from vibe.templates.store import TemplateStore
+    root = tmp_path / "templates"
+    _template_tree(root)
+    build_pack(root, tmp_path / "t.pack")
+
+    store = TemplateStore(pack=TemplatePack(tmp_path / "t.pack", root=root))
+    assert store.read(root / "rules" / "a.md") == "rule é"
+    assert store.tree(root / "skills" / "demo") == {"SKILL.md.j2": "skill"}
+    assert store.tree(root / "rules", suffix=".py") == {}
+    assert store.misses == 0  # Nothing opened on disk
+    with pytest.raises(FileNotFoundError):
+        store.read(root / "rules" / "missing.md")
+
+    # Paths outside the pack root still come from disk
+    (tmp_path / "other.md").write_text("disk", encoding="utf-8")
+    assert store.read(tmp_path / "other.md") == "disk"
+
+def test_store_trusts_pack_without_touching_the_directory(tmp_path, monkeypatch):
+    import shutil
+    from vibe.templates.pack import TemplatePack, build_pack
+    from vibe.templates.store import TemplateStore
+    root = tmp_path / "templates"
+    _template_tree(root)
+    build_pack(root, tmp_path / "t.pack")
+    store = TemplateStore(pack=TemplatePack(tmp_path / "t.pack", root=root))
+    shutil.rmtree(root)
+    (root / "rules").mkdir(parents=True)
+    (root / "rules" / "late.md").write_text("added after packing", encoding="utf-8")
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("filesystem accessed")
+
+    with monkeypatch.context() as m:
+        m.setattr("os.stat", no_stat)
+        m.setattr("os.walk", no_stat)
+        assert store.read(root / "rules" / "a.md") == "rule é"
+        assert store.tree(root / "skills") == {"demo/SKILL.md.j2": "skill"}
+        assert list(store.listing(root / "rules")) == ["a.md"]
+        assert store.file_digest(root / "rules" / "a.md")
+    # Paths the pack does not hold still come from the directory
+    assert store.read(root / "rules" / "late.md") == "added after packing"
+
+def test_dev_mode_follows_env_and_checkout(monkeypatch):
+    from vibe.templates.pack import DEV_ENV, dev_mode
+    monkeypatch.setenv(DEV_ENV, "0")
+    assert dev_mode() is False
+    monkeypatch.setenv(DEV_ENV, "1")
+    assert dev_mode() is True
+
+def test_dev_mode_store_falls_back_to_directory_for_stale_pack_entries(tmp_path):
+    import hashlib
+    from vibe.templates.pack import TemplatePack, build_pack
+    from vibe.templates.store import TemplateStore
+    root = tmp_path / "templates"
+    _template_tree(root)
+    build_pack(root, tmp_path / "t.pack")
+    store = TemplateStore(pack=TemplatePack(tmp_path / "t.pack", root=root, verify=True))
+
+    # Edited, added and removed after packing
+    (root / "rules" / "a.md").write_text("rule v2", encoding="utf-8")
+    (root / "rules" / "b.md").write_text("new rule", encoding="utf-8")
+    (root / "skills" / "demo" / "SKILL.md.j2").unlink()
+
+    assert store.read(root / "rules" / "a.md") == "rule v2"
+    assert store.read(root / "rules" / "b.md") == "new rule"
+    assert store.file_digest(root / "rules" / "a.md") == hashlib.sha256(b"rule v2").hexdigest()
+    assert store.tree(root / "rules") == {"a.md": "rule v2", "b.md": "new rule"}
+    assert store.listing(root / "skills") == {}
+    with pytest.raises(FileNotFoundError):
+        store.read(root / "skills" / "demo" / "SKILL.md.j2")
+
+def test_pack_leaves_out_package_modules(tmp_path):
+    from vibe.config.paths import TEMPLATES_DIR
+    from vibe.templates.pack import TemplatePack, build_pack
+    build_pack(TEMPLATES_DIR, tmp_path / "t.pack")
+    pack = TemplatePack(tmp_path / "t.pack")
+    assert [name for name in pack.names() if "/" not in name and name.endswith(".py")] == ["preflight.py"]
+    pack.close()
+
+def test_default_pack_fallback(tmp_path, monkeypatch):
+    from vibe.templates.pack import PACK_ENV, load_default_pack
+    monkeypatch.setenv(PACK_ENV, "0")
+    assert load_default_pack() is None
+    monkeypatch.setenv(PACK_ENV, str(tmp_path / "missing.pack"))
+    assert load_default_pack() is None
+    (tmp_path / "bogus.pack").write_bytes(b"not a pack")
+    monkeypatch.setenv(PACK_ENV, str(tmp_path / "bogus.pack"))
+    assert load_default_pack() is None
+
+def test_pack_lists_binary_assets_without_serving_them(tmp_path):
+    import hashlib
+    from vibe.templates.pack import TemplatePack, build_pack
+    from vibe.templates.store import TemplateStore
+    root = tmp_path / "templates"
+    _template_tree(root)
+    png = b"\x89PNG\r\n\x1a\n\xff\x00"
+    (root / "skills" / "demo" / "logo.png").write_bytes(png)
+    build_pack(root, tmp_path / "t.pack")
+
+    pack = TemplatePack(tmp_path / "t.pack", root=root)
+    assert pack.list("skills/demo") == ["SKILL.md.j2", "logo.png"]
+    assert pack.tree("skills/demo") == {"SKILL.md.j2": "skill"}
+    assert pack.read_bytes("skills/demo/logo.png") == png
+
+    store = TemplateStore(pack=pack)
+    assert store.listing(root / "skills") == {
+        "demo/SKILL.md.j2": root / "skills" / "demo" / "SKILL.md.j2",
+        "demo/logo.png": root / "skills" / "demo" / "logo.png",
+    }
+    assert store.file_digest(root / "skills" / "demo" / "logo.png") == hashlib.sha256(png).hexdigest()
+    pack.close()
+
+def test_store_file_digest_follows_changes(tmp_path):
+    import hashlib
+    import os
+    from vibe.templates.store import TemplateStore
+    asset = tmp_path / "asset.bin"
+    asset.write_bytes(b"\x00one")
+    store = TemplateStore()
+    assert store.file_digest(asset) == hashlib.sha256(b"\x00one").hexdigest()
+    asset.write_bytes(b"\x00two!")
+    os.utime(asset, ns=(1, 1))
+    assert store.file_digest(asset) == hashlib.sha256(b"\x00two!").hexdigest()
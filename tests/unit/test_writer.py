@@ -0,0 +1,148 @@
+"""
+Unit tests for the parallel atomic writer and apply_write_plan.
+"""
+import json
+import os
+from vibe.core.adapter_interface import WritePlan
+from vibe.core.backup import BackupStore
+from vibe.core.scaffolding import apply_write_plan
+import pytest
+from vibe.core import writer
+from vibe.core.writer import WriteOp, copy_file, write_files
+
+def test_write_files_creates_directories_and_leaves_no_temp_files(tmp_path):
+    ops = [WriteOp(f".claude/skills/s{i}/SKILL.md", tmp_path / f".claude/skills/s{i}/SKILL.md", f"skill {i}")
+           for i in range(20)]
+    report = write_files(ops, max_workers=4, fsync=True)
+
+    assert report.written == [op.rel_path for op in ops]
+    assert report.failed == {}
+    assert (tmp_path / ".claude/skills/s7/SKILL.md").read_text(encoding="utf-8") == "skill 7"
+    assert not [p for p in tmp_path.rglob("*.tmp")]
+    assert {"mkdir", "write", "fsync", "rename", "total"} <= set(report.timings)
+
+def test_write_files_replaces_atomically_and_keeps_mode(tmp_path):
+    target = tmp_path / "run.sh"
+    target.write_text("old", encoding="utf-8")
+    os.chmod(target, 0o750)
+    inode = target.stat().st_ino
+
+    report = write_files([WriteOp("run.sh", target, "new ✅", mode=0o750)])
+
+    assert report.written == ["run.sh"]
+    assert target.read_text(encoding="utf-8") == "new ✅"
+    assert target.stat().st_mode & 0o7777 == 0o750
+    # Replaced by rename, not rewritten in place
+    assert target.stat().st_ino != inode
+
+def test_write_files_writes_through_symlinks(tmp_path):
+    shared = tmp_path / "shared" / "AGENTS.md"
+    shared.parent.mkdir()
+    shared.write_text("old", encoding="utf-8")
+    link = tmp_path / "project" / "CLAUDE.md"
+    link.parent.mkdir()
+    link.symlink_to(shared)
+
+    report = write_files([WriteOp("CLAUDE.md", link, "new")])
+
+    assert report.written == ["CLAUDE.md"]
+    assert link.is_symlink()
+    assert shared.read_text(encoding="utf-8") == "new"
+    assert not [p for p in tmp_path.rglob("*.tmp")]
+
+def test_write_files_reports_failures_without_touching_others(tmp_path):
+    (tmp_path / "blocker").write_text("a file, not a directory", encoding="utf-8")
+    ops = [
+        WriteOp("blocker/a.md", tmp_path / "blocker" / "a.md", "a"),
+        WriteOp("ok.md", tmp_path / "ok.md", "ok"),
+    ]
+    report = write_files(ops)
+
+    assert report.written == ["ok.md"]
+    assert list(report.failed) == ["blocker/a.md"]
+    assert (tmp_path / "blocker").read_text(encoding="utf-8") == "a file, not a directory"
+
+def test_apply_write_plan_safe_mode(tmp_path):
+    (tmp_path / "CLAUDE.md").write_text("user edited", encoding="utf-8")
+    (tmp_path / ".gitignore").write_text("node_modules/\n", encoding="utf-8")
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / ".claude" / "settings.json").write_text(
+        json.dumps({"permissions": {"allow": ["Bash(ls)"]}}), encoding="utf-8")
+
+    plan = WritePlan(files={
+        "CLAUDE.md": "generated",
+        ".gitignore": ".vibe/\n",
+        ".claude/settings.json": json.dumps({"permissions": {"allow": ["Bash(pytest)"]}}),
+        ".claude/rules/01.md": "rule",
+    })
+    report = apply_write_plan(plan, tmp_path, mode="safe")
+
+    assert sorted(report.written) == [".claude/rules/01.md", ".claude/settings.json", ".gitignore"]
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "user edited"
+    assert (tmp_path / ".gitignore").read_text(encoding="utf-8") == "node_modules/\n\n.vibe/\n"
+    settings = json.loads((tmp_path / ".claude" / "settings.json").read_text(encoding="utf-8"))
+    assert settings["permissions"]["allow"] == ["Bash(ls)", "Bash(pytest)"]
+
+def test_apply_write_plan_force_mode_backs_up(tmp_path):
+    (tmp_path / "CLAUDE.md").write_text("old", encoding="utf-8")
+    report = apply_write_plan(WritePlan(files={"CLAUDE.md": "new"}), tmp_path, mode="force")
+
+    assert report.written == ["CLAUDE.md"]
+    assert (tmp_path / "CLAUDE.md").read_text(encoding="utf-8") == "new"
+    store = BackupStore(tmp_path)
+    [run] = store.runs()
+    assert store.read(run.files["CLAUDE.md"]["sha256"]) == b"old"
+
+def test_apply_write_plan_dry_run_writes_nothing(tmp_path):
+    assert apply_write_plan(WritePlan(files={"a/b.md": "x"}), tmp_path, dry_run=True) is None
+    assert not (tmp_path / "a").exists()
+
+def test_write_files_copies_binary_sources(tmp_path):
+    source = tmp_path / "src" / "logo.png"
+    source.parent.mkdir()
+    data = bytes(range(256)) * 1000
+    source.write_bytes(data)
+
+    report = write_files([WriteOp("assets/logo.png", tmp_path / "out" / "assets" / "logo.png", source=source)])
+
+    assert report.written == ["assets/logo.png"]
+    assert (tmp_path / "out" / "assets" / "logo.png").read_bytes() == data
+    assert report.stats["assets/logo.png"].st_size == len(data)
+
+@pytest.mark.parametrize("unsupported", [("copy_file_range",), ("copy_file_range", "sendfile")])
+def test_copy_file_falls_back(tmp_path, monkeypatch, unsupported):
+    source = tmp_path / "src.bin"
+    source.write_bytes(b"\x00\x01" * 50000)
+    monkeypatch.setattr(writer, "clone_file", lambda src_fd, dst_fd: False)
+
+    def fail(*args):
+        raise OSError("not supported")
+    for name in unsupported:
+        if hasattr(os, name):
+            monkeypatch.setattr(os, name, fail)
+
+    with open(tmp_path / "dst.bin", "wb") as dst:
+        method = copy_file(source, dst.fileno())
+    assert method not in unsupported
+    assert (tmp_path / "dst.bin").read_bytes() == source.read_bytes()
+
+def test_apply_write_plan_copies_and_skips_unchanged_copies(tmp_path):
+    source = tmp_path / "templates" / "diagram.png"
+    source.parent.mkdir()
+    source.write_bytes(b"\x89PNG\x00\xff")
+    project = tmp_path / "project"
+    plan = WritePlan(files={"CLAUDE.md": "rules"}, copies={".claude/skills/demo/diagram.png": source})
+
+    first = apply_write_plan(plan, project)
+    assert sorted(first.written) == [".claude/skills/demo/diagram.png", "CLAUDE.md"]
+    assert (project / ".claude/skills/demo/diagram.png").read_bytes() == b"\x89PNG\x00\xff"
+
+    second = apply_write_plan(plan, project, mode="force")
+    assert second.written == []
+    assert sorted(second.unchanged) == [".claude/skills/demo/diagram.png", "CLAUDE.md"]
+
+def test_apply_write_plan_reports_missing_copy_source(tmp_path):
+    plan = WritePlan(files={"CLAUDE.md": "rules"}, copies={"asset.bin": tmp_path / "missing.bin"})
+    report = apply_write_plan(plan, tmp_path / "project")
+    assert report.written == ["CLAUDE.md"]
+    assert list(report.failed) == ["asset.bin"]
@@ -4,6 +4,7 @@ Analyst Agent - Requirement Analysis.
 from vibe.agents.base import BaseAgent
 from vibe.config.paths import PROMPTS_DIR
 from vibe.utils.files import read_template
+from vibe.templates.render import render
 
 
 class AnalystAgent(BaseAgent):
@@ -26,4 +27,4 @@ class AnalystAgent(BaseAgent):
 
     def build_prompt(self, context: dict) -> str:
         template = read_template(self.template_name, PROMPTS_DIR)
-        return template.replace("{{user_request}}", context.get("user_request", ""))
+        return render(template, strict=True, user_request=context.get("user_request", ""))
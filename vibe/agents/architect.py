@@ -4,6 +4,7 @@ Architect Agent - System Design.
 from vibe.agents.base import BaseAgent
 from vibe.config.paths import PROMPTS_DIR
 from vibe.utils.files import read_template
+from vibe.templates.render import render
 
 
 class ArchitectAgent(BaseAgent):
@@ -26,6 +27,9 @@ class ArchitectAgent(BaseAgent):
 
     def build_prompt(self, context: dict) -> str:
         template = read_template(self.template_name, PROMPTS_DIR)
-        prompt = template.replace("{{user_request}}", context.get("user_request", ""))
-        prompt = prompt.replace("{{product_context}}", context.get("product_context", ""))
-        return prompt
+        return render(
+            template,
+            strict=True,
+            user_request=context.get("user_request", ""),
+            product_context=context.get("product_context", ""),
+        )
@@ -1,11 +1,13 @@
 """
 Agent Base Classes for Vibe-CLI.
 """
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional
 
-from vibe.llm.client import call_llm
+from vibe.llm.client import acall_llm, call_llm
+from vibe.llm.retry import RetryPolicy
 from vibe.llm.parser import extract_file_content
 
 
@@ -22,6 +24,15 @@ class AgentResult:
 class BaseAgent(ABC):
     """Abstract base class for all Agents."""
 
+    # Cancel generation once the output_filename block is complete
+    early_stop: bool = True
+
+    # Per-attempt LLM deadline in seconds (None = no deadline)
+    timeout: Optional[float] = None
+
+    # Retry behaviour for transient LLM failures (None = DEFAULT_RETRY_POLICY)
+    retry_policy: Optional[RetryPolicy] = None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -53,41 +64,77 @@ class BaseAgent(ABC):
         """
         pass
 
-    def execute(self, context: dict) -> AgentResult:
+    def execute(self, context: dict, prompt: Optional[str] = None) -> AgentResult:
         """
         Execute the agent's task.
         
         Args:
             context: Dictionary containing variables needed for prompt building.
+            prompt: The prompt, if the caller already built it from context.
         
         Returns:
             AgentResult containing the extracted content and metadata.
         """
         try:
-            prompt = self.build_prompt(context)
-            raw_response = call_llm(prompt, self.name)
-            content = extract_file_content(raw_response, self.output_filename)
-
-            if content:
-                return AgentResult(
-                    content=content,
-                    filename=self.output_filename,
-                    success=True,
-                    raw_response=raw_response
-                )
-            else:
-                # Fallback: use raw response if parsing fails
-                return AgentResult(
-                    content=raw_response,
-                    filename=self.output_filename,
-                    success=False,
-                    raw_response=raw_response,
-                    error=f"Could not parse {self.output_filename} from response"
-                )
+            if prompt is None:
+                prompt = self.build_prompt(context)
+            raw_response = call_llm(
+                prompt, self.name, stop_after=self._stop_after(), timeout=self.timeout, retry_policy=self.retry_policy
+            )
+            return self._build_result(raw_response)
         except Exception as e:
+            return self._error_result(e)
+
+    async def aexecute(self, context: dict, prompt: Optional[str] = None) -> AgentResult:
+        """
+        Async variant of execute(). Prompt building runs in a worker thread so
+        template I/O can overlap other agents' LLM waits. Cancelling the task
+        cancels the underlying LLM stream.
+        
+        Args:
+            context: Dictionary containing variables needed for prompt building.
+            prompt: The prompt, if the caller already built it from context.
+        
+        Returns:
+            AgentResult containing the extracted content and metadata.
+        """
+        try:
+            if prompt is None:
+                prompt = await asyncio.to_thread(self.build_prompt, context)
+            raw_response = await acall_llm(
+                prompt, self.name, stop_after=self._stop_after(), timeout=self.timeout, retry_policy=self.retry_policy
+            )
+            return self._build_result(raw_response)
+        except Exception as e:
+            return self._error_result(e)
+
+    def _stop_after(self) -> Optional[str]:
+        return self.output_filename if self.early_stop else None
+
+    def _build_result(self, raw_response: str) -> AgentResult:
+        content = extract_file_content(raw_response, self.output_filename)
+
+        if content:
             return AgentResult(
-                content="",
+                content=content,
+                filename=self.output_filename,
+                success=True,
+                raw_response=raw_response
+            )
+        else:
+            # Fallback: use raw response if parsing fails
+            return AgentResult(
+                content=raw_response,
                 filename=self.output_filename,
                 success=False,
-                error=str(e)
+                raw_response=raw_response,
+                error=f"Could not parse {self.output_filename} from response"
             )
+
+    def _error_result(self, error: Exception) -> AgentResult:
+        return AgentResult(
+            content="",
+            filename=self.output_filename,
+            success=False,
+            error=str(error)
+        )
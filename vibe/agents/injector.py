@@ -7,6 +7,8 @@ from typing import Dict, Optional
 from vibe.cli.console import console
 from vibe.config.paths import RULES_DIR, TEMPLATES_DIR
 from vibe.utils.files import read_template
+from vibe.templates.render import render_checked
+from vibe.core import stack_detect
 
 
 class InjectorAgent:
@@ -16,21 +18,15 @@ class InjectorAgent:
     Does not call LLM - purely rule-based.
     """
 
-    # Mapping of keywords to rule template files
+    # Keyword -> rule template. Kept for callers of the old mapping; detection
+    # uses the weighted keywords in vibe.core.stack_detect.
     STACK_RULES_MAPPING = {
-        "django": "02_stack_python_django.md",
-        "node": "02_stack_nodejs_express.md",
-        "express": "02_stack_nodejs_express.md",
-        "react": "02_stack_react_vite.md",
-        "vite": "02_stack_react_vite.md",
-        "go": "02_stack_go_gin.md",
-        "gin": "02_stack_go_gin.md",
-        "telegram": "02_stack_telegram_bot.md",
-        "bot": "02_stack_telegram_bot.md",
-        "postgres": "02_stack_postgresql.md",
+        keyword: rule
+        for rule, keywords in stack_detect.STACK_KEYWORDS.items()
+        for keyword, _ in keywords
     }
-    
-    DEFAULT_STACK_RULE = "02_stack_python_fastapi.md"
+
+    DEFAULT_STACK_RULE = stack_detect.DEFAULT_STACK_RULE
 
     @property
     def name(self) -> str:
@@ -46,13 +42,7 @@ class InjectorAgent:
         Returns:
             The filename of the selected stack rule template.
         """
-        patterns_lower = system_patterns.lower()
-        
-        for keyword, template_name in self.STACK_RULES_MAPPING.items():
-            if keyword in patterns_lower:
-                return template_name
-        
-        return self.DEFAULT_STACK_RULE
+        return stack_detect.STACK_DETECTOR.primary(system_patterns)
 
     def load_rules(self, system_patterns: str) -> Dict[str, str]:
         """
@@ -113,7 +103,7 @@ class InjectorAgent:
             try:
                 content = read_template(filename, TEMPLATES_DIR)
                 if needs_sub:
-                    content = content.replace("{{project_name}}", project_name)
+                    content = render_checked(content, filename, {"project_name": project_name})
                 templates[filename] = content
             except SystemExit:
                 console.print(f"[yellow]⚠️  Template {filename} not found.[/yellow]")
@@ -4,6 +4,7 @@ Project Manager Agent - Task Planning.
 from vibe.agents.base import BaseAgent
 from vibe.config.paths import PROMPTS_DIR
 from vibe.utils.files import read_template
+from vibe.templates.render import render
 
 
 class ProjectManagerAgent(BaseAgent):
@@ -26,6 +27,9 @@ class ProjectManagerAgent(BaseAgent):
 
     def build_prompt(self, context: dict) -> str:
         template = read_template(self.template_name, PROMPTS_DIR)
-        prompt = template.replace("{{product_context}}", context.get("product_context", ""))
-        prompt = prompt.replace("{{system_patterns}}", context.get("system_patterns", ""))
-        return prompt
+        return render(
+            template,
+            strict=True,
+            product_context=context.get("product_context", ""),
+            system_patterns=context.get("system_patterns", ""),
+        )
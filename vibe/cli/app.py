@@ -1,76 +1,71 @@
 import os
 import sys
 import typer
-import re
 import shutil
 import subprocess
 import time
+import threading
+import multiprocessing
+from dataclasses import asdict
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 from rich.prompt import Prompt
 
 from vibe.cli.console import console
 from vibe.config.paths import TEMPLATES_DIR, PROMPTS_DIR, RULES_DIR
-from vibe.config.settings import Settings
+from vibe.llm import client as llm_client
+from vibe.llm.parser import extract_file_content as parse_extract_file_content
+from vibe.llm.stream import ContextStreamWriter, FileBlockCallback
+from vibe.llm.telemetry import telemetry
 from vibe.utils.files import read_template
+from vibe.templates.store import TEMPLATE_STORE
+from vibe.templates.pack import DEFAULT_PACK_PATH, build_pack
+from vibe.templates.render import render, render_checked
 
 # Adapter Imports
 import vibe.core.adapters.antigravity
 import vibe.core.adapters.claude
 import vibe.core.adapters.cursor
-from vibe.core.scaffolding import build_rule_bundle, apply_write_plan
+from vibe.core.rule_compose import bundle_token_report
+from vibe.core.scaffolding import build_rule_bundle, apply_write_plan, load_static_assets, select_stack_rules
+from vibe.core.scaffolding import console as scaffolding_console
+from vibe.core.batch import BatchEntry, BatchOutcome, load_manifest, summarize
+from vibe.core.queue import DEFAULT_LEASE_SECONDS, DEFAULT_QUEUE_PATH, Job, JobQueue
 from vibe.core.adapter_registry import AdapterRegistry
+from vibe.core.backup import DEFAULT_KEEP_RUNS, DEFAULT_MAX_BYTES, BackupStore
+from vibe.core.adapter_interface import RuleBundle
+from vibe.core.pipeline import DEFAULT_MAX_PARALLEL, Pipeline, PipelineStage
+from vibe.core.state import StateStore, hash_inputs
+from vibe.core.graph import CONTEXT_GRAPH, Decision, DependencyGraph
+from vibe.agents.base import AgentResult
 
 app = typer.Typer(help="Vibe-CLI: Intelligent Project Bootstrapper")
 
-# Try to import my_llm_sdk, handle failure gracefully
-try:
-    # Priority 1: Try importing from installed package (e.g. pip install -e .)
-    from my_llm_sdk.client import LLMClient
-except ImportError as e1:
-    try:
-        # Priority 2: Try importing from src (legacy/local dev)
-        # Add parent directory to path to find src if running from repo root
-        # Adjust for new package structure: repo root is 2 levels up from here (vibe/cli/app.py -> vibe/cli -> vibe -> repo)
-        # Actually PACKAGE_ROOT.parent is repo root.
-        from vibe.config.paths import PACKAGE_ROOT
-        repo_root = PACKAGE_ROOT.parent
-        sys.path.append(os.path.abspath(str(repo_root / "../my-llm-sdk")))
-        from src.client import LLMClient
-    except ImportError as e2:
-        console.print("[bold red]Error:[/bold red] my_llm_sdk not found. Please ensure it is installed.")
-        console.print(f"Debug Info: Checked sys.path: {sys.path}")
-        console.print(f"Import Error 1: {e1}")
-        console.print(f"Import Error 2: {e2}")
-        console.print("Tip: Run `pip install my-llm-sdk` or activate the correct conda environment (doc).")
-        sys.exit(1)
-
-def call_llm(prompt_text: str, step_name: str) -> str:
+def call_llm(
+    prompt_text: str,
+    step_name: str,
+    on_event: Optional[FileBlockCallback] = None,
+    stop_after: Optional[str] = None,
+) -> str:
     if os.environ.get("VIBE_MOCK_LLM") == "1":
         console.print(f"[magenta]🔮 Mocking LLM response for {step_name}[/magenta]")
         return "|||FILE: productContext.md|||# Mock Goal\nGoal\n|||END_FILE|||\n" \
                "|||FILE: systemPatterns.md|||# Mock Architecture\nArch\n|||END_FILE|||\n" \
                "|||FILE: activeContext.md|||# Mock Task\nTask\n|||END_FILE|||"
 
-    console.print(f"[yellow]⏳ {step_name} is thinking...[/yellow]")
-    user_conf, proj_conf = Settings.resolve_config_paths()
-    try:
-        client = LLMClient(user_config_path=user_conf, project_config_path=proj_conf)
-        response = client.generate(prompt=prompt_text)
-        return response
-    except Exception as e:
-        console.print(f"[bold red]❌ LLM Error:[/bold red] {e}")
-        # For dev benefit, if mock allowed but not set, strict fail. 
-        # But if error happens, maybe fallback to mock? No, that's confusing.
-        sys.exit(1)
+    # Shares the process-wide client pool with the agents
+    return llm_client.call_llm(prompt_text, step_name, on_event=on_event, stop_after=stop_after)
+
+# Appended to the architecture written into .context/systemPatterns.md
+CRITICAL_RULES = "\n## 🛡️ Vibe Critical Rules\n1. Follow the workflow in `01_workflow.md`.\n2. Respect IDE-specific rules.\n"
 
 def extract_file_content(response: str, filename: str) -> str:
     """Extracts content between |||FILE: filename||| and |||END_FILE|||"""
-    pattern = re.compile(rf"\|\|\|FILE: {re.escape(filename)}\|\|\|(.*?)\|\|\|END_FILE\|\|\|", re.DOTALL)
-    match = pattern.search(response)
-    if match:
-        return match.group(1).strip()
-    return ""
+    return parse_extract_file_content(response, filename) or ""
 
 @app.command()
 def init(
@@ -175,6 +170,115 @@ def _check_global_config(ide: str):
                 title="Configuration Check"
             ))
 
+def _display_path(project_dir: Path) -> str:
+    """Project path relative to the cwd, quoted if it contains spaces."""
+    # Calculate relative path for display
+    try:
+        display_path = os.path.relpath(project_dir, os.getcwd())
+    except ValueError:
+        display_path = str(project_dir)
+
+    # Use single quotes if path contains spaces
+    if " " in display_path:
+        display_path = f"'{display_path}'"
+    return display_path
+
+def _render_readme(project_name: str) -> str:
+    return f"""# {project_name}
+
+## Active Rules 🛡️
+The Agent MUST follow these rules located in `.agent/rules/`:
+- **[00a] Environment**: `conda run -n {project_name}` is MANDATORY.
+- **[00b] LLM**: Use `my_llm_sdk` only.
+- **[01] Workflow**: Plan before coding.
+
+## Project Context
+Generated by Vibe-CLI.
+
+- [Product Requirements](.context/productContext.md)
+- [System Architecture](.context/systemPatterns.md)
+"""
+
+def _render_next_steps(project_name: str, display_path: str) -> str:
+    return f"""# 🚀 接下来的步骤
+
+项目 **{project_name}** 已成功初始化！
+
+## 1. 进入项目
+```bash
+cd {display_path}
+```
+
+## 2. 规划与开发流程
+项目已预设 `plan/` 目录。在每个开发阶段（Phase）开始前，
+AI 代理将遵循 `01_workflow_plan_first.md` 规则，
+在此目录下生成详细的实施计划（如 `plan_phase1.md`）。
+
+## 3. 环境准备 (必做)
+请打开 `SETUP_GUIDE_ZH.md` 按照指引完成环境配置：
+- Conda 环境创建
+- 安装依赖
+- 预检通过
+
+## 4. 启动 AI 编程
+```bash
+code .
+```
+在 IDE 中输入: **"Start Phase 1, follow activeContext.md"**
+
+---
+> 💡 提示：完成初始化步骤后可删除此文件。
+"""
+
+def _render_docs(project_dir: Path, project_name: str) -> Dict[str, str]:
+    return {
+        "README.md": _render_readme(project_name),
+        "NEXT_STEPS.md": _render_next_steps(project_name, _display_path(project_dir)),
+    }
+
+def _git_init(project_dir: Path) -> None:
+    try:
+        subprocess.run(["git", "init"], cwd=project_dir, check=True, capture_output=True)
+    except Exception as e:
+        console.print(f"[yellow]⚠️  Git 初始化失败 (非致命错误): {e}[/yellow]")
+
+def _render_setup_guides(project_name: str) -> Dict[str, str]:
+    return {
+        "SETUP_GUIDE.md": render_checked(read_template("SETUP_GUIDE.md", TEMPLATES_DIR), "SETUP_GUIDE.md", {"project_name": project_name}),
+        "SETUP_GUIDE_ZH.md": render_checked(read_template("SETUP_GUIDE_ZH.md", TEMPLATES_DIR), "SETUP_GUIDE_ZH.md", {"project_name": project_name}),
+        "preflight.py": read_template("preflight.py", TEMPLATES_DIR),
+    }
+
+def _print_bundle_report(bundle: RuleBundle) -> None:
+    """Prints the selected stacks and skills and the estimated token size of the rules."""
+    report = bundle_token_report(bundle.rules)
+    stacks = ", ".join(name.replace("02_stack_", "").replace(".md", "") for name in bundle.stacks)
+    console.print(f"[dim]ℹ️  已选择规则集: {stacks} (02_stack ~{report.get('02_stack.md', 0)} tokens, rules total ~{report['total']} tokens)[/dim]")
+    if bundle.dropped_stacks:
+        dropped = ", ".join(bundle.dropped_stacks)
+        console.print(f"[yellow]⚠️  Token budget reached, left out: {dropped}[/yellow]")
+    if bundle.skills or bundle.skipped_skills:
+        skipped = "".join(f"; skipped {name} ({reason})" for name, reason in sorted(bundle.skipped_skills.items()))
+        console.print(f"[dim]ℹ️  Skills: {', '.join(bundle.skills) or '-'}{skipped}[/dim]")
+
+def _start_prefetch(project_dir: Path, project_name: str, static_assets: Optional[RuleBundle] = None) -> Dict[str, Any]:
+    """
+    Starts the LLM-independent scaffolding work in background threads:
+    template loading, the skills walk, README/NEXT_STEPS rendering and git init.
+    Callers join each piece with .result() right before they write it.
+
+    Returns:
+        Futures keyed by work item, plus the "executor" running them.
+    """
+    executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="vibe-prefetch")
+    return {
+        "executor": executor,
+        "static_assets": executor.submit(lambda: static_assets) if static_assets is not None else executor.submit(load_static_assets),
+        "setup_guides": executor.submit(_render_setup_guides, project_name),
+        "docs": executor.submit(_render_docs, project_dir, project_name),
+        "git_init": executor.submit(_git_init, project_dir),
+    }
+
 @app.command()
 def create(
     project_path: str = typer.Argument(..., help="Path to the new project (e.g., 'my-app' or '../my-app')"),
@@ -186,16 +290,76 @@ def create(
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview changes without writing"),
     force: bool = typer.Option(False, "--force", help="Overwrite existing files"),
     cursor_legacy: bool = typer.Option(False, "--cursor-legacy", help="Generate legacy .cursorrules (Cursor only)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not read or write the LLM response cache"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached LLM responses and store fresh ones"),
+    resume: bool = typer.Option(False, "--resume", help="Resume an interrupted run, skipping stages whose inputs are unchanged"),
+    jobs: int = typer.Option(DEFAULT_MAX_PARALLEL, "--jobs", "-j", help="Maximum scaffolding stages run in parallel"),
 ):
     """
     Starts a new AI-Ready project from a prompt.
     """
+    llm_client.configure_cache(enabled=not no_cache, refresh=refresh)
+
     # Check Global Config First
     _check_global_config(ide)
 
+    _create_project(
+        project_path,
+        prompt=prompt,
+        promptfile=promptfile,
+        interactive=interactive,
+        no_plan=no_plan,
+        ide=ide,
+        dry_run=dry_run,
+        force=force,
+        cursor_legacy=cursor_legacy,
+        resume=resume,
+        jobs=jobs,
+    )
+    _print_llm_stats()
+
+def _is_other_project(project_dir: Path, resume: bool) -> bool:
+    """
+    True if create must leave project_dir alone: it already holds a Vibe project
+    and there is no recorded run of it to resume.
+    """
+    if not (project_dir / ".context").exists():
+        return False
+    return not (resume and StateStore(project_dir).load_run())
+
+def _create_project(
+    project_path: str,
+    prompt: Optional[str] = None,
+    promptfile: Optional[str] = None,
+    interactive: bool = False,
+    no_plan: bool = False,
+    ide: str = "antigravity",
+    dry_run: bool = False,
+    force: bool = False,
+    cursor_legacy: bool = False,
+    resume: bool = False,
+    jobs: int = DEFAULT_MAX_PARALLEL,
+    review: bool = True,
+    static_assets: Optional[RuleBundle] = None,
+) -> Path:
+    """
+    Body of `create`, shared with `create-batch`.
+
+    Args:
+        review: Ask the user to accept / edit / regenerate the architecture.
+                Batch runs pass False and accept the first proposal.
+        static_assets: Preloaded load_static_assets() result shared across projects.
+
+    Returns:
+        The resolved project directory.
+
+    Raises:
+        typer.Exit: On invalid input or an existing project (without resume).
+    """
     # Resolve path and name
     project_dir = Path(project_path).resolve()
     project_name = project_dir.name
+    state = StateStore(project_dir)
     
     # --- Input Validation & Resolution ---
     user_request = None
@@ -226,6 +390,10 @@ def create(
             user_request = f"# 摘要\n{prompt}\n\n---\n\n{user_request}"
         else:
             user_request = prompt
+
+    if not user_request and resume:
+        # Reuse the request of the interrupted run
+        user_request = (state.load_run() or {}).get("user_request")
     
     if not user_request:
         console.print("[bold red]错误：[/bold red]请提供 --prompt 或 --promptfile 参数。")
@@ -236,252 +404,253 @@ def create(
     console.print(Panel.fit(f"[bold blue]Welcome to Vibe-CLI 2.0 (Refactored)[/bold blue]\nInitializing project: [green]{project_name}[/green]\nLocation: [dim]{project_dir}[/dim]"))
 
     if project_dir.exists():
-        if (project_dir / ".context").exists():
+        if _is_other_project(project_dir, resume):
             console.print(f"[bold red]Error:[/bold red] Directory {project_dir} is already a Vibe project (contains .context).")
+            if resume:
+                console.print(f"[dim]未找到可恢复的运行记录 ({project_dir}/.vibe/state/run.json)，不会覆盖现有上下文。[/dim]")
+            else:
+                console.print("[dim]如需继续中断的运行，请使用 --resume 或 `python -m vibe resume <path>`。[/dim]")
             raise typer.Exit(code=1)
         console.print(f"[yellow]⚠️  注意: 目标文件夹 {project_dir} 已存在，将在此进行初始化。[/yellow]")
     else:
         project_dir.mkdir(parents=True, exist_ok=True)
 
+    state.save_run({
+        "user_request": user_request,
+        "interactive": interactive,
+        "no_plan": no_plan,
+        "ide": ide,
+        "force": force,
+        "cursor_legacy": cursor_legacy,
+    })
+
     # Create plan directory with .gitkeep
     plan_dir = project_dir / "plan"
     plan_dir.mkdir(exist_ok=True)
     (plan_dir / ".gitkeep").touch()
 
-    # --- Step 1: Analyst Agent ---
-    console.print("\n[bold cyan]🤖 需求分析师 (Analyst):[/bold cyan] 正在分析需求...")
-    analyst_template = read_template("analyst.md", PROMPTS_DIR)
-    analyst_prompt = analyst_template.replace("{{user_request}}", user_request)
-    
-    analyst_response = call_llm(analyst_prompt, "需求分析师")
-    product_context = extract_file_content(analyst_response, "productContext.md")
-    
-    if not product_context:
-        # Fallback if parsing fails, just use the raw response (simplified for POC)
-        console.print("[yellow]⚠️  无法严格解析 productContext.md，使用原始回复作为后备[/yellow]")
-        product_context = analyst_response
+    # Local work that does not depend on the LLM runs while the Analyst is thinking
+    prefetch = _start_prefetch(project_dir, project_name, static_assets)
+    try:
+        # --- Step 1: Analyst Agent ---
+        console.print("\n[bold cyan]🤖 需求分析师 (Analyst):[/bold cyan] 正在分析需求...")
+        analyst_template = read_template("analyst.md", PROMPTS_DIR)
+        analyst_prompt = render(analyst_template, strict=True, user_request=user_request)
+        analyst_hash = hash_inputs("analyst", analyst_prompt)
 
-    # Intermediate Save for Interactive Mode
-    context_dir = project_dir / ".context"
-    os.makedirs(context_dir, exist_ok=True)
-    product_context_file = context_dir / "productContext.md"
-    
-    # We must write it now so user can edit it
-    with open(product_context_file, "w", encoding="utf-8") as f:
-        f.write(product_context)
+        # productContext.md is written progressively while the Analyst streams
+        context_dir = project_dir / ".context"
+        os.makedirs(context_dir, exist_ok=True)
+        product_context_file = context_dir / "productContext.md"
 
-    console.print("[green]✅ 需求分析完成。[/green]")
+        product_context = _load_checkpoint(state, "productContext", analyst_hash) if resume else None
+        if product_context is not None:
+            product_context_file.write_text(product_context, encoding="utf-8")
+        else:
+            analyst_response = call_llm(analyst_prompt, "需求分析师", on_event=ContextStreamWriter(context_dir, ["productContext.md"]), stop_after="productContext.md")
+            product_context = extract_file_content(analyst_response, "productContext.md")
 
-    # --- Step 1.5: Interactive Refinement ---
-    if interactive:
-        console.print(Panel(f"[bold yellow]⏸️  交互模式 (Interactive Mode)[/bold yellow]\n\n请编辑文件 [bold]{product_context_file}[/bold] 以完善需求。\n特别是回答 `❓ 待确认事项` 章节的问题。\n保存文件后，请按 [bold]回车键[/bold] 继续。"))
-        typer.confirm("准备好继续了吗？", default=True)
-        
-        # Reload content
-        console.print("[dim]🔄 正在重新加载 productContext.md...[/dim]")
-        product_context = product_context_file.read_text(encoding="utf-8")
-        console.print("[green]✅ 上下文已更新。[/green]")
-
-    # --- Step 2: Architect Agent ---
-    console.print("\n[bold magenta]🤖 系统架构师 (Architect):[/bold magenta] 正在设计架构...")
-    architect_template = read_template("architect.md", PROMPTS_DIR)
-    architect_prompt = architect_template.replace("{{user_request}}", user_request).replace("{{product_context}}", product_context)
-    
-    architect_response = call_llm(architect_prompt, "系统架构师")
-    system_patterns = extract_file_content(architect_response, "systemPatterns.md")
+            if not product_context:
+                # Fallback if parsing fails, just use the raw response (simplified for POC)
+                console.print("[yellow]⚠️  无法严格解析 productContext.md，使用原始回复作为后备[/yellow]")
+                product_context = analyst_response
 
-    if not system_patterns:
-        console.print("[yellow]⚠️  无法严格解析 systemPatterns.md，使用原始回复作为后备[/yellow]")
-        system_patterns = architect_response
-        
-    console.print("[green]✅ 架构设计完成。[/green]")
+            # Intermediate Save for Interactive Mode
+            # We must write it now so user can edit it
+            with open(product_context_file, "w", encoding="utf-8") as f:
+                f.write(product_context)
 
-    # --- Step 2.5: Interactive Tech Stack Review (Vibe Review) ---
-    # Write systemPatterns.md early for user to review/edit
-    system_patterns_file = context_dir / "systemPatterns.md"
-    with open(system_patterns_file, "w", encoding="utf-8") as f:
-        f.write(system_patterns)
-    
-    # Extract and display proposed tech stack summary
-    console.print(Panel(
-        f"[bold yellow]📋 技术栈评审 (Vibe Review)[/bold yellow]\n\n"
-        f"架构方案已生成，请查看: [bold]{system_patterns_file}[/bold]\n\n"
-        f"[dim]文件已保存，您可以：\n"
-        f"  • 直接按回车接受当前方案\n"
-        f"  • 输入 'edit' 打开文件手动修改后继续\n"
-        f"  • 输入 'regen' 重新生成（需提供额外指令）[/dim]",
-        title="[bold]Tech Stack Decision[/bold]"
-    ))
-    
-    review_choice = Prompt.ask(
-        "❓ 是否接受此技术栈方案？",
-        choices=["y", "edit", "regen"],
-        default="y"
-    )
-    
-    if review_choice == "edit":
-        console.print(f"[dim]请编辑文件: {system_patterns_file}[/dim]")
-        console.print("[dim]保存后按回车继续...[/dim]")
-        typer.confirm("编辑完成了吗？", default=True)
-        # Reload content after user edit
-        system_patterns = system_patterns_file.read_text(encoding="utf-8")
-        console.print("[green]✅ 已加载您的修改。[/green]")
-    elif review_choice == "regen":
-        extra_instruction = Prompt.ask("请输入额外的架构指令 (如：'必须使用 MySQL')")
-        console.print("[yellow]🔄 正在根据新指令重新生成架构...[/yellow]")
-        architect_prompt_v2 = architect_prompt + f"\n\n# 用户追加指令\n{extra_instruction}"
-        architect_response = call_llm(architect_prompt_v2, "系统架构师 (重新生成)")
-        system_patterns = extract_file_content(architect_response, "systemPatterns.md")
-        if not system_patterns:
-            system_patterns = architect_response
-        # Save regenerated version
-        with open(system_patterns_file, "w", encoding="utf-8") as f:
-            f.write(system_patterns)
-        console.print("[green]✅ 架构已重新生成。[/green]")
-    else:
-        console.print("[green]✅ 技术栈方案已确认。[/green]")
+            console.print("[green]✅ 需求分析完成。[/green]")
 
-    # --- Step 3: Scaffolding Phase 1 (Core Context) ---
-    console.print(f"\n[bold white]🔨 Initializing Core Context for {project_name}...[/bold white]")
-    
-    setup_guide_content = read_template("SETUP_GUIDE.md", TEMPLATES_DIR)
-    setup_guide_zh_content = read_template("SETUP_GUIDE_ZH.md", TEMPLATES_DIR)
-    preflight_content = read_template("preflight.py", TEMPLATES_DIR)
+            # --- Step 1.5: Interactive Refinement ---
+            if interactive:
+                console.print(Panel(f"[bold yellow]⏸️  交互模式 (Interactive Mode)[/bold yellow]\n\n请编辑文件 [bold]{product_context_file}[/bold] 以完善需求。\n特别是回答 `❓ 待确认事项` 章节的问题。\n保存文件后，请按 [bold]回车键[/bold] 继续。"))
+                typer.confirm("准备好继续了吗？", default=True)
 
-    if not dry_run:
-        os.makedirs(project_dir, exist_ok=True)
-        context_dir = project_dir / ".context"
-        os.makedirs(context_dir, exist_ok=True)
+                # Reload content
+                console.print("[dim]🔄 正在重新加载 productContext.md...[/dim]")
+                product_context = product_context_file.read_text(encoding="utf-8")
+                console.print("[green]✅ 上下文已更新。[/green]")
 
-        # Write productContext
-        with open(context_dir / "productContext.md", "w", encoding="utf-8") as f:
-            f.write(product_context)
+            # Checkpoint after review so a resumed run does not ask again
+            _save_checkpoint(state, "productContext", analyst_hash, product_context)
 
-        # Write systemPatterns (with Critical Rules injection)
-        critical_rules = "\n## 🛡️ Vibe Critical Rules\n1. Follow the workflow in `01_workflow.md`.\n2. Respect IDE-specific rules.\n"
-        system_patterns_final = system_patterns + critical_rules
-        
-        with open(context_dir / "systemPatterns.md", "w", encoding="utf-8") as f:
-            f.write(system_patterns_final)
-            
-        # Write project_env.yaml
-        with open(context_dir / "project_env.yaml", "w", encoding="utf-8") as f:
-            f.write(f"conda_env: {project_name}\n")
-            
-        # Write setup guides
-        with open(project_dir / "SETUP_GUIDE.md", "w", encoding="utf-8") as f:
-            f.write(setup_guide_content.replace("{{project_name}}", project_name))
-            
-        with open(project_dir / "SETUP_GUIDE_ZH.md", "w", encoding="utf-8") as f:
-            f.write(setup_guide_zh_content.replace("{{project_name}}", project_name))
-            
-        with open(project_dir / "preflight.py", "w", encoding="utf-8") as f:
-            f.write(preflight_content)
-    else:
-        console.print("[yellow]DRY RUN: Skipping Core Context creation[/yellow]")
+        # --- Step 2: Architect Agent ---
+        console.print("\n[bold magenta]🤖 系统架构师 (Architect):[/bold magenta] 正在设计架构...")
+        architect_template = read_template("architect.md", PROMPTS_DIR)
+        architect_prompt = render(architect_template, strict=True, user_request=user_request, product_context=product_context)
+        architect_hash = hash_inputs("architect", architect_prompt)
+        system_patterns_file = context_dir / "systemPatterns.md"
 
-    # --- Step 4: Scaffolding Phase 2 (IDE Projection) ---
-    console.print(f"[bold white]🎨 Projecting configuration for IDE: {ide}...[/bold white]")
-    
-    # 1. Build Bundle
-    context_data = {
-        "product_context": product_context,
-        "system_patterns": system_patterns,
-    }
-    
-    try:
-        rule_bundle = build_rule_bundle(context_data)
-        
-        # 2. Get Adapter
-        adapter = AdapterRegistry.get(ide)
-        
-        # 3. Project
-        write_plan = adapter.project(rule_bundle)
-        
-        # 4. Apply
-        apply_write_plan(write_plan, project_dir, mode="force" if force else "safe", dry_run=dry_run)
-        
-        # Pass cursor_legacy param if applicable (To be implemented in Step C)
-        # currently project() signature doesn't support extra args, 
-        # we might need to pass it via constructor or context.
-        # For now, simplistic implementation for Antigravity (Step A).
-        
-    except Exception as e:
-        console.print(f"[bold red]Adapter Error (Did you install the right adapter?):[/bold red] {e}")
-        # raise typer.Exit(code=1) # Don't exit yet, let dry run finish or debug
+        system_patterns = _load_checkpoint(state, "systemPatterns", architect_hash) if resume else None
+        if system_patterns is not None:
+            system_patterns_file.write_text(system_patterns, encoding="utf-8")
+        else:
+            architect_response = call_llm(architect_prompt, "系统架构师", on_event=ContextStreamWriter(context_dir, ["systemPatterns.md"]), stop_after="systemPatterns.md")
+            system_patterns = extract_file_content(architect_response, "systemPatterns.md")
 
-        
+            if not system_patterns:
+                console.print("[yellow]⚠️  无法严格解析 systemPatterns.md，使用原始回复作为后备[/yellow]")
+                system_patterns = architect_response
 
-    # Write README
-    readme_content = f"""# {project_name}
+            console.print("[green]✅ 架构设计完成。[/green]")
 
-## Active Rules 🛡️
-The Agent MUST follow these rules located in `.agent/rules/`:
-- **[00a] Environment**: `conda run -n {project_name}` is MANDATORY.
-- **[00b] LLM**: Use `my_llm_sdk` only.
-- **[01] Workflow**: Plan before coding.
+            # --- Step 2.5: Interactive Tech Stack Review (Vibe Review) ---
+            # Write systemPatterns.md early for user to review/edit
+            with open(system_patterns_file, "w", encoding="utf-8") as f:
+                f.write(system_patterns)
 
-## Project Context
-Generated by Vibe-CLI.
+            # Extract and display proposed tech stack summary
+            if review:
+                console.print(Panel(
+                    f"[bold yellow]📋 技术栈评审 (Vibe Review)[/bold yellow]\n\n"
+                    f"架构方案已生成，请查看: [bold]{system_patterns_file}[/bold]\n\n"
+                    f"[dim]文件已保存，您可以：\n"
+                    f"  • 直接按回车接受当前方案\n"
+                    f"  • 输入 'edit' 打开文件手动修改后继续\n"
+                    f"  • 输入 'regen' 重新生成（需提供额外指令）[/dim]",
+                    title="[bold]Tech Stack Decision[/bold]"
+                ))
 
-- [Product Requirements](.context/productContext.md)
-- [System Architecture](.context/systemPatterns.md)
-"""
-    with open(project_dir / "README.md", "w", encoding="utf-8") as f:
-        f.write(readme_content)
+                review_choice = Prompt.ask(
+                    "❓ 是否接受此技术栈方案？",
+                    choices=["y", "edit", "regen"],
+                    default="y"
+                )
+            else:
+                review_choice = "y"
 
-    # Git init
-    try:
-        subprocess.run(["git", "init"], cwd=project_dir, check=True, capture_output=True)
-    except Exception as e:
-        console.print(f"[yellow]⚠️  Git 初始化失败 (非致命错误): {e}[/yellow]")
+            if review_choice == "edit":
+                console.print(f"[dim]请编辑文件: {system_patterns_file}[/dim]")
+                console.print("[dim]保存后按回车继续...[/dim]")
+                typer.confirm("编辑完成了吗？", default=True)
+                # Reload content after user edit
+                system_patterns = system_patterns_file.read_text(encoding="utf-8")
+                console.print("[green]✅ 已加载您的修改。[/green]")
+            elif review_choice == "regen":
+                extra_instruction = Prompt.ask("请输入额外的架构指令 (如：'必须使用 MySQL')")
+                console.print("[yellow]🔄 正在根据新指令重新生成架构...[/yellow]")
+                architect_prompt_v2 = architect_prompt + f"\n\n# 用户追加指令\n{extra_instruction}"
+                architect_response = call_llm(architect_prompt_v2, "系统架构师 (重新生成)", on_event=ContextStreamWriter(context_dir, ["systemPatterns.md"]), stop_after="systemPatterns.md")
+                system_patterns = extract_file_content(architect_response, "systemPatterns.md")
+                if not system_patterns:
+                    system_patterns = architect_response
+                # Save regenerated version
+                with open(system_patterns_file, "w", encoding="utf-8") as f:
+                    f.write(system_patterns)
+                console.print("[green]✅ 架构已重新生成。[/green]")
+            else:
+                console.print("[green]✅ 技术栈方案已确认。[/green]")
 
-    # --- Step 5: Auto-Plan ---
-    if not no_plan:
-        _run_plan_logic(project_dir)
+            _save_checkpoint(state, "systemPatterns", architect_hash, system_patterns)
 
-    # Calculate relative path for display
-    try:
-        display_path = os.path.relpath(project_dir, os.getcwd())
-    except ValueError:
-        display_path = str(project_dir)
+        # --- Steps 3-5: Scaffolding, IDE projection and planning ---
+        # Independent work items run concurrently; each declares what it needs.
+        context_data = {
+            "product_context": product_context,
+            "system_patterns": system_patterns,
+            "project_name": project_name,
+        }
 
-    # Use single quotes if path contains spaces
-    if " " in display_path:
-        display_path = f"'{display_path}'"
+        def write_core_context(ctx: dict) -> dict:
+            # --- Step 3: Scaffolding Phase 1 (Core Context) ---
+            console.print(f"\n[bold white]🔨 Initializing Core Context for {project_name}...[/bold white]")
+            if dry_run:
+                console.print("[yellow]DRY RUN: Skipping Core Context creation[/yellow]")
+                return {"core_context": False}
 
-    # --- Generate NEXT_STEPS.md for persistent reference ---
-    next_steps_content = f"""# 🚀 接下来的步骤
+            os.makedirs(context_dir, exist_ok=True)
 
-项目 **{project_name}** 已成功初始化！
+            # Write productContext
+            with open(context_dir / "productContext.md", "w", encoding="utf-8") as f:
+                f.write(product_context)
 
-## 1. 进入项目
-```bash
-cd {display_path}
-```
+            # Write systemPatterns (with Critical Rules injection)
+            system_patterns_final = system_patterns + CRITICAL_RULES
+        
+            with open(context_dir / "systemPatterns.md", "w", encoding="utf-8") as f:
+                f.write(system_patterns_final)
+            
+            # Write project_env.yaml
+            with open(context_dir / "project_env.yaml", "w", encoding="utf-8") as f:
+                f.write(f"conda_env: {project_name}\n")
+            return {"core_context": True}
 
-## 2. 规划与开发流程
-项目已预设 `plan/` 目录。在每个开发阶段（Phase）开始前，
-AI 代理将遵循 `01_workflow_plan_first.md` 规则，
-在此目录下生成详细的实施计划（如 `plan_phase1.md`）。
+        def write_setup_guides(ctx: dict) -> None:
+            setup_files = prefetch["setup_guides"].result()
+            if dry_run:
+                return
 
-## 3. 环境准备 (必做)
-请打开 `SETUP_GUIDE_ZH.md` 按照指引完成环境配置：
-- Conda 环境创建
-- 安装依赖
-- 预检通过
+            # Write setup guides
+            for filename, content in setup_files.items():
+                with open(project_dir / filename, "w", encoding="utf-8") as f:
+                    f.write(content)
 
-## 4. 启动 AI 编程
-```bash
-code .
-```
-在 IDE 中输入: **"Start Phase 1, follow activeContext.md"**
+        def build_bundle(ctx: dict) -> dict:
+            try:
+                bundle = build_rule_bundle(
+                    context_data,
+                    prefetch["static_assets"].result(),
+                    skill_capabilities=AdapterRegistry.get(ide).skill_capabilities,
+                )
+                _print_bundle_report(bundle)
+                return {"rule_bundle": bundle}
+            except Exception as e:
+                console.print(f"[bold red]Adapter Error (Did you install the right adapter?):[/bold red] {e}")
+                return {"rule_bundle": None}
 
----
-> 💡 提示：完成初始化步骤后可删除此文件。
-"""
-    with open(project_dir / "NEXT_STEPS.md", "w", encoding="utf-8") as f:
-        f.write(next_steps_content)
+        def project_ide(ctx: dict) -> None:
+            # --- Step 4: Scaffolding Phase 2 (IDE Projection) ---
+            console.print(f"[bold white]🎨 Projecting configuration for IDE: {ide}...[/bold white]")
+            if ctx["rule_bundle"] is None:
+                return
+            try:
+                adapter = AdapterRegistry.get(ide)
+                write_plan = adapter.project(ctx["rule_bundle"])
+                apply_write_plan(write_plan, project_dir, mode="force" if force else "safe", dry_run=dry_run)
+
+                # Pass cursor_legacy param if applicable (To be implemented in Step C)
+                # currently project() signature doesn't support extra args, 
+                # we might need to pass it via constructor or context.
+                # For now, simplistic implementation for Antigravity (Step A).
+            except Exception as e:
+                console.print(f"[bold red]Adapter Error (Did you install the right adapter?):[/bold red] {e}")
+                # Don't exit yet, let dry run finish or debug
+
+        def write_readme(ctx: dict) -> None:
+            with open(project_dir / "README.md", "w", encoding="utf-8") as f:
+                f.write(prefetch["docs"].result()["README.md"])
+
+        def git_init(ctx: dict) -> None:
+            # Started in the background before the first LLM call
+            prefetch["git_init"].result()
+
+        def auto_plan(ctx: dict) -> None:
+            # --- Step 5: Auto-Plan ---
+            _run_plan_logic(project_dir, resume=resume)
+
+        stages = [
+            PipelineStage(name="core_context", action=write_core_context, inputs=[], outputs=["core_context"]),
+            PipelineStage(name="setup_guides", action=write_setup_guides, inputs=[], outputs=[]),
+            PipelineStage(name="rule_bundle", action=build_bundle, inputs=[], outputs=["rule_bundle"]),
+            PipelineStage(name="ide_projection", action=project_ide, inputs=["rule_bundle"], outputs=[]),
+            PipelineStage(name="readme", action=write_readme, inputs=[], outputs=[]),
+            PipelineStage(name="git_init", action=git_init, inputs=[], outputs=[]),
+        ]
+        if not no_plan:
+            # The Project Manager reads the context files written by core_context
+            stages.append(PipelineStage(name="project_manager", action=auto_plan, inputs=["core_context"], outputs=[]))
+        Pipeline(stages, max_parallel=jobs, report=True).run({})
+
+        display_path = _display_path(project_dir)
+        docs = prefetch["docs"].result()
+
+        # --- Generate NEXT_STEPS.md for persistent reference ---
+        with open(project_dir / "NEXT_STEPS.md", "w", encoding="utf-8") as f:
+            f.write(docs["NEXT_STEPS.md"])
+    finally:
+        # Also on failure: batch and queue workers run many creates per process
+        prefetch["executor"].shutdown(wait=False, cancel_futures=True)
 
     # --- Terminal output (Rich Panel) ---
     success_msg = f"""[bold green]✨ 项目初始化完成！[/bold green]
@@ -507,10 +676,79 @@ code .
 [dim]📋 上述步骤已保存到: NEXT_STEPS.md[/dim]
 """
     console.print(Panel(success_msg, title="Success", expand=False))
+    if not dry_run:
+        _record_build(project_dir)
+    return project_dir
+
+def _print_llm_stats():
+    """Prints LLM cache and retry counters for the run, if there is anything to report."""
+    stats = llm_client.get_response_cache().stats
+    if stats.hits or stats.misses:
+        console.print(f"[dim]♻️  LLM cache: {stats.hits} hit(s), {stats.misses} miss(es), {stats.evictions} eviction(s)[/dim]")
+    retries = telemetry.retry_totals()
+    if retries["retries"]:
+        console.print(f"[dim]🔁 LLM retries: {retries['retries']} (waited {retries['wait_s']:.1f}s)[/dim]")
+
+def _load_checkpoint(state: StateStore, stage: str, input_hash: str) -> Optional[str]:
+    """Returns checkpointed stage content if its inputs are unchanged, announcing the skip."""
+    result = state.lookup(stage, input_hash)
+    if result is None:
+        return None
+    console.print(f"[dim]⏭️  跳过 {stage}.md：输入未变化，已从 .vibe/state 恢复。[/dim]")
+    return result.content
 
-def _run_plan_logic(project_path: Path):
+def _save_checkpoint(state: StateStore, stage: str, input_hash: str, content: str) -> None:
+    state.save(stage, input_hash, AgentResult(content=content, filename=f"{stage}.md", success=True))
+
+def _graph_values(project_dir: Path) -> Dict[str, Optional[str]]:
+    """Current content of every dependency-graph input, read from the project."""
+    context_dir = project_dir / ".context"
+    run = StateStore(project_dir).load_run() or {}
+    values: Dict[str, Optional[str]] = {"user_request": run.get("user_request", ""), "ide": run.get("ide", "antigravity")}
+    for node in CONTEXT_GRAPH:
+        if node.filename:
+            path = context_dir / node.filename
+            values[node.name] = path.read_text(encoding="utf-8") if path.exists() else None
+    values["stack"] = "+".join(select_stack_rules(values.get("systemPatterns") or ""))
+    return values
+
+def _record_build(project_dir: Path, nodes: Optional[List[str]] = None) -> None:
+    """Marks graph nodes (all by default) as built from the project's current content."""
+    graph = DependencyGraph(project_dir)
+    values = _graph_values(project_dir)
+    for node in CONTEXT_GRAPH:
+        if nodes is not None and node.name not in nodes:
+            continue
+        if node.filename and values.get(node.name) is None:
+            continue
+        graph.record(node.name, {name: values[name] or "" for name in node.inputs}, values.get(node.name))
+    graph.save()
+
+def _print_decision(decision: Decision) -> None:
+    label = next((n.filename for n in CONTEXT_GRAPH if n.name == decision.node and n.filename), f"{decision.node} (IDE)")
+    if decision.run:
+        console.print(f"  [cyan]🔨 rebuild[/cyan] {label:<20} [dim]{decision.reason}[/dim]")
+    else:
+        console.print(f"  [dim]⏭️  skip    {label:<20} {decision.reason}[/dim]")
+
+def _generate_context(prompt_text: str, step_name: str, filename: str, context_dir: Path) -> str:
+    """Runs one LLM stage and returns the extracted block (raw response as fallback)."""
+    response = call_llm(prompt_text, step_name, on_event=ContextStreamWriter(context_dir, [filename]), stop_after=filename)
+    content = extract_file_content(response, filename)
+    if not content:
+        console.print(f"[yellow]⚠️  无法严格解析 {filename}，使用原始回复作为后备[/yellow]")
+        content = response
+    return content
+
+def _run_plan_logic(project_path: Path, resume: bool = False, incremental: bool = False):
     """
     Internal logic for generating planning roadmap.
+
+    Args:
+        project_path: Project root containing .context/.
+        resume: Reuse the checkpointed plan if its inputs are unchanged.
+        incremental: Skip the Project Manager when neither context it reads nor
+                     activeContext.md itself changed since the last plan.
     """
     context_dir = project_path / ".context"
     
@@ -533,34 +771,527 @@ def _run_plan_logic(project_path: Path):
          console.print(f"[bold red]读取失败:[/bold red] {e}")
          return
 
+    if incremental:
+        active_path = context_dir / "activeContext.md"
+        decision = DependencyGraph(project_path).decide(
+            "activeContext",
+            {"productContext": product_context, "systemPatterns": system_patterns},
+            active_path.read_text(encoding="utf-8") if active_path.exists() else None,
+            edits_are_input=True,
+        )
+        if not decision.run:
+            _print_decision(decision)
+            return
+
     # --- Project Manager Agent ---
     console.print("\n[bold green]🤖 项目经理 (Project Manager):[/bold green] 正在规划下一步...")
     
     pm_template = read_template("project_manager.md", PROMPTS_DIR)
-    pm_prompt = pm_template.replace("{{product_context}}", product_context).replace("{{system_patterns}}", system_patterns)
-    
-    pm_response = call_llm(pm_prompt, "项目经理")
-    active_context = extract_file_content(pm_response, "activeContext.md")
-    
-    if not active_context:
-        console.print("[yellow]⚠️  无法严格解析 activeContext.md，使用原始回复作为后备[/yellow]")
-        active_context = pm_response
+    pm_prompt = render(pm_template, strict=True, product_context=product_context, system_patterns=system_patterns)
+    pm_hash = hash_inputs("project_manager", pm_prompt)
+
+    state = StateStore(project_path)
+
+    active_context = _load_checkpoint(state, "activeContext", pm_hash) if resume else None
+    if active_context is None:
+        pm_response = call_llm(pm_prompt, "项目经理", on_event=ContextStreamWriter(context_dir, ["activeContext.md"]), stop_after="activeContext.md")
+        active_context = extract_file_content(pm_response, "activeContext.md")
+
+        if not active_context:
+            console.print("[yellow]⚠️  无法严格解析 activeContext.md，使用原始回复作为后备[/yellow]")
+            active_context = pm_response
+
+        _save_checkpoint(state, "activeContext", pm_hash, active_context)
 
     # Save Output
     output_path = context_dir / "activeContext.md"
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(active_context)
         
+    _record_build(project_path, ["activeContext"])
     console.print(f"[green]✅ 路线图已更新: {output_path}[/green]")
 
 @app.command()
 def plan(
     project_dir: str = typer.Argument(".", help="项目目录路径"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not read or write the LLM response cache"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached LLM responses and store fresh ones"),
+    force: bool = typer.Option(False, "--force", help="Regenerate activeContext.md even if nothing changed"),
 ):
     """
     生成下一阶段的实施计划 (activeContext.md)。
     """
-    _run_plan_logic(Path(project_dir))
+    llm_client.configure_cache(enabled=not no_cache, refresh=refresh)
+    _run_plan_logic(Path(project_dir), incremental=not (refresh or force))
+    _print_llm_stats()
+
+@app.command()
+def rebuild(
+    project_dir: str = typer.Argument(".", help="项目目录路径"),
+    force: bool = typer.Option(False, "--force", help="Regenerate contexts even if they were edited by hand"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show what would be rebuilt"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not read or write the LLM response cache"),
+):
+    """
+    Re-runs only the stages whose upstream context changed since the last build.
+    """
+    llm_client.configure_cache(enabled=not no_cache)
+    project_path = Path(project_dir).resolve()
+    context_dir = project_path / ".context"
+    if not context_dir.exists():
+        console.print(f"[bold red]错误:[/bold red] 未找到 .context 目录。")
+        raise typer.Exit(code=1)
+
+    graph = DependencyGraph(project_path)
+    if not graph.path.exists():
+        # Projects created before build records existed: adopt their current state
+        if not dry_run:
+            _record_build(project_path)
+        console.print("[yellow]⚠️  未找到构建记录，已将当前内容记录为基线。修改上下文后再次运行 rebuild。[/yellow]")
+        return
+
+    values = _graph_values(project_path)
+    console.print(f"[bold white]🔍 Checking {project_path.name} for changes...[/bold white]")
+
+    for node in CONTEXT_GRAPH:
+        if node.name == "rules":
+            values["stack"] = "+".join(select_stack_rules(values.get("systemPatterns") or ""))
+        inputs = {name: values.get(name) or "" for name in node.inputs}
+        decision = graph.decide(node.name, inputs, values.get(node.name), force=force)
+        _print_decision(decision)
+        if dry_run:
+            continue
+        if not decision.run:
+            if decision.record:
+                graph.record(node.name, inputs, values.get(node.name))
+            continue
+
+        if node.name == "productContext":
+            prompt_text = render(read_template("analyst.md", PROMPTS_DIR), strict=True, user_request=inputs["user_request"])
+            content = _generate_context(prompt_text, "需求分析师", node.filename, context_dir)
+        elif node.name == "systemPatterns":
+            prompt_text = render(read_template("architect.md", PROMPTS_DIR), strict=True, user_request=inputs["user_request"], product_context=inputs["productContext"])
+            content = _generate_context(prompt_text, "系统架构师", node.filename, context_dir) + CRITICAL_RULES
+        elif node.name == "activeContext":
+            prompt_text = render(read_template("project_manager.md", PROMPTS_DIR), strict=True, product_context=inputs["productContext"], system_patterns=inputs["systemPatterns"])
+            content = _generate_context(prompt_text, "项目经理", node.filename, context_dir)
+        else:
+            # Stack selection changed: re-project IDE rules (unchanged files are skipped, user-edited ones backed up)
+            bundle = build_rule_bundle({
+                "product_context": values.get("productContext") or "",
+                "system_patterns": values.get("systemPatterns") or "",
+                "project_name": project_path.name,
+            }, skill_capabilities=AdapterRegistry.get(inputs["ide"]).skill_capabilities)
+            apply_write_plan(AdapterRegistry.get(inputs["ide"]).project(bundle), project_path, mode="force")
+            graph.record(node.name, inputs)
+            continue
+
+        (context_dir / node.filename).write_text(content, encoding="utf-8")
+        values[node.name] = content
+        graph.record(node.name, inputs, content)
+
+    if not dry_run:
+        graph.save()
+    _print_llm_stats()
+
+@app.command()
+def resume(
+    project_path: str = typer.Argument(..., help="Path of the interrupted project"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not read or write the LLM response cache"),
+):
+    """
+    Resumes an interrupted `create`, skipping stages whose inputs are unchanged.
+    """
+    run = StateStore(Path(project_path).resolve()).load_run()
+    if not run:
+        console.print(f"[bold red]错误:[/bold red] 未找到可恢复的运行记录 ({project_path}/.vibe/state/run.json)。")
+        raise typer.Exit(code=1)
+
+    create(
+        project_path=project_path,
+        prompt=run["user_request"],
+        promptfile=None,
+        interactive=run.get("interactive", False),
+        no_plan=run.get("no_plan", False),
+        ide=run.get("ide", "antigravity"),
+        dry_run=False,
+        force=run.get("force", False),
+        cursor_legacy=run.get("cursor_legacy", False),
+        no_cache=no_cache,
+        refresh=False,
+        resume=True,
+        jobs=DEFAULT_MAX_PARALLEL,
+    )
+
+@app.command("pack-templates")
+def pack_templates(
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Pack file to write (default: vibe/templates/templates.pack)"),
+):
+    """
+    Builds the precompiled template pack served at runtime instead of the template directory.
+    """
+    output = output or DEFAULT_PACK_PATH
+    count = build_pack(TEMPLATES_DIR, output)
+    console.print(f"[green]📦 Packed {count} templates into {output} ({output.stat().st_size} bytes)[/green]")
+    console.print("[dim]Rebuild after editing templates, or set VIBE_TEMPLATE_PACK=0 to read the directory.[/dim]")
+
+def _attempt_create(entry: BatchEntry, jobs: int, static_assets: Optional[RuleBundle]) -> Optional[str]:
+    """
+    One non-interactive, resumable create attempt for a batch or queue entry.
+
+    Returns:
+        None on success, otherwise a short error description.
+    """
+    if _is_other_project(Path(entry.path).resolve(), resume=True):
+        return "already a Vibe project (contains .context) with no recorded run to resume"
+    try:
+        _create_project(
+            entry.path,
+            prompt=entry.prompt,
+            promptfile=entry.promptfile,
+            no_plan=entry.no_plan,
+            ide=entry.ide,
+            force=entry.force,
+            resume=True,
+            jobs=jobs,
+            review=False,
+            static_assets=static_assets,
+        )
+    except typer.Exit as e:
+        return f"create exited with code {e.exit_code}"
+    except SystemExit as e:
+        # LLM failures abort through sys.exit after retries in the client
+        return f"aborted (exit code {e.code}); rerun with --verbose for details"
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+def _run_batch_entry(entry: BatchEntry, retries: int, jobs: int, static_assets: RuleBundle) -> BatchOutcome:
+    """Creates one batch project, retrying failed attempts (completed stages are resumed)."""
+    outcome = BatchOutcome(entry=entry, success=False)
+    start = time.monotonic()
+    for attempt in range(1, retries + 2):
+        outcome.attempts = attempt
+        outcome.error = _attempt_create(entry, jobs, static_assets)
+        if outcome.error is None:
+            outcome.success = True
+            break
+    outcome.duration_s = time.monotonic() - start
+    return outcome
+
+@app.command("create-batch")
+def create_batch(
+    manifest: str = typer.Argument(..., help="YAML/JSON manifest listing projects (path, prompt/promptfile, ide)"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Projects created in parallel"),
+    retries: int = typer.Option(1, "--retries", help="Extra attempts for a failed project"),
+    jobs: int = typer.Option(2, "--jobs", "-j", help="Scaffolding stages run in parallel per project"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show the full output of every project"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not read or write the LLM response cache"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached LLM responses and store fresh ones"),
+):
+    """
+    Creates many projects from a manifest with a bounded worker pool (non-interactive).
+    """
+    try:
+        entries = load_manifest(Path(manifest))
+    except ValueError as e:
+        console.print(f"[bold red]错误:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+    llm_client.configure_cache(enabled=not no_cache, refresh=refresh)
+    for ide in sorted({entry.ide for entry in entries}):
+        _check_global_config(ide)
+
+    # One LLM client pool, one template/skills load for the whole batch
+    TEMPLATE_STORE.preload()
+    static_assets = load_static_assets()
+    progress = Console(highlight=False)
+    progress.print(f"[bold blue]📦 Creating {len(entries)} project(s) with {workers} worker(s)...[/bold blue]")
+
+    quieted = [c for c in (console, scaffolding_console) if not c.quiet] if not verbose else []
+    for c in quieted:
+        c.quiet = True
+
+    outcomes: List[BatchOutcome] = []
+    start = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="vibe-batch") as pool:
+            futures = [pool.submit(_run_batch_entry, entry, max(0, retries), jobs, static_assets) for entry in entries]
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                outcome = future.result()
+                outcomes.append(outcome)
+                icon = "✅" if outcome.success else "❌"
+                retry_note = f", attempt {outcome.attempts}" if outcome.attempts > 1 else ""
+                progress.print(
+                    f"[{done_count}/{len(entries)}] {icon} {_display_path(Path(outcome.entry.path))} "
+                    f"[dim]({outcome.duration_s:.1f}s{retry_note})[/dim]"
+                )
+    finally:
+        for c in quieted:
+            c.quiet = False
+
+    summary = summarize(outcomes, time.monotonic() - start)
+    order = {entry.path: index for index, entry in enumerate(entries)}
+    table = Table(title="create-batch summary")
+    table.add_column("Project")
+    table.add_column("IDE")
+    table.add_column("Status")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Time", justify="right")
+    table.add_column("Error")
+    for outcome in sorted(outcomes, key=lambda o: order[o.entry.path]):
+        table.add_row(
+            _display_path(Path(outcome.entry.path)),
+            outcome.entry.ide,
+            "[green]success[/green]" if outcome.success else "[red]failed[/red]",
+            str(outcome.attempts),
+            f"{outcome.duration_s:.1f}s",
+            outcome.error or "",
+        )
+    console.print(table)
+    median = f"{summary.median_s:.1f}s" if summary.median_s is not None else "-"
+    console.print(
+        f"[bold]{summary.succeeded}/{summary.total} succeeded[/bold], {summary.failed} failed · "
+        f"total {summary.wall_s:.1f}s · median {median} per project"
+    )
+    _print_llm_stats()
+    if summary.failed:
+        raise typer.Exit(code=1)
+
+backup_app = typer.Typer(help="Backups of files overwritten by --force.")
+app.add_typer(backup_app, name="backup")
+
+def _backup_store(project_dir: str) -> BackupStore:
+    project_path = Path(project_dir).resolve()
+    if not (project_path / ".vibe").exists():
+        console.print(f"[bold red]错误:[/bold red] {project_path} 不是 Vibe 项目 (未找到 .vibe 目录)。")
+        raise typer.Exit(code=1)
+    return BackupStore(project_path)
+
+@backup_app.command("list")
+def backup_list(
+    project_dir: str = typer.Argument(".", help="项目目录路径"),
+):
+    """
+    Lists backup runs, newest first.
+    """
+    store = _backup_store(project_dir)
+    runs = store.runs()
+    if not runs:
+        console.print("[dim]No backups yet.[/dim]")
+        return
+    table = Table(title=f"Backups ({store.root})")
+    table.add_column("run")
+    table.add_column("created")
+    table.add_column("files", justify="right")
+    table.add_column("paths")
+    for run in runs:
+        paths = ", ".join(sorted(run.files)[:3]) + (" ..." if len(run.files) > 3 else "")
+        table.add_row(run.run_id, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run.created)), str(len(run.files)), paths)
+    console.print(table)
+    console.print(f"[dim]Objects: {store.disk_usage() / 1024:.1f} KB[/dim]")
+
+@backup_app.command("restore")
+def backup_restore(
+    run_id: str = typer.Argument(..., help="Run id (see `vibe backup list`)"),
+    project_dir: str = typer.Argument(".", help="项目目录路径"),
+    paths: Optional[List[str]] = typer.Option(None, "--path", "-p", help="Only restore this file (repeatable)"),
+):
+    """
+    Restores the files of a backup run. Current versions are backed up first.
+    """
+    store = _backup_store(project_dir)
+    try:
+        report = store.restore(run_id, paths or None)
+    except KeyError as e:
+        console.print(f"[bold red]错误:[/bold red] 未找到备份 {e}。")
+        raise typer.Exit(code=1)
+    for rel_path in report.written:
+        console.print(f"[green]♻️  Restored:[/green] {rel_path}")
+    for rel_path, error in report.failed.items():
+        console.print(f"[bold red]Failed to restore {rel_path}: {error}[/bold red]")
+    if report.failed:
+        raise typer.Exit(code=1)
+
+@backup_app.command("prune")
+def backup_prune(
+    project_dir: str = typer.Argument(".", help="项目目录路径"),
+    keep: int = typer.Option(DEFAULT_KEEP_RUNS, "--keep", help="Newest runs to keep"),
+    max_mb: float = typer.Option(DEFAULT_MAX_BYTES / (1024 * 1024), "--max-mb", help="Maximum size of the kept backups"),
+):
+    """
+    Removes old backup runs and unreferenced objects.
+    """
+    store = _backup_store(project_dir)
+    store.keep_runs, store.max_bytes = keep, int(max_mb * 1024 * 1024)
+    runs, objects = store.prune()
+    console.print(f"[green]🧹 Removed {runs} run(s) and {objects} object(s); {store.disk_usage() / 1024:.1f} KB left.[/green]")
+
+queue_app = typer.Typer(help="Durable job queue for large batch runs.")
+app.add_typer(queue_app, name="queue")
+
+DB_OPTION_HELP = "Queue database file"
+
+def _heartbeat(queue: JobQueue, job_id: int, stop: threading.Event) -> None:
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.heartbeat(job_id):
+            return
+
+def _run_queue_job(job: Job, static_assets: Optional[RuleBundle]) -> Optional[str]:
+    """Runs one claimed job; returns None on success or an error description."""
+    if job.kind == "create":
+        return _attempt_create(BatchEntry(**job.payload), job.payload.get("jobs", 2), static_assets)
+    if job.kind == "plan":
+        project_path = Path(job.target)
+        try:
+            _run_plan_logic(project_path, incremental=True)
+        except SystemExit as e:
+            return f"aborted (exit code {e.code})"
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        if not (project_path / ".context" / "activeContext.md").exists():
+            return "activeContext.md was not produced"
+        return None
+    return f"unknown job kind: {job.kind}"
+
+def _queue_worker(db_path: str, lease_seconds: float, verbose: bool) -> None:
+    """Worker process: claims jobs until nothing is pending."""
+    if not verbose:
+        console.quiet = True
+        scaffolding_console.quiet = True
+    queue = JobQueue(Path(db_path), lease_seconds=lease_seconds)
+    TEMPLATE_STORE.preload()
+    static_assets = load_static_assets()
+    while True:
+        job = queue.claim()
+        if job is None:
+            return
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(queue, job.id, stop), daemon=True)
+        beat.start()
+        try:
+            error = _run_queue_job(job, static_assets)
+        finally:
+            stop.set()
+            beat.join()
+        if error is None:
+            queue.complete(job.id)
+        else:
+            queue.fail(job.id, error)
+
+@queue_app.command("add")
+def queue_add(
+    manifest: str = typer.Argument(..., help="YAML/JSON manifest (same format as create-batch)"),
+    max_attempts: int = typer.Option(3, "--max-attempts", help="Attempts per job before it is marked failed"),
+    db: Path = typer.Option(DEFAULT_QUEUE_PATH, "--db", help=DB_OPTION_HELP),
+):
+    """
+    Queues a create job for every manifest entry.
+    """
+    try:
+        entries = load_manifest(Path(manifest))
+    except ValueError as e:
+        console.print(f"[bold red]错误:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    queue = JobQueue(db)
+    added = sum(1 for entry in entries if queue.enqueue("create", entry.path, asdict(entry), max_attempts) is not None)
+    console.print(f"[green]✅ Queued {added} create job(s)[/green] [dim]({len(entries) - added} already queued) → {db}[/dim]")
+
+@queue_app.command("add-plan")
+def queue_add_plan(
+    project_dirs: List[str] = typer.Argument(..., help="Project directories to (re)plan"),
+    max_attempts: int = typer.Option(3, "--max-attempts", help="Attempts per job before it is marked failed"),
+    db: Path = typer.Option(DEFAULT_QUEUE_PATH, "--db", help=DB_OPTION_HELP),
+):
+    """
+    Queues plan jobs for existing projects.
+    """
+    queue = JobQueue(db)
+    added = 0
+    for project_dir in project_dirs:
+        target = str(Path(project_dir).resolve())
+        if queue.enqueue("plan", target, {"path": target}, max_attempts) is not None:
+            added += 1
+    console.print(f"[green]✅ Queued {added} plan job(s)[/green] [dim]→ {db}[/dim]")
+
+@queue_app.command("work")
+def queue_work(
+    workers: int = typer.Option(4, "--workers", "-w", help="Worker processes"),
+    lease: float = typer.Option(DEFAULT_LEASE_SECONDS, "--lease", help="Seconds a job stays leased without a heartbeat"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show the full output of every job"),
+    db: Path = typer.Option(DEFAULT_QUEUE_PATH, "--db", help=DB_OPTION_HELP),
+):
+    """
+    Runs queued jobs in worker processes until the queue is drained.
+    Interrupted runs resume where they stopped: leases of dead workers are released.
+    """
+    queue = JobQueue(db, lease_seconds=lease)
+    pending = queue.counts()["pending"]
+    console.print(f"[bold blue]🏭 Starting {workers} worker(s) for {pending} pending job(s)...[/bold blue]")
+
+    # spawn: workers must not inherit the parent's threads or event loop
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_queue_worker, args=(str(db), lease, verbose), daemon=False) for _ in range(max(1, workers))]
+    for process in processes:
+        process.start()
+
+    last_counts = None
+    try:
+        while any(process.is_alive() for process in processes):
+            counts = queue.counts()
+            if counts != last_counts:
+                console.print(f"[dim]   pending {counts['pending']} · running {counts['running']} · done {counts['done']} · failed {counts['failed']}[/dim]")
+                last_counts = counts
+            time.sleep(1)
+    except KeyboardInterrupt:
+        console.print("[yellow]⏸️  Stopping workers; run `vibe queue work` again to resume.[/yellow]")
+        for process in processes:
+            process.terminate()
+    for process in processes:
+        process.join()
+    _print_queue_status(queue)
+
+@queue_app.command("status")
+def queue_status(
+    db: Path = typer.Option(DEFAULT_QUEUE_PATH, "--db", help=DB_OPTION_HELP),
+):
+    """
+    Shows backlog, throughput and failed jobs.
+    """
+    _print_queue_status(JobQueue(db))
+
+@queue_app.command("retry")
+def queue_retry(
+    db: Path = typer.Option(DEFAULT_QUEUE_PATH, "--db", help=DB_OPTION_HELP),
+):
+    """
+    Moves failed jobs back to pending.
+    """
+    count = JobQueue(db).retry_failed()
+    console.print(f"[green]🔁 {count} failed job(s) re-queued.[/green]")
+
+def _print_queue_status(queue: JobQueue) -> None:
+    stats = queue.stats()
+    table = Table(title=f"Job queue ({queue.path})")
+    for column in ("pending", "running", "done", "failed"):
+        table.add_column(column, justify="right")
+    table.add_row(*(str(stats.counts[state]) for state in ("pending", "running", "done", "failed")))
+    console.print(table)
+
+    console.print(f"Backlog: [bold]{stats.backlog}[/bold] job(s)", end="")
+    if stats.oldest_pending_s is not None:
+        console.print(f" · oldest pending {stats.oldest_pending_s:.0f}s", end="")
+    console.print()
+    avg = f", avg {stats.avg_duration_s:.1f}s/job" if stats.avg_duration_s is not None else ""
+    console.print(f"Throughput (last hour): {stats.done_in_window} done · {stats.per_minute:.2f} job(s)/min{avg}")
+    if stats.eta_s is not None:
+        console.print(f"ETA: ~{stats.eta_s / 60:.1f} min")
+
+    failed = queue.jobs("failed")
+    if failed:
+        console.print("[bold red]Failed jobs:[/bold red]")
+        for job in failed:
+            console.print(f"  #{job.id} {job.kind} {job.target} [dim]({job.attempts} attempt(s)): {job.error}[/dim]")
 
 if __name__ == "__main__":
     app()
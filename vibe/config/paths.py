@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Package root (vibe/)
@@ -8,3 +9,6 @@ TEMPLATES_DIR = PACKAGE_ROOT / "templates"
 PROMPTS_DIR = TEMPLATES_DIR / "prompts"
 RULES_DIR = TEMPLATES_DIR / "rules"
 SCRIPTS_DIR = TEMPLATES_DIR / "scripts"
+
+# User cache directory (LLM responses, latency history)
+CACHE_DIR = Path(os.environ.get("VIBE_CACHE_DIR", Path.home() / ".cache" / "vibe"))
@@ -1,26 +1,35 @@
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
 from .paths import PACKAGE_ROOT
 
+@lru_cache(maxsize=1)
+def _default_config_paths() -> Tuple[str, str]:
+    """Repo-relative default config paths; resolve() is the expensive part, so it runs once."""
+    # Adjust for package structure: PACKAGE_ROOT is 'vibe/', so parent is repo root
+    repo_root = PACKAGE_ROOT.parent
+
+    # Using relative paths for this specific workspace setup (legacy compat)
+    try:
+        user_config = str((repo_root / "../my-llm-sdk/config.yaml").resolve())
+        project_config = str((repo_root / "../my-llm-sdk/llm.project.yaml").resolve())
+    except Exception:
+         # Fallback if cannot resolve relative paths
+         user_config = "config.yaml"
+         project_config = "llm.project.yaml"
+    return user_config, project_config
+
 class Settings:
     @staticmethod
     def resolve_config_paths():
         """Resolves config paths for LLMClient."""
-        # Adjust for package structure: PACKAGE_ROOT is 'vibe/', so parent is repo root
-        repo_root = PACKAGE_ROOT.parent
-        
-        # Using relative paths for this specific workspace setup (legacy compat)
-        try:
-            user_config = str((repo_root / "../my-llm-sdk/config.yaml").resolve())
-            project_config = str((repo_root / "../my-llm-sdk/llm.project.yaml").resolve())
-        except Exception:
-             # Fallback if cannot resolve relative paths
-             user_config = "config.yaml"
-             project_config = "llm.project.yaml"
-        
+        user_config, project_config = _default_config_paths()
+
+        # Checked on every call: local configs may be created while the process runs
         if os.path.exists("./config.yaml"):
            user_config = "./config.yaml"
         if os.path.exists("./llm.project.yaml"):
            project_config = "./llm.project.yaml"
-    
+
         return user_config, project_config
@@ -1,9 +1,12 @@
 """
 Vibe-CLI Core Module.
 """
-from vibe.core.pipeline import Pipeline, PipelineStage
+from vibe.core.pipeline import Pipeline, PipelineStage, StageTiming
+from vibe.core.state import StateStore
 
 __all__ = [
     "Pipeline",
     "PipelineStage",
+    "StageTiming",
+    "StateStore",
 ]
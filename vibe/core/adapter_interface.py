@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Mapping, Optional, Union
 
 @dataclass
 class RuleBundle:
@@ -12,16 +13,25 @@ class RuleBundle:
     # e.g., "00_project_context.md" -> "... content ..."
     rules: Dict[str, str] = field(default_factory=dict)
     
-    # Map of script names to their content
+    # Map of script names to their content, or to the source file if copied verbatim
     # e.g., "inspect_sdk.py" -> "print('hello')"
-    scripts: Dict[str, str] = field(default_factory=dict)
+    scripts: Dict[str, Union[str, Path]] = field(default_factory=dict)
 
-    # Map of skill name to its internal files
+    # Map of skill name to its internal files. Rendered files are strings;
+    # verbatim files (non-.j2 templates, binary assets) are source paths.
+    # Values are usually lazy SkillHandles: files are read on first access.
     # e.g., "doc-maintainer" -> {
     #    "SKILL.md": "...",
-    #    "scripts/analyze.py": "..."
+    #    "references/diagram.png": Path(".../skills/doc-maintainer/references/diagram.png")
     # }
-    skills: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    skills: Dict[str, Mapping[str, Union[str, Path]]] = field(default_factory=dict)
+
+    # Skills of the library that were not selected, with the reason
+    skipped_skills: Dict[str, str] = field(default_factory=dict)
+
+    # Stack rules composed into 02_stack.md, and those left out by the token budget
+    stacks: List[str] = field(default_factory=list)
+    dropped_stacks: List[str] = field(default_factory=list)
 
 @dataclass
 class WritePlan:
@@ -33,6 +43,17 @@ class WritePlan:
     # e.g., ".cursor/rules/core.mdc" -> "..."
     #       "CLAUDE.md" -> "..."
     files: Dict[str, str] = field(default_factory=dict)
+
+    # Map of relative paths to source files copied byte-for-byte
+    # (verbatim templates, binary assets); never read into memory.
+    copies: Dict[str, Path] = field(default_factory=dict)
+
+    def add(self, rel_path: str, content: Union[str, Path]) -> None:
+        """Adds text content, or a source file to copy."""
+        if isinstance(content, Path):
+            self.copies[rel_path] = content
+        else:
+            self.files[rel_path] = content
     
     # List of files that should be backed up if they exist and are about to be overwritten
     # implied by the keys in 'files', but explicit control can be useful.
@@ -42,6 +63,11 @@ class BaseAdapter(ABC):
     """
     Abstract base class for IDE adapters.
     """
+
+    # What the IDE can do with project skills; build_rule_bundle only emits
+    # skills whose needs are covered ("skills": installs SKILL.md folders,
+    # "scripts": its agent can run skill scripts).
+    skill_capabilities: FrozenSet[str] = frozenset({"skills", "scripts"})
     
     @abstractmethod
     def project(self, rule_bundle: RuleBundle) -> WritePlan:
@@ -1,5 +1,6 @@
 from pathlib import Path
 from vibe.core.adapter_interface import BaseAdapter, RuleBundle, WritePlan
+from vibe.templates.render import render_checked
 
 from vibe.core.adapter_registry import AdapterRegistry
 
@@ -19,7 +20,7 @@ class AntigravityAdapter(BaseAdapter):
             # e.g., "00_project_context.md" -> ".agent/rules/00_project_context.md"
             target_path = f".agent/rules/{rule_name}"
             # Inject correct skills path
-            final_content = content.replace("{{SKILLS_DIR}}", ".agent/skills")
+            final_content = render_checked(content, target_path, {"SKILLS_DIR": ".agent/skills"})
             plan.files[target_path] = final_content
             
         # 2. task.md (Pointer)
@@ -48,13 +49,14 @@ class AntigravityAdapter(BaseAdapter):
             )
             
             # run.py
-            plan.files[f"{skill_dir}/run.py"] = content
+            plan.add(f"{skill_dir}/run.py", content)
 
         # 4. Project Skills (New Standard Structure)
         for skill_name, skill_files in rule_bundle.skills.items():
             base_path = Path(".agent/skills") / skill_name
             for rel_path, content in skill_files.items():
                 target_path = (base_path / rel_path).as_posix()
-                plan.files[target_path] = content
+                # Verbatim files and binary assets are copied, not rendered
+                plan.add(target_path, content if isinstance(content, Path) else render_checked(content, target_path, {"SKILLS_DIR": ".agent/skills"}))
         
         return plan
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from vibe.core.adapter_interface import BaseAdapter, RuleBundle, WritePlan
+from vibe.templates.render import render_checked
 
 from vibe.core.adapter_registry import AdapterRegistry
 
@@ -24,17 +25,17 @@ class ClaudeAdapter(BaseAdapter):
             "- **System Architecture**: Read `.context/systemPatterns.md` for tech stack.",
             "",
             "## Workflow",
-            rule_bundle.rules.get("01_workflow.md", "").replace("{{SKILLS_DIR}}", ".claude/skills"),
+            render_checked(rule_bundle.rules.get("01_workflow.md", ""), "01_workflow.md", {"SKILLS_DIR": ".claude/skills"}),
             "",
             "## Tech Stack",
-            rule_bundle.rules.get("02_stack.md", "").replace("{{SKILLS_DIR}}", ".claude/skills"), # Normalized key
+            render_checked(rule_bundle.rules.get("02_stack.md", ""), "02_stack.md", {"SKILLS_DIR": ".claude/skills"}), # Normalized key
             "",
             "## Output Format",
-            rule_bundle.rules.get("03_output_format.md", "").replace("{{SKILLS_DIR}}", ".claude/skills"),
+            render_checked(rule_bundle.rules.get("03_output_format.md", ""), "03_output_format.md", {"SKILLS_DIR": ".claude/skills"}),
             "",
             "## Environment & LLM",
-            rule_bundle.rules.get("00a_project_environment.md", "").replace("{{SKILLS_DIR}}", ".claude/skills"),
-            rule_bundle.rules.get("00b_llm_integration.md", "").replace("{{SKILLS_DIR}}", ".claude/skills"),
+            render_checked(rule_bundle.rules.get("00a_project_environment.md", ""), "00a_project_environment.md", {"SKILLS_DIR": ".claude/skills"}),
+            render_checked(rule_bundle.rules.get("00b_llm_integration.md", ""), "00b_llm_integration.md", {"SKILLS_DIR": ".claude/skills"}),
         ]
         
         # Clean up empty lines or None
@@ -82,7 +83,7 @@ class ClaudeAdapter(BaseAdapter):
              # For Claude, we place scripts in .claude/skills/ to keep root clean
              # They can be run via `python .claude/skills/xxx.py`
              skill_path = f".claude/skills/{script_name}"
-             plan.files[skill_path] = content
+             plan.add(skill_path, content)
              skills_summary.append(f"- **{script_name}**: (Located at `{skill_path}`)")
 
         # 5. Project Skills (New Standard Structure)
@@ -90,7 +91,8 @@ class ClaudeAdapter(BaseAdapter):
             base_path = Path(".claude/skills") / skill_name
             for rel_path, content in skill_files.items():
                 target_path = (base_path / rel_path).as_posix()
-                plan.files[target_path] = content
+                # Verbatim files and binary assets are copied, not rendered
+                plan.add(target_path, content if isinstance(content, Path) else render_checked(content, target_path, {"SKILLS_DIR": ".claude/skills"}))
             
             # Add to summary
             skills_summary.append(f"- **{skill_name}**: Located at `{base_path.as_posix()}/`")
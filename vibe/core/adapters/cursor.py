@@ -1,5 +1,6 @@
 from pathlib import Path
 from vibe.core.adapter_interface import BaseAdapter, RuleBundle, WritePlan
+from vibe.templates.render import render_checked
 
 from vibe.core.adapter_registry import AdapterRegistry
 
@@ -30,7 +31,7 @@ class CursorAdapter(BaseAdapter):
             "## 2. Architecture\n"
             "Read `.context/systemPatterns.md` for architectural patterns.\n\n"
             "## 3. Workflow\n"
-            f"{rule_bundle.rules.get('01_workflow.md', '').replace('{{SKILLS_DIR}}', '.cursor/skills')}\n"
+            f"{render_checked(rule_bundle.rules.get('01_workflow.md', ''), '01_workflow.md', {'SKILLS_DIR': '.cursor/skills'})}\n"
         )
         plan.files[".cursor/rules/00_core.mdc"] = core_mdc
         
@@ -54,7 +55,8 @@ class CursorAdapter(BaseAdapter):
             base_path = Path(".cursor/skills") / skill_name
             for rel_path, content in skill_files.items():
                 target_path = (base_path / rel_path).as_posix()
-                plan.files[target_path] = content
+                # Verbatim files and binary assets are copied, not rendered
+                plan.add(target_path, content if isinstance(content, Path) else render_checked(content, target_path, {"SKILLS_DIR": ".cursor/skills"}))
             
             skills_summary.append(f"- **{skill_name}**: Located at `{base_path.as_posix()}/SKILL.md`")
             
@@ -0,0 +1,323 @@
+"""
+Content-addressed backup store for files overwritten by apply_write_plan.
+
+Layout under <project>/.vibe/backup/:
+
+    objects/<2 hex>/<sha256>[.z]   file content, shared by every run that backs it up
+    runs/<run id>.json             {rel path: {sha256, size, mode}} of one apply
+
+Content already in the store costs one stat to back up again. A new object
+is, in order of preference: a hardlink to the file about to be replaced
+(apply_write_plan swaps in a new inode with os.replace, so the old inode
+simply lives on as the backup), a reflink clone on copy-on-write
+filesystems, or a zlib-compressed copy (".z"). Old runs are pruned to
+keep_runs / max_bytes and objects no run references are deleted.
+"""
+import json
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from vibe.core.manifest import file_hash
+from vibe.core.writer import WriteOp, WriteReport, clone_file, write_files
+
+BACKUP_DIR = Path(".vibe") / "backup"
+
+# Retention: newest runs kept, and the most object bytes they may reference
+DEFAULT_KEEP_RUNS = 10
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+COMPRESSED_SUFFIX = ".z"
+
+def _reflink(source: Path, target: Path) -> bool:
+    """Clones source to a new target on copy-on-write filesystems; False where unsupported."""
+    try:
+        with open(source, "rb") as src, open(target, "xb") as dst:
+            if clone_file(src.fileno(), dst.fileno()):
+                return True
+    except OSError:
+        return False
+    os.unlink(target)
+    return False
+
+
+@dataclass
+class BackupRunInfo:
+    """A recorded backup run."""
+    run_id: str
+    created: float
+    files: Dict[str, Dict] = field(default_factory=dict)
+
+
+class BackupRun:
+    """Collects the files backed up by one apply; commit() records the run."""
+
+    def __init__(self, store: "BackupStore", run_id: str):
+        self.store = store
+        self.run_id = run_id
+        self.created = time.time()
+        self.files: Dict[str, Dict] = {}
+        # rel path -> sha256 of objects that are hardlinks to a live file
+        self._linked: Dict[str, str] = {}
+
+    def add(self, rel_path: str, path: Union[str, Path], sha256: Optional[str] = None, link: bool = False) -> str:
+        """
+        Backs up a file.
+
+        Args:
+            rel_path: Path relative to the project root.
+            path: The file to back up.
+            sha256: Its content hash, if already known.
+            link: Allow a hardlink; only valid if the file is about to be replaced
+                  by a rename (call release() for any replacement that failed).
+
+        Returns:
+            The sha256 of the backed-up content.
+        """
+        st = os.stat(path)
+        if link and (st.st_nlink > 1 or os.path.islink(path)):
+            # Another name (or the link's destination) outlives the replacement:
+            # a hardlinked object would change whenever that file is edited
+            link = False
+        if sha256 is None:
+            sha256 = file_hash(path)
+        if self.store.store_object(Path(path), sha256, link=link) == "hardlink":
+            self._linked[rel_path] = sha256
+        self.files[rel_path] = {"sha256": sha256, "size": st.st_size, "mode": st.st_mode & 0o7777}
+        return sha256
+
+    def release(self, rel_paths: Iterable[str]) -> None:
+        """Turns hardlinked objects of files that were not replaced into independent copies."""
+        for rel_path in rel_paths:
+            sha256 = self._linked.pop(rel_path, None)
+            if sha256 is not None:
+                self.store.detach(sha256)
+
+    def commit(self) -> bool:
+        """Records the run (if it backed anything up) and applies the retention policy."""
+        if not self.files:
+            return False
+        self.store.save_run(self)
+        self.store.prune()
+        return True
+
+
+class BackupStore:
+    """
+    Deduplicated, compressed backups for one project.
+    """
+
+    def __init__(self, project_root: Union[str, Path], keep_runs: int = DEFAULT_KEEP_RUNS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.project_root = Path(project_root)
+        self.root = self.project_root / BACKUP_DIR
+        self.objects_dir = self.root / "objects"
+        self.runs_dir = self.root / "runs"
+        self.keep_runs = keep_runs
+        self.max_bytes = max_bytes
+        # Cleared after the first failed clone: the filesystem cannot reflink
+        self._try_reflink = True
+
+    # --- Objects ---
+
+    def _object_base(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / sha256
+
+    def object_path(self, sha256: str) -> Optional[Path]:
+        """Where the object is stored, or None if it is not in the store."""
+        base = self._object_base(sha256)
+        for candidate in (base, base.with_name(base.name + COMPRESSED_SUFFIX)):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def store_object(self, source: Path, sha256: str, link: bool = False) -> str:
+        """
+        Adds the content of source under sha256.
+
+        Returns:
+            How it was stored: "existing", "hardlink", "reflink" or "compressed".
+        """
+        if self.object_path(sha256) is not None:
+            return "existing"
+        base = self._object_base(sha256)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        if link:
+            try:
+                os.link(source, base)
+                return "hardlink"
+            except OSError:
+                pass  # Other filesystem, or links not supported
+        if self._try_reflink:
+            if _reflink(source, base):
+                return "reflink"
+            self._try_reflink = False
+        self._write_compressed(source.read_bytes(), base)
+        return "compressed"
+
+    def _write_compressed(self, data: bytes, base: Path) -> None:
+        target = base.with_name(base.name + COMPRESSED_SUFFIX)
+        tmp_path = base.with_name(f".{base.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            # Objects are immutable: a concurrent writer of the same hash wrote the same bytes
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def detach(self, sha256: str) -> None:
+        """Replaces a hardlinked object by a compressed copy, so it no longer shares an inode."""
+        base = self._object_base(sha256)
+        try:
+            if os.stat(base).st_nlink < 2:
+                return
+        except FileNotFoundError:
+            return
+        self._write_compressed(base.read_bytes(), base)
+        os.unlink(base)
+
+    def read(self, sha256: str) -> bytes:
+        """
+        Content of an object.
+
+        Raises:
+            FileNotFoundError: If the object is not in the store.
+        """
+        path = self.object_path(sha256)
+        if path is None:
+            raise FileNotFoundError(f"Backup object {sha256} is missing")
+        data = path.read_bytes()
+        return zlib.decompress(data) if path.name.endswith(COMPRESSED_SUFFIX) else data
+
+    def _object_sizes(self) -> Dict[str, Tuple[Path, int]]:
+        sizes: Dict[str, Tuple[Path, int]] = {}
+        if not self.objects_dir.is_dir():
+            return sizes
+        for prefix in os.scandir(self.objects_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.name.startswith("."):
+                    continue  # Temporary file of an interrupted write
+                sha256 = entry.name[:-len(COMPRESSED_SUFFIX)] if entry.name.endswith(COMPRESSED_SUFFIX) else entry.name
+                sizes[sha256] = (Path(entry.path), entry.stat().st_size)
+        return sizes
+
+    def disk_usage(self) -> int:
+        """Bytes used by stored objects."""
+        return sum(size for _, size in self._object_sizes().values())
+
+    # --- Runs ---
+
+    def new_run(self) -> BackupRun:
+        """Starts a run with a unique, time-ordered id (YYYYmmdd-HHMMSS[-n])."""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        run_id, n = stamp, 1
+        while (self.runs_dir / f"{run_id}.json").exists():
+            n += 1
+            run_id = f"{stamp}-{n}"
+        return BackupRun(self, run_id)
+
+    def save_run(self, run: BackupRun) -> None:
+        path = self.runs_dir / f"{run.run_id}.json"
+        data = {"run": run.run_id, "created": run.created, "files": run.files}
+        report = write_files([WriteOp(path.name, path, json.dumps(data, indent=2, sort_keys=True))], fsync=False)
+        if report.failed:
+            raise OSError(report.failed[path.name])
+
+    def runs(self) -> List[BackupRunInfo]:
+        """Recorded runs, newest first. Unreadable run files are ignored."""
+        infos = []
+        if not self.runs_dir.is_dir():
+            return infos
+        for path in self.runs_dir.glob("*.json"):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                infos.append(BackupRunInfo(path.stem, float(data.get("created", 0)), dict(data.get("files", {}))))
+            except (OSError, ValueError, TypeError):
+                continue
+        return sorted(infos, key=lambda info: (info.created, info.run_id), reverse=True)
+
+    def get_run(self, run_id: str) -> BackupRunInfo:
+        """
+        Raises:
+            KeyError: If there is no such run.
+        """
+        for info in self.runs():
+            if info.run_id == run_id:
+                return info
+        raise KeyError(run_id)
+
+    def prune(self) -> Tuple[int, int]:
+        """
+        Applies the retention policy: keeps the newest keep_runs runs, drops the
+        oldest of those while their objects exceed max_bytes (the newest run is
+        always kept), then deletes objects no remaining run references.
+
+        Returns:
+            (runs removed, objects removed).
+        """
+        runs = self.runs()
+        kept, removed = runs[:max(1, self.keep_runs)], runs[max(1, self.keep_runs):]
+        sizes = self._object_sizes()
+
+        def referenced(infos: List[BackupRunInfo]) -> Set[str]:
+            return {entry["sha256"] for info in infos for entry in info.files.values()}
+
+        while len(kept) > 1 and sum(sizes[sha][1] for sha in referenced(kept) if sha in sizes) > self.max_bytes:
+            removed.append(kept.pop())
+
+        for info in removed:
+            try:
+                os.unlink(self.runs_dir / f"{info.run_id}.json")
+            except OSError:
+                pass
+
+        live = referenced(kept)
+        removed_objects = 0
+        for sha256, (path, _) in sizes.items():
+            if sha256 not in live:
+                try:
+                    os.unlink(path)
+                    removed_objects += 1
+                except OSError:
+                    pass
+        return len(removed), removed_objects
+
+    def restore(self, run_id: str, paths: Optional[List[str]] = None) -> WriteReport:
+        """
+        Puts the files of a run back in place. Current versions that differ are
+        first backed up as a new run, so a restore can itself be undone.
+
+        Args:
+            run_id: Run to restore.
+            paths: Only restore these relative paths (default: every file of the run).
+
+        Raises:
+            KeyError: If the run, or one of the paths in it, does not exist.
+        """
+        info = self.get_run(run_id)
+        selected = paths if paths is not None else sorted(info.files)
+        safety = self.new_run()
+        ops = []
+        for rel_path in selected:
+            entry = info.files[rel_path]
+            target = self.project_root / rel_path
+            if target.exists():
+                current = file_hash(target)
+                if current == entry["sha256"]:
+                    continue  # Already in place
+                safety.add(rel_path, target, sha256=current, link=True)
+            ops.append(WriteOp(rel_path, target, self.read(entry["sha256"]), entry.get("mode")))
+        report = write_files(ops)
+        safety.release(report.failed)
+        safety.commit()
+        return report
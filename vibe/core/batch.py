@@ -0,0 +1,136 @@
+"""
+Batch manifests for `vibe create-batch`.
+
+A manifest lists the projects to bootstrap, either as a bare list or as
+a mapping with shared `defaults` and a `projects` list:
+
+    defaults:
+      ide: claude
+    projects:
+      - path: apps/todo
+        prompt: "A todo app"
+      - path: apps/chat
+        promptfile: chat_requirements.md
+        ide: cursor
+"""
+import json
+import statistics
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import yaml
+except ImportError:  # JSON manifests still work without PyYAML
+    yaml = None
+
+
+@dataclass
+class BatchEntry:
+    """One project of a batch. Relative paths are resolved against the manifest."""
+    path: str
+    prompt: Optional[str] = None
+    promptfile: Optional[str] = None
+    ide: str = "antigravity"
+    no_plan: bool = False
+    force: bool = False
+
+
+@dataclass
+class BatchOutcome:
+    """Result of running one entry, after retries."""
+    entry: BatchEntry
+    success: bool
+    attempts: int = 0
+    duration_s: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_s: float = 0.0
+    median_s: Optional[float] = None
+    failures: List[BatchOutcome] = field(default_factory=list)
+
+
+_ENTRY_FIELDS = {f.name for f in fields(BatchEntry)}
+
+
+def _parse(text: str, suffix: str) -> Any:
+    if suffix == ".json":
+        return json.loads(text)
+    if yaml is None:
+        raise ValueError("Reading YAML manifests requires PyYAML (pip install pyyaml), or use a .json manifest")
+    return yaml.safe_load(text)
+
+
+def load_manifest(manifest_path: Path) -> List[BatchEntry]:
+    """
+    Reads and validates a batch manifest.
+
+    Args:
+        manifest_path: YAML (.yaml/.yml) or JSON (.json) manifest.
+
+    Returns:
+        Entries with paths resolved relative to the manifest's directory.
+
+    Raises:
+        ValueError: If the manifest is unreadable or an entry is invalid.
+    """
+    manifest_path = Path(manifest_path)
+    try:
+        data = _parse(manifest_path.read_text(encoding="utf-8"), manifest_path.suffix.lower())
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot read manifest {manifest_path}: {e}") from e
+    except Exception as e:  # yaml.YAMLError
+        raise ValueError(f"Invalid manifest {manifest_path}: {e}") from e
+
+    defaults: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        data = data.get("projects")
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"Manifest {manifest_path} must contain a non-empty list of projects")
+
+    base = manifest_path.resolve().parent
+    entries: List[BatchEntry] = []
+    seen = set()
+    for index, raw in enumerate(data, start=1):
+        if not isinstance(raw, dict):
+            raise ValueError(f"Entry #{index} must be a mapping")
+        values = {**defaults, **raw}
+        unknown = set(values) - _ENTRY_FIELDS
+        if unknown:
+            raise ValueError(f"Entry #{index} has unknown keys: {', '.join(sorted(unknown))}")
+        if not values.get("path"):
+            raise ValueError(f"Entry #{index} has no path")
+        if not values.get("prompt") and not values.get("promptfile"):
+            raise ValueError(f"Entry #{index} ({values['path']}) needs a prompt or promptfile")
+
+        entry = BatchEntry(**values)
+        entry.path = str((base / entry.path).resolve())
+        if entry.promptfile:
+            entry.promptfile = str((base / entry.promptfile).resolve())
+            if not Path(entry.promptfile).exists():
+                raise ValueError(f"Entry #{index} ({raw['path']}): promptfile not found: {entry.promptfile}")
+        if entry.path in seen:
+            raise ValueError(f"Entry #{index}: duplicate project path {entry.path}")
+        seen.add(entry.path)
+        entries.append(entry)
+    return entries
+
+
+def summarize(outcomes: List[BatchOutcome], wall_s: float) -> BatchSummary:
+    """Aggregates batch outcomes for the final report."""
+    durations = [o.duration_s for o in outcomes if o.success]
+    return BatchSummary(
+        total=len(outcomes),
+        succeeded=sum(1 for o in outcomes if o.success),
+        failed=sum(1 for o in outcomes if not o.success),
+        wall_s=wall_s,
+        median_s=statistics.median(durations) if durations else None,
+        failures=[o for o in outcomes if not o.success],
+    )
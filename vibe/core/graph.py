@@ -0,0 +1,120 @@
+"""
+Content-hash dependency graph for incremental rebuilds.
+
+Each node records the hashes of the inputs it was built from and of the
+output it produced. Comparing them with the current content decides,
+build-system style, which stages must run again and why.
+"""
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from vibe.core.state import STATE_DIR, hash_inputs
+
+GRAPH_FILE = "graph.json"
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    """A buildable context and the inputs it depends on."""
+    name: str
+    inputs: List[str]
+    filename: Optional[str] = None
+
+
+# Pipeline contexts in topological order
+CONTEXT_GRAPH: List[GraphNode] = [
+    GraphNode("productContext", ["user_request"], "productContext.md"),
+    GraphNode("systemPatterns", ["user_request", "productContext"], "systemPatterns.md"),
+    GraphNode("activeContext", ["productContext", "systemPatterns"], "activeContext.md"),
+    # IDE rules depend on the selected stack rule, not on the full architecture text
+    GraphNode("rules", ["stack", "ide"]),
+]
+
+
+@dataclass
+class Decision:
+    """Whether a node runs, and the reason shown to the user."""
+    node: str
+    run: bool
+    reason: str
+    # False when the node is skipped but its record must be kept as-is
+    record: bool = True
+
+
+_NODES = {node.name: node for node in CONTEXT_GRAPH}
+
+_INPUT_LABELS = {"user_request": "user request", "stack": "stack selection", "ide": "IDE"}
+
+
+def _label(name: str) -> str:
+    node = _NODES.get(name)
+    if node is not None and node.filename:
+        return node.filename
+    return _INPUT_LABELS.get(name, name)
+
+
+class DependencyGraph:
+    """
+    Build records for one project, stored in .vibe/state/graph.json.
+    """
+
+    def __init__(self, project_dir: Path):
+        self.path = Path(project_dir) / STATE_DIR / GRAPH_FILE
+        try:
+            self._records: Dict[str, Dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._records = {}
+
+    def decide(self, node: str, inputs: Dict[str, str], output: Optional[str] = None, force: bool = False,
+               edits_are_input: bool = False) -> Decision:
+        """
+        Decides whether a node has to be rebuilt.
+
+        Args:
+            node: Node name (see CONTEXT_GRAPH).
+            inputs: Current content of each input.
+            output: Current content of the node's output, if it exists.
+            force: Rebuild even if the output was edited by hand.
+            edits_are_input: A hand-edited output is a reason to rebuild rather than
+                             to keep it (`vibe plan` reads the progress the agent
+                             wrote into activeContext.md).
+
+        Returns:
+            The Decision, with a human-readable reason.
+        """
+        record = self._records.get(node)
+        if record is None:
+            return Decision(node, True, "no previous build")
+
+        recorded_inputs = record.get("inputs", {})
+        changed = [name for name, value in inputs.items() if recorded_inputs.get(name) != hash_inputs(value)]
+        if output is None and _NODES[node].filename:
+            return Decision(node, True, "output missing")
+        edited = output is not None and record.get("output") != hash_inputs(output)
+        if edited and edits_are_input:
+            changed.append(node)
+        if not changed:
+            return Decision(node, False, "up to date")
+
+        reason = ", ".join(_label(name) for name in changed) + " changed"
+        if edited and not edits_are_input and not force:
+            return Decision(node, False, f"{reason}, but it was edited by hand (use --force to regenerate)", record=False)
+        return Decision(node, True, reason)
+
+    def record(self, node: str, inputs: Dict[str, str], output: Optional[str] = None) -> None:
+        """Stores the input and output hashes of a node that is now up to date."""
+        self._records[node] = {
+            "inputs": {name: hash_inputs(value) for name, value in inputs.items()},
+            "output": hash_inputs(output) if output is not None else None,
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._records, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
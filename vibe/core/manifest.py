@@ -0,0 +1,120 @@
+"""
+Manifest of the files Vibe generated in a project.
+
+.vibe/manifest.json records, for every file apply_write_plan wrote, the
+sha256 of the content it wrote, the Vibe template version that produced it
+and the file's size and mtime right after the write. That answers two
+questions without reading whole files in the common case:
+
+- Is the new content identical to what is on disk? (compare hashes, skip the write)
+- Did the user edit the file since Vibe wrote it? (stat matches -> untouched;
+  otherwise hash the file and compare with the recorded hash)
+"""
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from vibe import __version__
+
+MANIFEST_PATH = Path(".vibe") / "manifest.json"
+MANIFEST_VERSION = 1
+
+# Recorded with every entry; follows the package version
+TEMPLATE_VERSION = __version__
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """Hex sha256 of the UTF-8 encoded content."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """Hex sha256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """What Vibe last wrote to one file."""
+    sha256: str
+    template_version: str
+    size: int
+    mtime_ns: int
+
+
+class Manifest:
+    """
+    Path -> ManifestEntry map persisted at <project>/.vibe/manifest.json.
+    """
+
+    def __init__(self, project_root: Union[str, Path]):
+        self.project_root = Path(project_root)
+        self.path = self.project_root / MANIFEST_PATH
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Reads the manifest; a missing or corrupt file yields an empty manifest."""
+        self.entries = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                return
+            for rel_path, entry in data.get("files", {}).items():
+                self.entries[rel_path] = ManifestEntry(**entry)
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.entries = {}
+
+    def save(self) -> None:
+        """Writes the manifest atomically."""
+        from vibe.core.writer import WriteOp, write_files
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": {rel_path: asdict(entry) for rel_path, entry in sorted(self.entries.items())},
+        }
+        report = write_files([WriteOp(MANIFEST_PATH.as_posix(), self.path, json.dumps(data, indent=2))], fsync=False)
+        if report.failed:
+            raise OSError(report.failed[MANIFEST_PATH.as_posix()])
+
+    def get(self, rel_path: str) -> Optional[ManifestEntry]:
+        return self.entries.get(rel_path)
+
+    def record(self, rel_path: str, sha256: str, template_version: str = TEMPLATE_VERSION,
+               st: Optional[os.stat_result] = None) -> None:
+        """
+        Records content Vibe wrote (or found already in place).
+
+        Args:
+            rel_path: Path relative to the project root.
+            sha256: Hash of the content now on disk.
+            template_version: Version of the templates that produced it.
+            st: Stat of the file after the write (taken from disk if omitted).
+        """
+        if st is None:
+            st = os.stat(self.project_root / rel_path)
+        self.entries[rel_path] = ManifestEntry(sha256, template_version, st.st_size, st.st_mtime_ns)
+
+    def disk_hash(self, rel_path: str, st: os.stat_result) -> str:
+        """
+        Hash of the file on disk. If its size and mtime still match the entry,
+        the recorded hash is returned without reading the file.
+        """
+        entry = self.entries.get(rel_path)
+        if entry is not None and entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns:
+            return entry.sha256
+        return file_hash(self.project_root / rel_path)
+
+    def is_user_modified(self, rel_path: str, st: os.stat_result) -> bool:
+        """True if the file was not written by Vibe or was edited since."""
+        entry = self.entries.get(rel_path)
+        return entry is None or self.disk_hash(rel_path, st) != entry.sha256
@@ -1,34 +1,131 @@
 """
 Pipeline Orchestrator for Vibe-CLI.
 """
-from dataclasses import dataclass
-from typing import List, Optional, Callable, Any
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
 from vibe.agents.base import BaseAgent, AgentResult
+from vibe.cli.console import console
+from vibe.core.state import StateStore, hash_inputs
+
+# Stages run concurrently at most (LLM calls are additionally bounded by the client semaphore)
+DEFAULT_MAX_PARALLEL = 4
 
 
 @dataclass
 class PipelineStage:
-    """Represents a single stage in the pipeline."""
-    agent: BaseAgent
+    """
+    Represents a single stage in the pipeline.
+
+    A stage either runs an agent or a plain action. Stages declare the context
+    keys they read (inputs) and write (outputs); the pipeline runs a stage as
+    soon as every stage producing one of its inputs has finished. A stage with
+    inputs=None depends on the stage listed before it, which keeps plain lists
+    of stages sequential.
+    """
+    agent: Optional[BaseAgent] = None
     on_complete: Optional[Callable[[AgentResult], None]] = None
     interactive: bool = False
+    name: Optional[str] = None
+    inputs: Optional[List[str]] = None
+    outputs: Optional[List[str]] = None
+    # Non-agent work: called with a context snapshot, returns {output key: value} or None
+    action: Optional[Callable[[dict], Optional[Dict[str, Any]]]] = None
+
+    @property
+    def context_key(self) -> str:
+        """Key under which an agent stage stores its content (output filename without .md)."""
+        return self.agent.output_filename.replace(".md", "")
+
+    @property
+    def label(self) -> str:
+        if self.name:
+            return self.name
+        if self.agent is not None:
+            return self.context_key
+        return getattr(self.action, "__name__", "stage")
+
+    def declared_outputs(self) -> List[str]:
+        if self.outputs is not None:
+            return list(self.outputs)
+        if self.agent is None:
+            return []
+        keys = [self.context_key]
+        if self.agent.output_filename == "productContext.md":
+            keys.append("product_context")
+        elif self.agent.output_filename == "systemPatterns.md":
+            keys.append("system_patterns")
+        return keys
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock span of one stage, relative to the start of the run."""
+    name: str
+    start: float
+    end: float
+    depends_on: List[str] = field(default_factory=list)
+    skipped: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
 
 
 class Pipeline:
     """
     Four-role pipeline orchestrator.
-    Executes agents in sequence, passing context between stages.
+    Builds a dependency graph from the stages' inputs/outputs and runs ready
+    stages concurrently on a thread pool, passing context between stages.
+    Callbacks and interactive review always run on the calling thread.
     """
 
-    def __init__(self, stages: List[PipelineStage]):
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        state_store: Optional[StateStore] = None,
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+        report: bool = False,
+    ):
         """
         Initialize the pipeline with stages.
-        
+
         Args:
-            stages: List of PipelineStage objects defining the execution order.
+            stages: List of PipelineStage objects. List order only matters for
+                    stages without declared inputs.
+            state_store: Optional checkpoint store. Stages whose stored input hash
+                         matches the current prompt are reused instead of re-run.
+            max_parallel: Maximum number of stages running at the same time.
+            report: Print per-stage wall time and the critical path after each run.
         """
         self.stages = stages
+        self.state_store = state_store
+        self.max_parallel = max(1, max_parallel)
+        self.report = report
         self.results: List[AgentResult] = []
+        self.skipped: List[str] = []
+        self.timings: Dict[str, StageTiming] = {}
+
+    def _dependencies(self, initial_context: dict) -> List[List[int]]:
+        """Indices of the stages each stage waits for."""
+        deps: List[List[int]] = []
+        producers: Dict[str, int] = {}
+        for index, stage in enumerate(self.stages):
+            if stage.inputs is None:
+                stage_deps = [index - 1] if index > 0 else []
+            else:
+                stage_deps = []
+                for key in stage.inputs:
+                    if key in producers:
+                        if producers[key] not in stage_deps:
+                            stage_deps.append(producers[key])
+                    elif key not in initial_context:
+                        raise ValueError(f"Stage '{stage.label}' needs '{key}', which no earlier stage produces")
+            deps.append(stage_deps)
+            for key in stage.declared_outputs():
+                producers[key] = index
+        return deps
 
     def run(
         self,
@@ -37,56 +134,187 @@ class Pipeline:
     ) -> List[AgentResult]:
         """
         Execute the pipeline.
-        
+
         Args:
             initial_context: Starting context dictionary.
             interactive_callback: Optional callback for interactive stages.
                                   Called with AgentResult, should return updated content.
-        
+
         Returns:
-            List of AgentResult objects from all stages.
+            List of AgentResult objects from all agent stages, in stage order.
         """
         context = initial_context.copy()
-        self.results = []
-
-        for stage in self.stages:
-            result = stage.agent.execute(context)
-            self.results.append(result)
-
-            # Update context for next stage
-            # Use output filename (without .md) as key
-            context_key = stage.agent.output_filename.replace(".md", "")
-            context[context_key] = result.content
-            
-            # Also store with common names for compatibility
-            if stage.agent.output_filename == "productContext.md":
-                context["product_context"] = result.content
-            elif stage.agent.output_filename == "systemPatterns.md":
-                context["system_patterns"] = result.content
-
-            # Execute completion callback
-            if stage.on_complete:
-                stage.on_complete(result)
-
-            # Handle interactive mode
-            if stage.interactive and interactive_callback:
-                updated_content = interactive_callback(result)
-                result.content = updated_content
-                context[context_key] = updated_content
-                if stage.agent.output_filename == "productContext.md":
-                    context["product_context"] = updated_content
-                elif stage.agent.output_filename == "systemPatterns.md":
-                    context["system_patterns"] = updated_content
+        deps = self._dependencies(context)
+        labels = self._labels()
+        dependents: List[List[int]] = [[] for _ in self.stages]
+        for index, stage_deps in enumerate(deps):
+            for dep in stage_deps:
+                dependents[dep].append(index)
+
+        results: Dict[int, AgentResult] = {}
+        remaining = [len(stage_deps) for stage_deps in deps]
+        ready = [index for index, count in enumerate(remaining) if count == 0]
+        running: Dict[Future, int] = {}
+        started_at: Dict[int, float] = {}
+        self.skipped = []
+        self.timings = {}
+        run_start = time.monotonic()
+
+        def finish(index: int) -> None:
+            for dependent in dependents[index]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="vibe-stage") as pool:
+            try:
+                while ready or running:
+                    while ready and len(running) < self.max_parallel:
+                        index = ready.pop(0)
+                        stage = self.stages[index]
+                        started_at[index] = time.monotonic() - run_start
+                        running[pool.submit(self._execute, stage, dict(context))] = index
+
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = running.pop(future)
+                        stage = self.stages[index]
+                        outcome = future.result()
+                        if stage.agent is not None:
+                            result, input_hash, resumed = outcome
+                            self._timing(index, labels, deps, started_at[index], time.monotonic() - run_start,
+                                         skipped=resumed)
+                            if resumed:
+                                # Checkpointed results were already reviewed and saved when first produced
+                                self.skipped.append(stage.context_key)
+                                self._complete(stage, result, context, results, index, None)
+                            else:
+                                self._complete(stage, result, context, results, index, interactive_callback, input_hash)
+                            finish(index)
+                            continue
+                        self._timing(index, labels, deps, started_at[index], time.monotonic() - run_start)
+                        if outcome:
+                            context.update(outcome)
+                        finish(index)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
 
+        self.results = [results[index] for index in sorted(results)]
+        if self.report:
+            self.print_report()
         return self.results
 
+    def _execute(self, stage: PipelineStage, context: dict) -> Any:
+        """
+        Runs on a worker thread. Agent stages return (result, input hash, resumed):
+        the prompt is built once, hashed for the checkpoint lookup and, on a miss,
+        handed to the agent.
+        """
+        if stage.agent is not None:
+            if self.state_store is None:
+                return stage.agent.execute(context), None, False
+            prompt = stage.agent.build_prompt(context)
+            input_hash = hash_inputs(stage.agent.name, prompt)
+            cached = self.state_store.lookup(stage.context_key, input_hash)
+            if cached is not None:
+                return cached, input_hash, True
+            return stage.agent.execute(context, prompt=prompt), input_hash, False
+        if stage.action is not None:
+            return stage.action(context)
+        return None
+
+    def _complete(
+        self,
+        stage: PipelineStage,
+        result: AgentResult,
+        context: dict,
+        results: Dict[int, AgentResult],
+        index: int,
+        interactive_callback: Optional[Callable[[AgentResult], str]],
+        input_hash: Optional[str] = None,
+    ) -> None:
+        """Publishes an agent result to the context; runs on the calling thread."""
+        results[index] = result
+        self._update_context(context, stage, result.content)
+
+        # Execute completion callback
+        if stage.on_complete:
+            stage.on_complete(result)
+
+        # Handle interactive mode (checkpointed results were already reviewed when first produced)
+        if interactive_callback is not None and stage.interactive:
+            updated_content = interactive_callback(result)
+            result.content = updated_content
+            self._update_context(context, stage, updated_content)
+
+        if input_hash is not None:
+            self.state_store.save(stage.context_key, input_hash, result)
+
+    def _labels(self) -> List[str]:
+        """Stage labels, made unique with a #n suffix where needed."""
+        labels: List[str] = []
+        for index, stage in enumerate(self.stages):
+            label = stage.label
+            labels.append(label if label not in labels else f"{label}#{index}")
+        return labels
+
+    def _timing(self, index: int, labels: List[str], deps: List[List[int]], start: float, end: float,
+                skipped: bool = False) -> None:
+        self.timings[labels[index]] = StageTiming(
+            name=labels[index],
+            start=start,
+            end=end,
+            depends_on=[labels[dep] for dep in deps[index]],
+            skipped=skipped,
+        )
+
+    @staticmethod
+    def _update_context(context: dict, stage: PipelineStage, content: str) -> None:
+        # Use output filename (without .md) as key
+        context[stage.context_key] = content
+
+        # Also store with common names for compatibility
+        if stage.agent.output_filename == "productContext.md":
+            context["product_context"] = content
+        elif stage.agent.output_filename == "systemPatterns.md":
+            context["system_patterns"] = content
+
+    def critical_path(self) -> List[str]:
+        """
+        Stages on the longest dependency chain of the last run, first to last.
+        Each step follows the dependency that finished latest.
+        """
+        if not self.timings:
+            return []
+        current = max(self.timings.values(), key=lambda t: t.end)
+        path = [current.name]
+        while current.depends_on:
+            current = max((self.timings[name] for name in current.depends_on), key=lambda t: t.end)
+            path.append(current.name)
+        return list(reversed(path))
+
+    def print_report(self) -> None:
+        """Prints per-stage wall time and the critical path of the last run."""
+        if not self.timings:
+            return
+        total = max(t.end for t in self.timings.values())
+        console.print(f"[dim]⏱️  Pipeline finished in {total:.2f}s (max parallel: {self.max_parallel})[/dim]")
+        for timing in sorted(self.timings.values(), key=lambda t: t.start):
+            note = " (resumed)" if timing.skipped else ""
+            console.print(f"[dim]   {timing.name:<24} {timing.start:>7.2f}s → {timing.end:>7.2f}s  {timing.duration:>6.2f}s{note}[/dim]")
+        console.print(f"[dim]   Critical path: {' → '.join(self.critical_path())}[/dim]")
+
     def get_result(self, filename: str) -> Optional[AgentResult]:
         """
         Get a specific result by output filename.
-        
+
         Args:
             filename: The output filename to look for.
-        
+
         Returns:
             The AgentResult if found, None otherwise.
         """
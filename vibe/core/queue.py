@@ -0,0 +1,296 @@
+"""
+Persistent job queue for batch runs.
+
+Jobs live in a local SQLite database so a batch survives crashes: a worker
+leases a job while it runs it, and a job whose lease expired (or whose
+worker process died) goes back to pending until its attempts run out.
+Each worker opens its own connection, so workers can be separate processes.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from vibe.config.paths import CACHE_DIR
+
+DEFAULT_QUEUE_PATH = CACHE_DIR / "queue.db"
+
+# Seconds a claimed job stays leased without a heartbeat
+DEFAULT_LEASE_SECONDS = 600.0
+
+JOB_STATES = ("pending", "running", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+
+def worker_identity() -> str:
+    """Lease owner name of the current process (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """False only if the owner is a process on this host that no longer exists."""
+    if not owner:
+        return False
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True  # Cannot check other hosts; rely on the lease
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@dataclass
+class Job:
+    """A row of the jobs table."""
+    id: int
+    kind: str
+    target: str
+    payload: Dict[str, Any]
+    state: str
+    attempts: int
+    max_attempts: int
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        data = dict(row)
+        data["payload"] = json.loads(data["payload"])
+        return cls(**data)
+
+
+@dataclass
+class QueueStats:
+    """Backlog and throughput figures for `vibe queue status`."""
+    counts: Dict[str, int]
+    done_in_window: int
+    per_minute: float
+    avg_duration_s: Optional[float]
+    oldest_pending_s: Optional[float]
+
+    @property
+    def backlog(self) -> int:
+        return self.counts.get("pending", 0) + self.counts.get("running", 0)
+
+    @property
+    def eta_s(self) -> Optional[float]:
+        if not self.backlog or not self.per_minute:
+            return None
+        return self.backlog / self.per_minute * 60
+
+
+class JobQueue:
+    """SQLite-backed queue of create/plan jobs with leases and attempt counts."""
+
+    def __init__(self, path: Path = DEFAULT_QUEUE_PATH, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Args:
+            path: Database file (created on first use).
+            lease_seconds: How long a claimed job may run without a heartbeat.
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers never claim the same job
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, kind: str, target: str, payload: Dict[str, Any], max_attempts: int = 3) -> Optional[int]:
+        """
+        Adds a job unless the same kind/target is already pending or running.
+
+        Args:
+            kind: "create" or "plan".
+            target: Project path the job works on.
+            payload: Job parameters (JSON-serialisable).
+            max_attempts: Attempts before the job is marked failed.
+
+        Returns:
+            The new job id, or None if an equivalent job is already queued.
+        """
+        with self._transaction() as conn:
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE kind = ? AND target = ? AND state IN ('pending', 'running')",
+                (kind, target),
+            ).fetchone()
+            if existing is not None:
+                return None
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, target, payload, max_attempts, created_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, target, json.dumps(payload, ensure_ascii=False), max(1, max_attempts), time.time()),
+            )
+            return cursor.lastrowid
+
+    def _release_stale(self, conn: sqlite3.Connection, now: float) -> None:
+        """Returns jobs with expired leases or dead workers to pending (or failed when out of attempts)."""
+        for row in conn.execute("SELECT id, attempts, max_attempts, lease_owner, lease_expires FROM jobs WHERE state = 'running'").fetchall():
+            expired = row["lease_expires"] is not None and row["lease_expires"] < now
+            if not expired and _owner_alive(row["lease_owner"]):
+                continue
+            reason = "lease expired" if expired else f"worker {row['lease_owner']} died"
+            if row["attempts"] >= row["max_attempts"]:
+                conn.execute(
+                    "UPDATE jobs SET state = 'failed', lease_owner = NULL, lease_expires = NULL, finished_at = ?, error = ? WHERE id = ?",
+                    (now, reason, row["id"]),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET state = 'pending', lease_owner = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                    (reason, row["id"]),
+                )
+
+    def claim(self, owner: Optional[str] = None) -> Optional[Job]:
+        """
+        Leases the oldest pending job.
+
+        Args:
+            owner: Lease owner (defaults to this process).
+
+        Returns:
+            The claimed job, or None if nothing is pending.
+        """
+        owner = owner or worker_identity()
+        now = time.time()
+        with self._transaction() as conn:
+            self._release_stale(conn, now)
+            row = conn.execute("SELECT * FROM jobs WHERE state = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                "started_at = ? WHERE id = ?",
+                (owner, now + self.lease_seconds, now, row["id"]),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return Job.from_row(row)
+
+    def heartbeat(self, job_id: int, owner: Optional[str] = None) -> bool:
+        """Extends a lease; False if the job is no longer leased by owner."""
+        owner = owner or worker_identity()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = 'running' AND lease_owner = ?",
+                (time.time() + self.lease_seconds, job_id, owner),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, owner: Optional[str] = None) -> None:
+        """Marks a leased job done."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'done', lease_owner = NULL, lease_expires = NULL, finished_at = ?, error = NULL "
+                "WHERE id = ? AND lease_owner = ?",
+                (time.time(), job_id, owner or worker_identity()),
+            )
+
+    def fail(self, job_id: int, error: str, owner: Optional[str] = None) -> str:
+        """
+        Records a failed attempt; the job is retried while attempts remain.
+
+        Returns:
+            The job's new state ("pending" or "failed").
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            state = "failed" if row is None or row["attempts"] >= row["max_attempts"] else "pending"
+            conn.execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, finished_at = ?, error = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (state, time.time() if state == "failed" else None, error, job_id, owner or worker_identity()),
+            )
+        return state
+
+    def retry_failed(self) -> int:
+        """Moves failed jobs back to pending with a fresh attempt budget."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, error = NULL, finished_at = NULL WHERE state = 'failed'"
+            ).rowcount
+
+    def jobs(self, state: Optional[str] = None) -> List[Job]:
+        with self._connect() as conn:
+            if state is None:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id", (state,)).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update({row["state"]: row["n"] for row in rows})
+        return counts
+
+    def stats(self, window_s: float = 3600.0) -> QueueStats:
+        """Counts per state plus throughput over the last window."""
+        now = time.time()
+        with self._connect() as conn:
+            recent = conn.execute(
+                "SELECT COUNT(*) AS n, AVG(finished_at - started_at) AS avg_s, MIN(started_at) AS first_start "
+                "FROM jobs WHERE state = 'done' AND finished_at >= ?",
+                (now - window_s,),
+            ).fetchone()
+            oldest = conn.execute("SELECT MIN(created_at) AS t FROM jobs WHERE state = 'pending'").fetchone()
+        done = recent["n"] or 0
+        # Rate over the time actually spent working within the window
+        span_s = max(now - max(recent["first_start"] or now, now - window_s), 1.0)
+        return QueueStats(
+            counts=self.counts(),
+            done_in_window=done,
+            per_minute=done / span_s * 60 if done else 0.0,
+            avg_duration_s=recent["avg_s"],
+            oldest_pending_s=now - oldest["t"] if oldest["t"] is not None else None,
+        )
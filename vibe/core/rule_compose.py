@@ -0,0 +1,163 @@
+"""
+Composition of several stack rules into one 02_stack.md.
+
+A React + FastAPI + Postgres project gets all three rule sets. Sections
+with the same heading ("Code Style", "Testing", ...) are merged, with one
+sub-heading per stack, bullets already stated by an earlier stack are
+dropped, and stacks that would push the rule past the token budget are
+left out (best-scoring stacks are kept first).
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bound for the composed 02_stack.md, in estimated tokens
+DEFAULT_STACK_TOKEN_BUDGET = 1500
+
+_FRONTMATTER_RE = re.compile(r"\A---\n(.*?)\n---\n", re.DOTALL)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count: ~4 characters per token for ASCII, one per other character (e.g. CJK).
+    """
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+@dataclass
+class StackRule:
+    """A parsed 02_stack_*.md template."""
+    name: str
+    label: str
+    globs: List[str] = field(default_factory=list)
+    # Lines between the title and the first section
+    preamble: List[str] = field(default_factory=list)
+    sections: List[Tuple[str, List[str]]] = field(default_factory=list)
+
+
+@dataclass
+class Composition:
+    """The composed rule and what went into it."""
+    content: str
+    included: List[str]
+    dropped: List[str]
+    tokens: int
+
+
+def parse_stack_rule(name: str, text: str) -> StackRule:
+    """
+    Splits a stack rule into frontmatter, title and `##` sections.
+
+    Args:
+        name: Template filename (e.g. "02_stack_react_vite.md").
+        text: Template content.
+    """
+    rule = StackRule(name=name, label=name)
+    match = _FRONTMATTER_RE.match(text)
+    if match:
+        for line in match.group(1).splitlines():
+            key, _, value = line.partition(":")
+            if key.strip() == "globs":
+                rule.globs = [glob.strip() for glob in value.split(",") if glob.strip()]
+        text = text[match.end():]
+
+    current: List[str] = rule.preamble
+    for line in text.splitlines():
+        if line.startswith("# "):
+            title = line[2:].strip()
+            title = re.sub(r"^Rule 02:\s*", "", title)
+            rule.label = re.sub(r"\s*Best Practices$", "", title) or name
+        elif line.startswith("## "):
+            current = []
+            rule.sections.append((line[3:].strip(), current))
+        else:
+            current.append(line)
+    return rule
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.lower().split())
+
+
+def _render(rules: List[StackRule]) -> str:
+    globs: List[str] = []
+    for rule in rules:
+        globs.extend(glob for glob in rule.globs if glob not in globs)
+    labels = [rule.label for rule in rules]
+
+    out = [
+        "---",
+        f"description: {' + '.join(labels)} Best Practices",
+        f"globs: {', '.join(globs)}" if globs else "globs: *",
+        "---",
+        "",
+        "# Rule 02: Tech Stack Best Practices",
+        "",
+        f"This project combines: {', '.join(labels)}.",
+    ]
+
+    # Section order: first appearance, following the stack order
+    headings: List[str] = []
+    for rule in rules:
+        headings.extend(heading for heading, _ in rule.sections if heading not in headings)
+
+    seen = set()
+    for heading in headings:
+        blocks: List[str] = []
+        for rule in rules:
+            for section_heading, lines in rule.sections:
+                if section_heading != heading:
+                    continue
+                kept = []
+                for line in lines:
+                    # Only bullets are deduplicated; other lines (code fences, prose) stay intact
+                    if line.lstrip().startswith(("- ", "* ")):
+                        key = _normalize(line)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    kept.append(line)
+                body = "\n".join(kept).strip("\n")
+                if body:
+                    blocks.append(f"### {rule.label}\n{body}")
+        if blocks:
+            out.extend(["", f"## {heading}", ""])
+            out.append("\n\n".join(blocks))
+    return "\n".join(out) + "\n"
+
+
+def compose_stack_rules(templates: Sequence[Tuple[str, str]], budget: int = DEFAULT_STACK_TOKEN_BUDGET) -> Composition:
+    """
+    Composes stack rules, best first, within a token budget.
+
+    Args:
+        templates: (filename, content) pairs in preference order. The first one is
+                   always included, even if it alone exceeds the budget.
+        budget: Maximum estimated tokens of the composed rule.
+
+    Returns:
+        The Composition. A single included rule is returned verbatim.
+    """
+    if not templates:
+        return Composition("", [], [], 0)
+
+    parsed = {name: parse_stack_rule(name, text) for name, text in templates}
+    included = [templates[0][0]]
+    dropped: List[str] = []
+    content = templates[0][1]
+    for name, _ in templates[1:]:
+        candidate = _render([parsed[n] for n in included + [name]])
+        if estimate_tokens(candidate) <= budget:
+            included.append(name)
+            content = candidate
+        else:
+            dropped.append(name)
+    return Composition(content, included, dropped, estimate_tokens(content))
+
+
+def bundle_token_report(rules: Dict[str, str]) -> Dict[str, int]:
+    """Estimated tokens per rule of a bundle, plus the "total"."""
+    report = {name: estimate_tokens(content) for name, content in sorted(rules.items())}
+    report["total"] = sum(report.values())
+    return report
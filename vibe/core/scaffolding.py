@@ -1,33 +1,56 @@
 import json
-import shutil
 import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
 
 from vibe.core.adapter_interface import RuleBundle, WritePlan
 from rich.console import Console
 from vibe.config.paths import RULES_DIR, TEMPLATES_DIR
 from vibe.utils.files import read_template
+from vibe.templates.store import TEMPLATE_STORE
+from vibe.core.skill_renderer import skill_context
+from vibe.core.skills import ALL_CAPABILITIES, list_skills, select_skills
+from vibe.core.stack_detect import STACK_DETECTOR
+from vibe.core.rule_compose import DEFAULT_STACK_TOKEN_BUDGET, compose_stack_rules
+from vibe.core.writer import DEFAULT_WRITE_WORKERS, WriteOp, WriteReport, stat_all, write_files
+from vibe.core.backup import BackupRun, BackupStore
+from vibe.core.manifest import MANIFEST_PATH, TEMPLATE_VERSION, Manifest, content_hash
 
 console = Console()
 
-def build_rule_bundle(context: Dict[str, Any]) -> RuleBundle:
+def select_stack_rule(system_patterns: str) -> str:
     """
-    Builds the agnostic rule bundle from the project context.
-    This generates the standard rules that will be projected to IDEs.
+    Picks the 02 stack rule template for an architecture description.
+
+    Args:
+        system_patterns: The content of systemPatterns.md.
+
+    Returns:
+        The filename of the best-scoring stack rule template (FastAPI if none matched).
+    """
+    return STACK_DETECTOR.primary(system_patterns)
+
+def select_stack_rules(system_patterns: str) -> List[str]:
+    """
+    Picks every 02 stack rule template that applies, best first.
+
+    Args:
+        system_patterns: The content of systemPatterns.md.
+
+    Returns:
+        Stack rule filenames; at least one (FastAPI if none matched).
+    """
+    return STACK_DETECTOR.select(system_patterns)
+
+def load_static_assets() -> RuleBundle:
+    """
+    Loads the part of the rule bundle that does not depend on the project
+    context: fixed rules, scripts and skills. Only reads files (skills are
+    only listed), so it can run in the background while the LLM stages are
+    in flight.
     """
     bundle = RuleBundle()
-    
-    # 1. 00_project_context.md (Pointer)
-    bundle.rules["00_project_context.md"] = (
-        "<!-- This file is auto-generated by Vibe. DO NOT EDIT. -->\n"
-        "<!-- It serves as a pointer for the AI agent to finding the source of truth. -->\n\n"
-        "Please refer to the following files for project context:\n\n"
-        "- **Product Context**: `.context/productContext.md` (Requirements & Goals)\n"
-        "- **System Patterns**: `.context/systemPatterns.md` (Architecture & Tech Stack)\n"
-        "- **Active Status**: `.context/activeContext.md` (Current Task & Progress)\n"
-    )
-    
+
     # Load Standard Templates
     try:
         # Fixed Rules
@@ -41,72 +64,83 @@ def build_rule_bundle(context: Dict[str, Any]) -> RuleBundle:
         # 03 Output
         bundle.rules["03_output_format.md"] = read_template("03_output_format.md", RULES_DIR)
 
-        # 02 Stack (Heuristic Selection)
-        system_patterns = context.get("system_patterns", "").lower()
-        rule_02_template_name = "02_stack_python_fastapi.md"  # Default
-        
-        if "django" in system_patterns:
-            rule_02_template_name = "02_stack_python_django.md"
-        elif "node" in system_patterns or "express" in system_patterns:
-            rule_02_template_name = "02_stack_nodejs_express.md"
-        elif "react" in system_patterns or "vite" in system_patterns:
-            rule_02_template_name = "02_stack_react_vite.md"
-        elif "go" in system_patterns or "gin" in system_patterns:
-            rule_02_template_name = "02_stack_go_gin.md"
-        elif "telegram" in system_patterns or "bot" in system_patterns:
-            rule_02_template_name = "02_stack_telegram_bot.md"
-        elif "postgres" in system_patterns:
-            rule_02_template_name = "02_stack_postgresql.md"
-            
-        try:
-            content = read_template(rule_02_template_name, RULES_DIR)
-        except SystemExit:
-            # Fallback
-            content = read_template("02_stack_python_fastapi.md", RULES_DIR)
-            
-        # We normalize the key to 02_stack.md for consistency across adapters
-        bundle.rules["02_stack.md"] = content
-        
-        # Load Scripts
+        # Load Scripts (copied verbatim: only their paths are kept)
         from vibe.config.paths import SCRIPTS_DIR
-        if SCRIPTS_DIR.exists():
-            for script_file in SCRIPTS_DIR.glob("*.py"):
-                try:
-                    bundle.scripts[script_file.name] = script_file.read_text(encoding="utf-8")
-                except Exception as ex:
-                    console.print(f"[yellow]Failed to load script {script_file.name}: {ex}[/yellow]")
+        bundle.scripts.update(
+            (name, path) for name, path in TEMPLATE_STORE.listing(SCRIPTS_DIR).items()
+            if "/" not in name and name.endswith(".py")
+        )
 
         # 4. Load Project Skills (Dynamic)
-        SKILLS_DIR = TEMPLATES_DIR / "skills"
-        if SKILLS_DIR.exists():
-            for skill_dir in SKILLS_DIR.iterdir():
-                if skill_dir.is_dir():
-                    skill_name = skill_dir.name
-                    skill_files = {}
-                    
-                    # Walk the skill directory
-                    for file_path in skill_dir.rglob("*"):
-                        if file_path.is_file():
-                            try:
-                                # Rel path inside skill dir (e.g. "scripts/analyze.py")
-                                rel_path = file_path.relative_to(skill_dir)
-                                # Handle .j2 extension (strip it for the target filename)
-                                target_name = str(rel_path)
-                                if target_name.endswith(".j2"):
-                                    target_name = target_name[:-3]
-                                
-                                # Read content (simple read for now, no complex Jinja context yet)
-                                content = file_path.read_text(encoding="utf-8")
-                                skill_files[target_name] = content
-                            except Exception as ex:
-                                console.print(f"[yellow]Failed to load skill file {file_path}: {ex}[/yellow]")
-                    
-                    if skill_files:
-                        bundle.skills[skill_name] = skill_files
+        # One listing of skills/; nothing is read here. build_rule_bundle selects
+        # the skills to emit and binds them to the project context.
+        bundle.skills.update(list_skills(TEMPLATES_DIR / "skills"))
 
-        
     except Exception as e:
         console.print(f"[bold red]Error building rule bundle:[/bold red] {e}")
+
+    return bundle
+
+def build_rule_bundle(
+    context: Dict[str, Any],
+    static_assets: Optional[RuleBundle] = None,
+    token_budget: int = DEFAULT_STACK_TOKEN_BUDGET,
+    skill_capabilities: FrozenSet[str] = ALL_CAPABILITIES,
+) -> RuleBundle:
+    """
+    Builds the agnostic rule bundle from the project context.
+    This generates the standard rules that will be projected to IDEs.
+
+    Args:
+        context: Project context (product_context, system_patterns, project_name).
+        static_assets: Result of load_static_assets(), if it was preloaded.
+        token_budget: Maximum estimated tokens of the composed 02_stack.md.
+        skill_capabilities: What the target adapter supports (BaseAdapter.skill_capabilities);
+                            skills needing more are left out.
+    """
+    if static_assets is None:
+        static_assets = load_static_assets()
+
+    bundle = RuleBundle()
+    
+    # 1. 00_project_context.md (Pointer)
+    bundle.rules["00_project_context.md"] = (
+        "<!-- This file is auto-generated by Vibe. DO NOT EDIT. -->\n"
+        "<!-- It serves as a pointer for the AI agent to finding the source of truth. -->\n\n"
+        "Please refer to the following files for project context:\n\n"
+        "- **Product Context**: `.context/productContext.md` (Requirements & Goals)\n"
+        "- **System Patterns**: `.context/systemPatterns.md` (Architecture & Tech Stack)\n"
+        "- **Active Status**: `.context/activeContext.md` (Current Task & Progress)\n"
+    )
+    bundle.rules.update(static_assets.rules)
+    bundle.scripts.update(static_assets.scripts)
+
+    # 02 Stack (Heuristic Selection): every detected stack, best first
+    stack_rules = select_stack_rules(context.get("system_patterns", ""))
+
+    try:
+        templates = []
+        for rule_name in stack_rules:
+            try:
+                templates.append((rule_name, read_template(rule_name, RULES_DIR)))
+            except SystemExit:
+                continue
+        if not templates:
+            # Fallback
+            templates.append(("02_stack_python_fastapi.md", read_template("02_stack_python_fastapi.md", RULES_DIR)))
+
+        composition = compose_stack_rules(templates, budget=token_budget)
+        # We normalize the key to 02_stack.md for consistency across adapters
+        bundle.rules["02_stack.md"] = composition.content
+        bundle.stacks = composition.included
+        bundle.dropped_stacks = composition.dropped
+    except Exception as e:
+        console.print(f"[bold red]Error building rule bundle:[/bold red] {e}")
+
+    # Skills: only those the stacks and the adapter can use, rendered lazily with the project context
+    selected, bundle.skipped_skills = select_skills(static_assets.skills, bundle.stacks or stack_rules, skill_capabilities)
+    skill_values = skill_context(context.get("project_name", ""), stack_rules[0])
+    bundle.skills.update((name, handle.bind(skill_values)) for name, handle in selected.items())
     
     return bundle
 
@@ -156,22 +190,93 @@ def _merge_json_smart(existing_content: str, new_content: str, filename: str) ->
         console.print(f"[yellow]⚠️  JSON Merge failed for {filename}: {e}[/yellow]")
         return existing_content
 
-def apply_write_plan(plan: WritePlan, project_root: Path, mode: str = "safe", dry_run: bool = False):
+def apply_write_plan(
+    plan: WritePlan,
+    project_root: Path,
+    mode: str = "safe",
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_WRITE_WORKERS,
+    fsync: Optional[bool] = None,
+    template_version: str = TEMPLATE_VERSION,
+) -> Optional[WriteReport]:
     """
     Executes the write plan with the specified safety mode.
+
+    Decisions (skip, merge, append, backup) are made first, in plan order;
+    the resulting files are then written concurrently and atomically.
+    Files whose content is already on disk are not rewritten, and
+    .vibe/manifest.json tells files Vibe wrote apart from files the user
+    edited since (conflicts): the former are updated in any mode, the latter
+    are only overwritten (after a backup) with mode="force".
+
+    Args:
+        plan: Files to write (and to copy from a source), relative to project_root.
+        project_root: Root of the generated project.
+        mode: "safe" keeps user-modified files (except JSON merges and .gitignore), "force" backs them up and overwrites.
+        dry_run: Only print what would happen.
+        max_workers: Concurrent file writes.
+        fsync: Flush files to disk before returning (defaults to VIBE_FSYNC).
+        template_version: Recorded in the manifest for every written file.
+
+    Returns:
+        The WriteReport (written / unchanged / conflicted), or None for a dry run.
     """
     if dry_run:
         console.print("[bold yellow]DRY RUN: No changes will be written to disk.[/bold yellow]")
     
-    backup_dir = project_root / ".vibe" / "backup" / str(int(time.time()))
-    files_backed_up = False
+    start = time.perf_counter()
+    backup_run: Optional[BackupRun] = None
+    manifest = Manifest(project_root)
+    recorded = dict(manifest.entries)
+    ops: List[WriteOp] = []
+    unchanged: List[str] = []
+    conflicted: List[str] = []
+    failed: Dict[str, str] = {}
+    hashes: Dict[str, str] = {}
     
-    for rel_path, content in plan.files.items():
-        full_path = project_root / rel_path
+    # Text entries, then verbatim copies (source paths)
+    entries: List[Tuple[str, Union[str, Path]]] = list(plan.files.items()) + list(plan.copies.items())
+    # One concurrent round of stat calls instead of one exists() per file
+    paths = [project_root / rel_path for rel_path, _ in entries]
+    stats = stat_all(paths, max_workers=max_workers)
+    
+    for (rel_path, content), full_path, st in zip(entries, paths, stats):
         status_msg = f"[green]Would create:[/green] {rel_path}"
+        is_json_merge = rel_path.endswith(".json") and (rel_path.endswith("settings.json") or rel_path.endswith("mcp.json"))
+        is_git_append = (rel_path == ".gitignore")
+        user_modified = False
+        if isinstance(content, Path) and (is_json_merge or is_git_append):
+            content = content.read_text(encoding="utf-8")  # Merging needs the text
+        source = content if isinstance(content, Path) else None
+
+        # Hash of the planned content; copies are hashed from the source (precomputed in the template pack)
+        new_hash = None
+        if not is_json_merge and not is_git_append:
+            try:
+                new_hash = TEMPLATE_STORE.file_digest(source) if source is not None else content_hash(content)
+            except OSError as e:
+                console.print(f"[bold red]Failed to write {rel_path}: {e}[/bold red]")
+                failed[rel_path] = str(e)
+                continue
         
         # --- Pre-Execution Verification ---
-        if full_path.exists():
+        if st is not None and new_hash is not None:
+            # Compare hashes; the manifest avoids reading files Vibe wrote and nobody touched
+            disk_hash = manifest.disk_hash(rel_path, st)
+            if disk_hash == new_hash:
+                unchanged.append(rel_path)
+                entry = manifest.get(rel_path)
+                if entry is None or entry.sha256 != new_hash:
+                    manifest.record(rel_path, new_hash, template_version, st)
+                if dry_run:
+                    console.print(f"[dim]Unchanged: {rel_path}[/dim]")
+                continue
+            entry = manifest.get(rel_path)
+            user_modified = entry is None or disk_hash != entry.sha256
+            if user_modified:
+                conflicted.append(rel_path)
+
+        if st is not None:
             status_msg = f"[yellow]Would overwrite/merge:[/yellow] {rel_path}"
             
             # For Dry Run, we just print status
@@ -180,60 +285,91 @@ def apply_write_plan(plan: WritePlan, project_root: Path, mode: str = "safe", dr
                 continue
 
             # Real Execution checks
-            is_json_merge = rel_path.endswith(".json") and (rel_path.endswith("settings.json") or rel_path.endswith("mcp.json"))
-            is_git_append = (rel_path == ".gitignore")
-            
-            # If not a mergeable/appendable file, and mode is safe -> Skip
-            if mode == "safe" and not is_json_merge and not is_git_append:
-                console.print(f"[yellow]⚠️  Skipping existing file:[/yellow] {rel_path} (Use --force to overwrite)")
+            # If the user changed the file (and it is not mergeable/appendable), and mode is safe -> Skip
+            if mode == "safe" and user_modified:
+                console.print(f"[yellow]⚠️  Skipping modified file:[/yellow] {rel_path} (Use --force to overwrite)")
                 continue
 
         elif dry_run:
             console.print(status_msg)
             continue
 
-        # --- Execution ---
+        # --- Decide final content ---
         final_content = content
         should_write = True
         
-        if full_path.exists():
-            # Use sig to handle potential BOM from Windows editors
-            original_text = full_path.read_text(encoding="utf-8-sig")
+        if st is not None:
+            if is_json_merge or is_git_append:
+                # Use sig to handle potential BOM from Windows editors
+                original_text = full_path.read_text(encoding="utf-8-sig")
             
-            if rel_path.endswith("settings.json") or rel_path.endswith("mcp.json"):
+            if is_json_merge:
                 console.print(f"[dim]Merging {rel_path}...[/dim]")
                 final_content = _merge_json_smart(original_text, content, rel_path)
                 # Note: merge is always applied even in safe mode
+                if final_content == original_text:
+                    should_write = False
                 
-            elif rel_path == ".gitignore":
+            elif is_git_append:
                 if content.strip() not in original_text:
                     final_content = original_text + "\n" + content
                     console.print(f"[dim]Appending to .gitignore...[/dim]")
                 else:
                     should_write = False # Already there
                     
-            elif mode == "force":
-                 # Backup existing file before overwrite
-                if not files_backed_up:
-                    backup_dir.mkdir(parents=True, exist_ok=True)
-                    files_backed_up = True
-                
-                backup_path = backup_dir / rel_path
-                backup_path.parent.mkdir(parents=True, exist_ok=True)
+            elif user_modified:
+                 # Backup the user's version before overwrite (force mode)
+                if backup_run is None:
+                    backup_run = BackupStore(project_root).new_run()
                 try:
-                    shutil.copy2(full_path, backup_path)
+                    # The file is replaced by a rename below, so its inode can be linked into the store
+                    backup_run.add(rel_path, full_path, sha256=disk_hash, link=True)
                     console.print(f"[blue]📦 Backed up {rel_path}[/blue]")
                 except Exception as e:
                     console.print(f"[bold red]Failed to backup {rel_path}: {e}[/bold red]")
                     continue
         
         if should_write:
-            try:
-                full_path.parent.mkdir(parents=True, exist_ok=True)
-                # Ensure directory exists for new files
-                full_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(full_path, "w", encoding="utf-8") as f:
-                    f.write(final_content)
-                console.print(f"[green]✅ Created/Updated:[/green] {rel_path}")
-            except Exception as e:
-                console.print(f"[bold red]Failed to write {rel_path}: {e}[/bold red]")
+            hashes[rel_path] = new_hash if new_hash is not None else content_hash(final_content)
+            mode_bits = st.st_mode & 0o7777 if st else None
+            if source is not None:
+                ops.append(WriteOp(rel_path, full_path, mode=mode_bits, source=source))
+            else:
+                ops.append(WriteOp(rel_path, full_path, final_content, mode_bits))
+        else:
+            unchanged.append(rel_path)
+
+    if dry_run:
+        return None
+
+    # --- Execution: directories once, then parallel atomic writes ---
+    prepare_s = time.perf_counter() - start
+    report = write_files(ops, max_workers=max_workers, fsync=fsync)
+    report.failed.update(failed)
+    report.unchanged = unchanged
+    report.conflicted = conflicted
+    for op in ops:
+        if op.rel_path in report.failed:
+            console.print(f"[bold red]Failed to write {op.rel_path}: {report.failed[op.rel_path]}[/bold red]")
+        else:
+            manifest.record(op.rel_path, hashes[op.rel_path], template_version, report.stats[op.rel_path])
+            console.print(f"[green]✅ Created/Updated:[/green] {op.rel_path}")
+
+    if backup_run is not None:
+        backup_run.release(report.failed)
+        try:
+            if backup_run.commit():
+                console.print(f"[blue]📦 Backup run {backup_run.run_id} (restore: vibe backup restore {backup_run.run_id})[/blue]")
+        except OSError as e:
+            console.print(f"[bold red]Failed to record backup run: {e}[/bold red]")
+
+    if manifest.entries != recorded:
+        try:
+            manifest.save()
+        except OSError as e:
+            console.print(f"[yellow]⚠️  Could not update {MANIFEST_PATH.as_posix()}: {e}[/yellow]")
+
+    report.timings = {"prepare": prepare_s, **report.timings, "total": time.perf_counter() - start}
+    if entries:
+        console.print(f"[dim]💾 {report.summary()}[/dim]")
+    return report
@@ -0,0 +1,130 @@
+"""
+Rendering of project skills (vibe/templates/skills/**/*.j2).
+
+Skill templates are rendered with the project context (project name, stack)
+through the compiled placeholder renderer, so each template is parsed once
+per process. Rendered output is cached by (template hash, context hash):
+a batch that creates many projects with the same context renders each skill
+once, and projects that differ only in name re-use the parsed template.
+`{{SKILLS_DIR}}` is left in place for the IDE adapters, which know where
+skills are installed; it is the one slot a skill may leave unfilled, any
+other is reported on the console. Only .j2 files are templates; every other skill file
+(references, binaries) is copied byte-for-byte from its source path.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+from vibe.core.state import hash_inputs
+from vibe.templates.render import render_checked
+
+TEMPLATE_SUFFIX = ".j2"
+
+# Template text, or the source path of a file copied verbatim
+SkillFile = Union[str, Path]
+
+# Filled by the IDE adapters, not by the skill context
+PASSTHROUGH_SLOTS = frozenset({"SKILLS_DIR"})
+
+
+@lru_cache(maxsize=256)
+def _template_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def stack_id(stack_rule: str) -> str:
+    """Short stack name of a stack rule ("02_stack_python_fastapi.md" -> "python_fastapi"), or ""."""
+    return stack_rule[len("02_stack_"):-len(".md")] if stack_rule.startswith("02_stack_") else ""
+
+
+def skill_context(project_name: str = "", stack_rule: str = "") -> Dict[str, str]:
+    """
+    Values available to skill templates.
+
+    Args:
+        project_name: Name of the generated project.
+        stack_rule: Selected stack rule template (e.g. "02_stack_python_fastapi.md").
+
+    Returns:
+        Placeholder values; empty inputs are left out so their slots stay as they are.
+    """
+    values = {"project_name": project_name, "stack": stack_id(stack_rule)}
+    return {key: value for key, value in values.items() if value}
+
+
+class SkillRenderer:
+    """
+    Renders skill templates, caching output by (template hash, context hash).
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Rendered outputs kept (least recently used are dropped).
+        """
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text: str, context: Dict[str, str], context_hash: str = "", source: str = "skill template") -> str:
+        """
+        Renders one template.
+
+        Args:
+            text: Template source.
+            context: Placeholder values.
+            context_hash: hash_inputs(context), if the caller already computed it.
+            source: Template name used in the unfilled-placeholder warning.
+        """
+        key = (_template_hash(text), context_hash or hash_inputs(context))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        rendered = render_checked(text, source, context, passthrough=PASSTHROUGH_SLOTS)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = rendered
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def render_skills(self, skills: Dict[str, Dict[str, SkillFile]], context: Dict[str, str]) -> Dict[str, Dict[str, SkillFile]]:
+        """
+        Renders the .j2 files of a skills mapping and strips their suffix.
+
+        Args:
+            skills: Skill name -> {relative path: template text or source path}, as loaded from the templates.
+            context: Placeholder values (see skill_context).
+
+        Returns:
+            A new mapping; files without the .j2 suffix are passed through verbatim.
+        """
+        context_hash = hash_inputs(context)
+        rendered: Dict[str, Dict[str, SkillFile]] = {}
+        for skill_name, files in skills.items():
+            out: Dict[str, SkillFile] = {}
+            for rel_path, content in files.items():
+                if rel_path.endswith(TEMPLATE_SUFFIX) and isinstance(content, str):
+                    out[rel_path[:-len(TEMPLATE_SUFFIX)]] = self.render(content, context, context_hash, f"{skill_name}/{rel_path}")
+                else:
+                    out[rel_path] = content
+            rendered[skill_name] = out
+        return rendered
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by build_rule_bundle across the projects of a process
+SKILL_RENDERER = SkillRenderer()
@@ -0,0 +1,177 @@
+"""
+Lazy skill handles and skill selection.
+
+load_static_assets only lists the skill library (vibe/templates/skills):
+each skill becomes a SkillHandle with its file list, and nothing is read.
+build_rule_bundle then picks the skills the project can use — by detected
+stack and by what the target IDE adapter supports — and binds them to the
+project context. A file is read (and a .j2 template rendered) only when an
+adapter accesses it, so the cost of a create scales with the skills that
+are emitted, not with the size of the library.
+"""
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+
+from vibe.core.skill_renderer import SKILL_RENDERER, TEMPLATE_SUFFIX, SkillRenderer, stack_id
+from vibe.core.state import hash_inputs
+from vibe.templates.store import TEMPLATE_STORE, TemplateStore
+
+# Skills that only apply to some stacks: skill folder -> stack id prefixes.
+# Skills not listed here are emitted for every stack.
+SKILL_STACKS: Dict[str, Tuple[str, ...]] = {
+    "lint_autofix": ("python_",),
+    "test_generator": ("python_",),
+}
+
+# Adapter capabilities a skill can need (see BaseAdapter.skill_capabilities)
+CAPABILITY_SKILLS = "skills"
+CAPABILITY_SCRIPTS = "scripts"
+ALL_CAPABILITIES: FrozenSet[str] = frozenset({CAPABILITY_SKILLS, CAPABILITY_SCRIPTS})
+
+
+class SkillHandle(Mapping):
+    """
+    One skill of the template library: {file name: content}, loaded on access.
+
+    Unbound handles (no context) map template names ("SKILL.md.j2") to the
+    raw template text. Bound handles map output names ("SKILL.md") to the
+    rendered text. Files that are not .j2 templates map to their source path
+    in both cases and are never read (see WritePlan.copies).
+    """
+
+    def __init__(self, name: str, sources: Dict[str, Path], context: Optional[Dict[str, str]] = None,
+                 store: Optional[TemplateStore] = None, renderer: Optional[SkillRenderer] = None):
+        """
+        Args:
+            name: Skill folder name.
+            sources: Template file name (relative to the skill folder) -> source path.
+            context: Placeholder values for .j2 templates; None keeps them unrendered.
+            store: Template store to read through (default TEMPLATE_STORE).
+            renderer: Skill renderer (default SKILL_RENDERER).
+        """
+        self.name = name
+        self.sources = dict(sources)
+        self.context = context
+        self._store = store if store is not None else TEMPLATE_STORE
+        self._renderer = renderer if renderer is not None else SKILL_RENDERER
+        self._context_hash = hash_inputs(context) if context is not None else ""
+        # Output name -> template name
+        self._names = {
+            (template[:-len(TEMPLATE_SUFFIX)] if context is not None and template.endswith(TEMPLATE_SUFFIX) else template): template
+            for template in self.sources
+        }
+        self._loaded: Dict[str, Union[str, Path]] = {}
+        self._stats: Optional[Dict[str, os.stat_result]] = None
+
+    def bind(self, context: Dict[str, str]) -> "SkillHandle":
+        """A handle rendering this skill's templates with the given context."""
+        return SkillHandle(self.name, self.sources, context, self._store, self._renderer)
+
+    @property
+    def files(self) -> List[str]:
+        """File names, as they will be emitted."""
+        return list(self._names)
+
+    @property
+    def loaded(self) -> List[str]:
+        """Files read so far."""
+        return list(self._loaded)
+
+    def requires(self) -> FrozenSet[str]:
+        """Adapter capabilities the skill needs (derived from its file list)."""
+        needs = {CAPABILITY_SKILLS}
+        if any(name.startswith("scripts/") for name in self.sources):
+            needs.add(CAPABILITY_SCRIPTS)
+        return frozenset(needs)
+
+    def stats(self) -> Dict[str, os.stat_result]:
+        """stat() of every source file, taken on first call."""
+        if self._stats is None:
+            self._stats = {name: os.stat(path) for name, path in self.sources.items()}
+        return self._stats
+
+    @property
+    def size(self) -> int:
+        """Total size of the skill's source files in bytes."""
+        return sum(st.st_size for st in self.stats().values())
+
+    def __getitem__(self, name: str) -> Union[str, Path]:
+        value = self._loaded.get(name)
+        if value is not None:
+            return value
+        template = self._names[name]
+        source = self.sources[template]
+        if not template.endswith(TEMPLATE_SUFFIX):
+            value = source
+        else:
+            text = self._store.read(source)
+            value = text if self.context is None else self._renderer.render(text, self.context, self._context_hash, f"{self.name}/{template}")
+        self._loaded[name] = value
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        state = "bound" if self.context is not None else "unbound"
+        return f"SkillHandle({self.name!r}, {len(self)} files, {len(self._loaded)} loaded, {state})"
+
+
+def list_skills(skills_dir: Union[str, Path], store: Optional[TemplateStore] = None) -> Dict[str, SkillHandle]:
+    """
+    Lists the skill library without reading any file.
+
+    Args:
+        skills_dir: Directory with one folder per skill.
+        store: Template store to list and read through (default TEMPLATE_STORE).
+
+    Returns:
+        Skill name -> unbound SkillHandle, sorted by name.
+    """
+    store = store if store is not None else TEMPLATE_STORE
+    sources: Dict[str, Dict[str, Path]] = {}
+    for rel_path, path in store.listing(skills_dir).items():
+        skill_name, sep, file_name = rel_path.partition("/")
+        if not sep:
+            continue  # Loose files next to the skill folders
+        sources.setdefault(skill_name, {})[file_name] = path
+    return {name: SkillHandle(name, files, store=store) for name, files in sorted(sources.items())}
+
+
+def select_skills(
+    skills: Dict[str, SkillHandle],
+    stacks: Sequence[str],
+    capabilities: FrozenSet[str] = ALL_CAPABILITIES,
+) -> Tuple[Dict[str, SkillHandle], Dict[str, str]]:
+    """
+    Picks the skills to emit for a project.
+
+    Args:
+        skills: The skill library (see list_skills).
+        stacks: Stack rules in the bundle (e.g. ["02_stack_react_vite.md", "02_stack_python_fastapi.md"]).
+        capabilities: What the target adapter supports (BaseAdapter.skill_capabilities).
+
+    Returns:
+        (selected skills, skipped skill name -> reason).
+    """
+    stack_ids = [stack_id(rule) for rule in stacks]
+    selected: Dict[str, SkillHandle] = {}
+    skipped: Dict[str, str] = {}
+    for name, handle in skills.items():
+        missing = handle.requires() - capabilities
+        prefixes = SKILL_STACKS.get(name)
+        if missing:
+            skipped[name] = f"adapter lacks {', '.join(sorted(missing))}"
+        elif prefixes and not any(sid.startswith(prefixes) for sid in stack_ids):
+            skipped[name] = f"not used by stack {', '.join(sid for sid in stack_ids if sid) or '-'}"
+        else:
+            selected[name] = handle
+    return selected, skipped
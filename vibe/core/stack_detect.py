@@ -0,0 +1,144 @@
+"""
+Tech stack detection for rule selection.
+
+All stack keywords are merged into one trie and compiled into a single
+regular expression, so an architecture document is scanned once (in the
+regex engine) regardless of how many keywords there are. Keywords only
+match as whole words: "go" matches "Go 1.22" but not "google" or "good".
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_STACK_RULE = "02_stack_python_fastapi.md"
+
+# Score a stack other than the best one needs to be included in the rules
+MIN_SECONDARY_SCORE = 1.0
+
+# Stack rule template -> (keyword, weight). Ambiguous everyday words weigh less.
+# Order is the tie-break priority when two stacks score the same.
+STACK_KEYWORDS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    "02_stack_python_django.md": (("django", 1.0),),
+    "02_stack_nodejs_express.md": (("node", 0.5), ("nodejs", 1.0), ("node.js", 1.0), ("express", 1.0)),
+    "02_stack_react_vite.md": (("react", 1.0), ("vite", 1.0)),
+    "02_stack_go_gin.md": (("go", 0.5), ("golang", 1.0), ("gin", 1.0)),
+    "02_stack_telegram_bot.md": (("telegram", 1.0), ("bot", 0.5)),
+    "02_stack_postgresql.md": (("postgres", 1.0), ("postgresql", 1.0)),
+    "02_stack_python_fastapi.md": (("fastapi", 1.0),),
+}
+
+
+@dataclass(frozen=True)
+class StackMatch:
+    """A detected stack, its score and the keywords that matched."""
+    rule: str
+    score: float
+    keywords: Tuple[str, ...]
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """Regex alternation built from a trie of the words (shared prefixes are matched once)."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        optional = "" in node
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if optional else group
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Finds whole-word, case-insensitive occurrences of many keywords in one pass."""
+
+    def __init__(self, keywords: Sequence[str]):
+        """
+        Args:
+            keywords: Keywords to find; each must start and end with a word character.
+
+        Raises:
+            ValueError: If a keyword cannot be matched on word boundaries.
+        """
+        self.keywords = sorted({keyword.lower() for keyword in keywords})
+        for keyword in self.keywords:
+            if not re.match(r"\w(.*\w)?$", keyword):
+                raise ValueError(f"Keyword {keyword!r} must start and end with a word character")
+        # The first-character lookahead lets the engine reject most positions before trying the trie
+        first_chars = re.escape("".join(sorted({keyword[0] for keyword in self.keywords})))
+        self._regex = re.compile(r"\b(?=[" + first_chars + r"])(?:" + _trie_pattern(self.keywords) + r")\b")
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrences of each keyword found in the text (case-insensitive)."""
+        found: Dict[str, int] = {}
+        for keyword in self._regex.findall(text.lower()):
+            found[keyword] = found.get(keyword, 0) + 1
+        return found
+
+
+class StackDetector:
+    """
+    Scores every stack rule against an architecture description.
+    """
+
+    def __init__(self, stack_keywords: Dict[str, Tuple[Tuple[str, float], ...]] = STACK_KEYWORDS,
+                 default_rule: str = DEFAULT_STACK_RULE):
+        """
+        Args:
+            stack_keywords: Stack rule -> (keyword, weight) pairs, in priority order.
+            default_rule: Rule used when nothing matches.
+        """
+        self.default_rule = default_rule
+        self._priority = {rule: index for index, rule in enumerate(stack_keywords)}
+        self._keyword_rules: Dict[str, List[Tuple[str, float]]] = {}
+        for rule, keywords in stack_keywords.items():
+            for keyword, weight in keywords:
+                self._keyword_rules.setdefault(keyword.lower(), []).append((rule, weight))
+        self._matcher = KeywordMatcher(list(self._keyword_rules))
+
+    def detect(self, text: str) -> List[StackMatch]:
+        """
+        Returns every matched stack, best first.
+
+        Args:
+            text: Architecture description (e.g. systemPatterns.md).
+
+        Returns:
+            Matches ordered by score, then by stack priority. Empty if nothing matched.
+        """
+        scores: Dict[str, float] = {}
+        matched: Dict[str, List[str]] = {}
+        for keyword, count in self._matcher.counts(text).items():
+            for rule, weight in self._keyword_rules[keyword]:
+                scores[rule] = scores.get(rule, 0.0) + weight * count
+                matched.setdefault(rule, []).append(keyword)
+        ranked = sorted(scores, key=lambda rule: (-scores[rule], self._priority[rule]))
+        return [StackMatch(rule, scores[rule], tuple(sorted(matched[rule]))) for rule in ranked]
+
+    def primary(self, text: str) -> str:
+        """The best-scoring stack rule, or the default rule if nothing matched."""
+        matches = self.detect(text)
+        return matches[0].rule if matches else self.default_rule
+
+    def select(self, text: str, min_score: float = MIN_SECONDARY_SCORE) -> List[str]:
+        """
+        Stack rules to include, best first: the primary rule plus every other
+        stack scoring at least min_score (a single "go" or "bot" is not enough).
+        """
+        matches = self.detect(text)
+        if not matches:
+            return [self.default_rule]
+        return [matches[0].rule] + [m.rule for m in matches[1:] if m.score >= min_score]
+
+
+# Shared by scaffolding.select_stack_rule and InjectorAgent
+STACK_DETECTOR = StackDetector()
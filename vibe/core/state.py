@@ -0,0 +1,126 @@
+"""
+Stage checkpoints for Vibe-CLI.
+
+Each completed stage stores its AgentResult together with a hash of the
+inputs that produced it under <project>/.vibe/state/, so an interrupted
+run can resume without repeating LLM calls whose inputs are unchanged.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from vibe.agents.base import AgentResult
+
+STATE_DIR = Path(".vibe") / "state"
+
+# Run parameters (user request, IDE, options) needed by `vibe resume`
+RUN_FILE = "run.json"
+
+
+def hash_inputs(*parts: Any) -> str:
+    """
+    Stable content hash of a stage's inputs.
+
+    Args:
+        parts: Strings or JSON-serialisable values (e.g. the final prompt).
+
+    Returns:
+        Hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False, default=str)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass
+class StageRecord:
+    """A persisted stage result and the input hash that produced it."""
+    stage: str
+    input_hash: str
+    result: AgentResult
+    completed_at: float = 0.0
+
+
+class StateStore:
+    """
+    Checkpoint files for one project, one JSON file per stage.
+    """
+
+    def __init__(self, project_dir: Path):
+        """
+        Args:
+            project_dir: Root of the generated project.
+        """
+        self.root = Path(project_dir) / STATE_DIR
+
+    def _path(self, stage: str) -> Path:
+        return self.root / f"{stage}.json"
+
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def load(self, stage: str) -> Optional[StageRecord]:
+        """Returns the stored record for a stage, or None if absent or unreadable."""
+        data = self._read_json(self._path(stage))
+        if data is None:
+            return None
+        try:
+            return StageRecord(
+                stage=data["stage"],
+                input_hash=data["input_hash"],
+                result=AgentResult(**data["result"]),
+                completed_at=data.get("completed_at", 0.0),
+            )
+        except (KeyError, TypeError):
+            return None
+
+    def lookup(self, stage: str, input_hash: str) -> Optional[AgentResult]:
+        """
+        Returns the stored result if it succeeded and was produced by the same inputs.
+
+        Args:
+            stage: Stage key (e.g. "productContext").
+            input_hash: Hash of the inputs the caller is about to use.
+        """
+        record = self.load(stage)
+        if record is None or record.input_hash != input_hash or not record.result.success:
+            return None
+        return record.result
+
+    def save(self, stage: str, input_hash: str, result: AgentResult) -> None:
+        """Persists a stage result atomically."""
+        record = StageRecord(stage=stage, input_hash=input_hash, result=result, completed_at=time.time())
+        self._write_json(self._path(stage), asdict(record))
+
+    def save_run(self, params: Dict[str, Any]) -> None:
+        """Stores the parameters of the current run."""
+        self._write_json(self.root / RUN_FILE, params)
+
+    def load_run(self) -> Optional[Dict[str, Any]]:
+        """Returns the parameters of the last run, if any."""
+        return self._read_json(self.root / RUN_FILE)
+
+    def clear(self) -> None:
+        """Removes every checkpoint (run parameters included)."""
+        if self.root.exists():
+            for path in self.root.glob("*.json"):
+                path.unlink()
@@ -0,0 +1,272 @@
+"""
+Parallel, atomic file writer used by apply_write_plan.
+
+Every file is written to a temporary sibling and moved into place with
+os.replace, so a crash never leaves a half-written CLAUDE.md or .mdc rule:
+readers see either the old or the new content. Target directories are
+created once up front, files are written concurrently on a thread pool
+(most of the cost on network filesystems is per-call latency, not CPU),
+and with fsync enabled all data is flushed in one batch before the renames
+(which also run concurrently; each one is atomic on its own). A target that
+is a symlink is written through: its destination file is replaced, and the
+link stays in place.
+"""
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# Concurrent file writes
+DEFAULT_WRITE_WORKERS = 8
+
+# Set VIBE_FSYNC=1 to flush written files (and their directories) to disk
+FSYNC_ENV = "VIBE_FSYNC"
+
+
+def fsync_enabled() -> bool:
+    return os.environ.get(FSYNC_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class WriteOp:
+    """One file to (re)write."""
+    rel_path: str
+    path: Path
+    # Text is written as UTF-8; bytes as-is
+    content: Union[str, bytes] = ""
+    # Permission bits to keep when replacing an existing file
+    mode: Optional[int] = None
+    # Copy this file instead of writing content (see copy_file)
+    source: Optional[Path] = None
+
+
+@dataclass
+class WriteReport:
+    """Outcome and phase timings (seconds) of a write batch."""
+    written: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    # Stat of each written file (size, mtime) as left on disk
+    stats: Dict[str, os.stat_result] = field(default_factory=dict)
+    # Set by apply_write_plan: content already on disk / edited since Vibe wrote it
+    unchanged: List[str] = field(default_factory=list)
+    conflicted: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.timings.items() if name != "total")
+        counts = f"{len(self.written)} written, {len(self.unchanged)} unchanged, {len(self.conflicted)} conflicted"
+        return f"{counts} in {self.timings.get('total', 0.0) * 1000:.0f}ms ({phases})"
+
+
+# Linux ioctl for a copy-on-write clone (btrfs, XFS, bcachefs)
+_FICLONE = 0x40049409
+
+
+def clone_file(src_fd: int, dst_fd: int) -> bool:
+    """Reflinks src into the empty dst on copy-on-write filesystems; False where unsupported."""
+    try:
+        import fcntl
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+def copy_file(source: Union[str, Path], dst_fd: int) -> str:
+    """
+    Copies a file into an empty, open destination without passing the data
+    through Python: a reflink, else copy_file_range, else sendfile, else a
+    buffered read/write loop.
+
+    Returns:
+        The method that was used.
+    """
+    with open(source, "rb") as src:
+        src_fd = src.fileno()
+        if clone_file(src_fd, dst_fd):
+            return "reflink"
+        size = os.fstat(src_fd).st_size
+        for method in ("copy_file_range", "sendfile"):
+            if not hasattr(os, method):
+                continue
+            try:
+                copied = 0
+                while copied < size:
+                    if method == "copy_file_range":
+                        sent = os.copy_file_range(src_fd, dst_fd, size - copied, copied)
+                    else:
+                        sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                    if sent == 0:
+                        break  # Source shrank while copying
+                    copied += sent
+                return method
+            except OSError:
+                # Not supported here (e.g. across filesystems): start over with the next method
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+        src.seek(0)
+        while True:
+            chunk = src.read(1 << 20)
+            if not chunk:
+                return "read/write"
+            os.write(dst_fd, chunk)
+
+
+def _write_temp(op: WriteOp) -> Tuple[str, os.stat_result]:
+    """Writes op.content (or copies op.source) next to its target; returns the temporary path and its stat."""
+    tmp_path = str(op.path.parent / f".{op.path.name}.{secrets.token_hex(4)}.tmp")
+    # 0o666 lets the process umask decide the permissions, as open(..., "w") did
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        if op.source is not None:
+            with os.fdopen(fd, "wb") as f:
+                copy_file(op.source, f.fileno())
+                st = os.fstat(f.fileno())
+        else:
+            # newline="": the bytes on disk are exactly the ones the manifest hashed (no CRLF on Windows)
+            with (os.fdopen(fd, "wb") if isinstance(op.content, bytes) else os.fdopen(fd, "w", encoding="utf-8", newline="")) as f:
+                f.write(op.content)
+                f.flush()
+                # Size and mtime survive the chmod and the rename
+                st = os.fstat(f.fileno())
+        if op.mode is not None:
+            os.chmod(tmp_path, op.mode)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    return tmp_path, st
+
+
+def _fsync_path(path: str, directory: bool = False) -> None:
+    flags = os.O_RDONLY if directory else os.O_RDWR
+    try:
+        fd = os.open(path, flags | getattr(os, "O_BINARY", 0))
+    except OSError:
+        if directory:
+            return  # Directories cannot be opened on Windows; renames are durable there
+        raise
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _discard(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def stat_all(paths: List[Path], max_workers: int = DEFAULT_WRITE_WORKERS) -> List[Optional[os.stat_result]]:
+    """
+    Stat of each path, or None if it does not exist; stat calls run concurrently.
+    """
+    if len(paths) < 2:
+        return [_stat_or_none(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths))), thread_name_prefix="vibe-stat") as pool:
+        return list(pool.map(_stat_or_none, paths))
+
+
+def _follow_link(op: WriteOp) -> WriteOp:
+    """Retargets an op at a symlink's destination, as open(path, "w") would write through it."""
+    if not os.path.islink(op.path):
+        return op
+    return replace(op, path=Path(os.path.realpath(op.path)))
+
+
+def _replace(tmp_path: str, target: Path) -> None:
+    try:
+        os.replace(tmp_path, target)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+def write_files(ops: List[WriteOp], max_workers: int = DEFAULT_WRITE_WORKERS, fsync: Optional[bool] = None) -> WriteReport:
+    """
+    Writes files atomically and concurrently.
+
+    Args:
+        ops: Files to write; targets must be distinct.
+        max_workers: Thread pool size.
+        fsync: Flush data and directories before returning (defaults to VIBE_FSYNC).
+
+    Returns:
+        A WriteReport; files that failed are listed in `failed` and left untouched.
+    """
+    if fsync is None:
+        fsync = fsync_enabled()
+    report = WriteReport()
+    start = time.perf_counter()
+    # os.replace on a linked CLAUDE.md would turn the link into a regular file
+    ops = [_follow_link(op) for op in ops]
+
+    # 1. Directories: each distinct parent once, shallowest first
+    phase = time.perf_counter()
+    directories = sorted({op.path.parent for op in ops}, key=lambda p: len(p.parts))
+    for directory in directories:
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            for op in ops:
+                if op.path.parent == directory:
+                    report.failed[op.rel_path] = str(e)
+    pending = [op for op in ops if op.rel_path not in report.failed]
+    report.timings["mkdir"] = time.perf_counter() - phase
+
+    temps: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending) or 1)), thread_name_prefix="vibe-write") as pool:
+        # 2. Content into temporary files
+        phase = time.perf_counter()
+        futures = [(op, pool.submit(_write_temp, op)) for op in pending]
+        for op, future in futures:
+            try:
+                temps[op.rel_path], report.stats[op.rel_path] = future.result()
+            except Exception as e:
+                report.failed[op.rel_path] = str(e)
+        report.timings["write"] = time.perf_counter() - phase
+
+        # 3. One batch of data flushes before anything becomes visible
+        if fsync:
+            phase = time.perf_counter()
+            futures = [(rel_path, pool.submit(_fsync_path, tmp_path)) for rel_path, tmp_path in temps.items()]
+            for rel_path, future in futures:
+                try:
+                    future.result()
+                except OSError as e:
+                    report.failed[rel_path] = str(e)
+                    _discard(temps.pop(rel_path))
+            report.timings["fsync"] = time.perf_counter() - phase
+
+        # 4. Atomic renames; each file switches from old to new content at once
+        phase = time.perf_counter()
+        futures = [(op, pool.submit(_replace, temps[op.rel_path], op.path)) for op in pending if op.rel_path in temps]
+        for op, future in futures:
+            try:
+                future.result()
+                report.written.append(op.rel_path)
+            except OSError as e:
+                report.failed[op.rel_path] = str(e)
+        report.timings["rename"] = time.perf_counter() - phase
+
+        # 5. Make the renames durable: one fsync per directory
+        if fsync:
+            phase = time.perf_counter()
+            written = set(report.written)
+            directories = {op.path.parent for op in pending if op.rel_path in written}
+            list(pool.map(lambda directory: _fsync_path(str(directory), directory=True), directories))
+            report.timings["fsync"] += time.perf_counter() - phase
+
+    report.timings["total"] = time.perf_counter() - start
+    return report
@@ -1,10 +1,49 @@
 """
 Vibe-CLI LLM Module.
 """
-from vibe.llm.client import call_llm
-from vibe.llm.parser import extract_file_content
+from vibe.llm.client import (
+    call_llm,
+    acall_llm,
+    stream_llm,
+    astream_llm,
+    set_llm_concurrency,
+    configure_hedging,
+    get_client_pool,
+    shutdown_client_pool,
+    LLMError,
+    LLMTimeoutError,
+)
+from vibe.llm.parser import extract_file_content, parse_file_blocks, FileIndex, FileBlock
+from vibe.llm.hedging import HedgePolicy
+from vibe.llm.pool import ClientPool, PoolStats
+from vibe.llm.retry import RetryPolicy, DEFAULT_RETRY_POLICY, NO_RETRY
+from vibe.llm.stream import IncrementalFileParser, FileBlockEvent, ContextStreamWriter
+from vibe.llm.telemetry import CallRecord, telemetry
 
 __all__ = [
     "call_llm",
+    "acall_llm",
+    "stream_llm",
+    "astream_llm",
+    "set_llm_concurrency",
+    "configure_hedging",
+    "HedgePolicy",
+    "LLMError",
+    "LLMTimeoutError",
+    "get_client_pool",
+    "shutdown_client_pool",
     "extract_file_content",
+    "parse_file_blocks",
+    "FileIndex",
+    "FileBlock",
+    "ClientPool",
+    "PoolStats",
+    "RetryPolicy",
+    "DEFAULT_RETRY_POLICY",
+    "NO_RETRY",
+    "IncrementalFileParser",
+    "FileBlockEvent",
+    "ContextStreamWriter",
+    "CallRecord",
+    "telemetry",
 ]
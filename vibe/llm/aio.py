@@ -0,0 +1,86 @@
+"""
+Bridge between the asyncio LLM layer and synchronous callers.
+
+Sync wrappers run coroutines on one long-lived background event loop, so
+pooled clients (and their async HTTP sessions) always see the same loop.
+"""
+import asyncio
+import atexit
+import threading
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Returns the shared background loop, starting its thread on first use."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="vibe-llm-loop", daemon=True)
+            _loop_thread.start()
+            atexit.register(shutdown_background_loop)
+        return _loop
+
+
+def _ensure_not_on_loop_thread() -> None:
+    if _loop_thread is not None and threading.current_thread() is _loop_thread:
+        raise RuntimeError("Synchronous LLM wrappers cannot be called from the LLM event loop; await the async API instead.")
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the background loop and block until it finishes.
+    Interrupting the caller (e.g. Ctrl-C) cancels the coroutine.
+
+    Args:
+        coro: The coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    _ensure_not_on_loop_thread()
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Drive an async generator from synchronous code, one item at a time.
+    Closing the returned generator closes the async generator on the loop.
+    """
+    _ensure_not_on_loop_thread()
+    try:
+        while True:
+            try:
+                item = run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        aclose = getattr(agen, "aclose", None)
+        if aclose is not None:
+            run_sync(aclose())
+
+
+def shutdown_background_loop() -> None:
+    """Stops the background loop thread if it was started."""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            return
+        _loop.call_soon_threadsafe(_loop.stop)
+        if _loop_thread is not None:
+            _loop_thread.join(timeout=5)
+        _loop.close()
+        _loop = None
+        _loop_thread = None
@@ -0,0 +1,198 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+
+Entries are keyed by a hash of (prompt, model alias, template version) and
+store the raw response, so parsing can be re-run against cached text.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from vibe import __version__
+
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache instance."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def make_cache_key(prompt: str, model_alias: str, template_version: str = __version__) -> str:
+    """
+    Builds the content address for a request.
+
+    Args:
+        prompt: The fully rendered prompt.
+        model_alias: The model alias the prompt is sent to.
+        template_version: Version of the prompt templates that produced the prompt.
+
+    Returns:
+        A hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in (template_version, model_alias, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    LRU cache of raw LLM responses stored as one JSON file per entry.
+    The file mtime doubles as the last-access time used for eviction.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Directory holding cache entries (created on first write).
+            max_entries: Maximum number of entries kept after eviction.
+            max_bytes: Maximum total size of entries kept after eviction.
+            ttl_seconds: Entries older than this are treated as misses. None disables expiry.
+        """
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        # get/put run concurrently from pipeline, batch and hedging threads
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key().
+
+        Returns:
+            The raw response text, or None on a miss.
+        """
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry.get("created", 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self._count("hits")
+        return entry.get("response")
+
+    def put(self, key: str, response: str, model_alias: str = "default") -> None:
+        """
+        Store a raw response and evict old entries if limits are exceeded.
+
+        Args:
+            key: Cache key from make_cache_key().
+            response: The raw LLM response.
+            model_alias: Model alias, kept for inspection.
+        """
+        entry = {
+            "key": key,
+            "model": model_alias,
+            "created": time.time(),
+            "response": response,
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            self._remove(Path(tmp_path))
+            return
+        self._count("writes")
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Removes expired entries, then least recently used ones until within limits.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            try:
+                scanned = [e for e in os.scandir(self.root) if e.name.endswith(".json")]
+            except OSError:
+                return 0
+
+            entries = []
+            for dir_entry in scanned:
+                try:
+                    st = dir_entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, dir_entry.path))
+            entries.sort()
+
+            removed = 0
+            total_bytes = sum(size for _, size, _ in entries)
+            now = time.time()
+            for mtime, size, path in entries:
+                # mtime is last access; anything untouched past the TTL is stale as well
+                expired = self.ttl_seconds is not None and now - mtime > self.ttl_seconds
+                over_limit = len(entries) - removed > self.max_entries or total_bytes > self.max_bytes
+                if not expired and not over_limit:
+                    break
+                self._remove(Path(path))
+                removed += 1
+                total_bytes -= size
+
+            self.stats.evictions += removed
+            return removed
+
+    def clear(self) -> None:
+        """Deletes every cache entry."""
+        if not self.root.exists():
+            return
+        for path in self.root.glob("*.json"):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
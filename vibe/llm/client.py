@@ -1,12 +1,47 @@
 """
 LLM Client wrapper for Vibe-CLI.
 """
+import asyncio
+import atexit
+import os
 import sys
+import time
+import weakref
+from typing import AsyncIterator, Iterator, Optional
 from vibe.cli.console import console
+from vibe.config.paths import CACHE_DIR
 from vibe.config.settings import Settings
+from vibe.llm.aio import iterate_sync, run_sync
+from vibe.llm.cache import ResponseCache, make_cache_key
+from vibe.llm.hedging import DEFAULT_HEDGE_POLICY, HedgePolicy, hedged_stream
+from vibe.llm.pool import ClientPool
+from vibe.llm.retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from vibe.llm.stream import FileBlockCallback, IncrementalFileParser
+from vibe.llm.parser import FILE_START_PREFIX, MARKER_SUFFIX, FILE_END_MARKER
+from vibe.llm.telemetry import CallRecord, StageHistory, estimate_tokens, telemetry
 
 # Try to import my_llm_sdk, handle failure gracefully
 _LLMClient = None
+_client_pool: Optional[ClientPool] = None
+_response_cache: Optional[ResponseCache] = None
+_cache_enabled = True
+_cache_refresh = False
+_stage_history: Optional[StageHistory] = None
+
+# Maximum concurrent provider calls per event loop
+DEFAULT_CONCURRENCY = int(os.environ.get("VIBE_LLM_CONCURRENCY", "4"))
+_concurrency = DEFAULT_CONCURRENCY
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_hedge_policy: HedgePolicy = DEFAULT_HEDGE_POLICY
+
+
+class LLMError(Exception):
+    """Raised when an LLM call fails."""
+
+
+class LLMTimeoutError(LLMError, TimeoutError):
+    """Raised when an LLM call exceeds its deadline."""
+
 
 def _ensure_llm_client():
     global _LLMClient
@@ -32,24 +67,387 @@ def _ensure_llm_client():
             sys.exit(1)
 
 
-def call_llm(prompt_text: str, step_name: str) -> str:
+def _create_client(user_config: str, project_config: str):
+    try:
+        _ensure_llm_client()
+    except SystemExit:
+        # Never let a missing SDK tear down the event loop running this call
+        raise LLMError("my_llm_sdk not found") from None
+    return _LLMClient(user_config_path=user_config, project_config_path=project_config)
+
+
+def get_client_pool() -> ClientPool:
+    """Returns the process-wide client pool, creating it on first use."""
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = ClientPool(_create_client)
+        atexit.register(shutdown_client_pool)
+    return _client_pool
+
+
+def shutdown_client_pool() -> None:
+    """Closes all pooled clients. Safe to call more than once."""
+    if _client_pool is not None:
+        _client_pool.shutdown()
+
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide response cache under the user cache dir."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(CACHE_DIR / "llm")
+    return _response_cache
+
+
+def configure_cache(enabled: bool = True, refresh: bool = False) -> None:
+    """
+    Configures how call_llm uses the response cache.
+
+    Args:
+        enabled: If False, the cache is neither read nor written.
+        refresh: If True, cached entries are ignored but fresh responses are stored.
+    """
+    global _cache_enabled, _cache_refresh
+    _cache_enabled = enabled
+    _cache_refresh = refresh
+
+
+def get_stage_history() -> StageHistory:
+    """Returns the persisted per-step history under the user cache dir."""
+    global _stage_history
+    if _stage_history is None:
+        _stage_history = StageHistory(CACHE_DIR / "history.json")
+    return _stage_history
+
+
+def set_llm_concurrency(limit: int) -> None:
     """
-    Calls the LLM with the given prompt.
-    
+    Sets how many LLM calls may be in flight at once (per event loop).
+
+    Args:
+        limit: Maximum concurrent calls, at least 1.
+    """
+    global _concurrency
+    _concurrency = max(1, int(limit))
+    _semaphores.clear()
+
+
+def configure_hedging(policy: HedgePolicy) -> None:
+    """
+    Sets the hedging policy for subsequent calls (off by default; VIBE_LLM_HEDGE=1 enables it).
+
+    Args:
+        policy: The HedgePolicy to apply.
+    """
+    global _hedge_policy
+    _hedge_policy = policy
+
+
+def _open_events(client, prompt_text: str, step_name: str, model_alias: str, record: CallRecord):
+    """Opens the provider stream, hedged when the policy and the step's history allow it."""
+    def open_stream():
+        return client.stream_async(prompt_text, model_alias=model_alias)
+
+    policy = _hedge_policy
+    if not policy.enabled:
+        return open_stream()
+
+    history = get_stage_history()
+    threshold = policy.threshold(history.latencies(step_name, "ttft_ms"))
+
+    def may_hedge() -> bool:
+        if not history.hedge_allowed(policy.budget):
+            return False
+        console.print(f"[dim]🏇 {step_name}: no first token after {threshold:.1f}s, sending a hedge request[/dim]")
+        return True
+
+    return hedged_stream(open_stream, threshold, may_hedge, record)
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_concurrency)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def astream_llm(
+    prompt_text: str,
+    step_name: str,
+    model_alias: str = "default",
+    record: Optional[CallRecord] = None,
+) -> AsyncIterator[str]:
+    """
+    Streams the LLM response for the given prompt.
+
+    Cached responses are replayed as a single chunk. Time-to-first-token and
+    throughput are recorded in vibe.llm.telemetry and printed when the stream ends.
+
     Args:
         prompt_text: The prompt to send to the LLM.
         step_name: A human-readable name for logging purposes.
-    
-    Returns:
-        The LLM response as a string.
+        model_alias: Model alias defined in llm.project.yaml.
+        record: Telemetry record to fill in; a new one is registered if omitted.
+
+    Yields:
+        Text deltas as they arrive. Closing the generator cancels the provider stream;
+        only a response that ran to completion is cached.
+
+    Raises:
+        LLMError: If the provider call fails.
     """
-    _ensure_llm_client()
+    if record is None:
+        record = telemetry.start(step_name, model_alias)
+    cache_key = make_cache_key(prompt_text, model_alias)
+    if _cache_enabled and not _cache_refresh:
+        cached = get_response_cache().get(cache_key)
+        if cached is not None:
+            console.print(f"[dim]♻️  {step_name}: using cached response[/dim]")
+            record.cached = True
+            record.first_token_at = record.finished_at = time.monotonic()
+            record.output_chars = len(cached)
+            record.output_tokens = estimate_tokens(cached)
+            yield cached
+            return
+
     console.print(f"[yellow]⏳ {step_name} is thinking...[/yellow]")
     user_conf, proj_conf = Settings.resolve_config_paths()
+    parts = []
+    usage = None
+    events = None
     try:
-        client = _LLMClient(user_config_path=user_conf, project_config_path=proj_conf)
-        response = client.generate(prompt=prompt_text)
-        return response
+        client = get_client_pool().get(user_conf, proj_conf, model_alias)
+        events = _open_events(client, prompt_text, step_name, model_alias, record)
+        async for event in events:
+            if getattr(event, "error", None) is not None:
+                raise event.error
+            delta = event.delta if hasattr(event, "delta") else str(event)
+            if getattr(event, "usage", None) is not None:
+                usage = event.usage
+            if not delta:
+                continue
+            if record.first_token_at is None:
+                record.first_token_at = time.monotonic()
+            parts.append(delta)
+            yield delta
+    except GeneratorExit:
+        # Consumer stopped early: cancel the provider stream, keep what we have
+        record.early_stopped = True
+    except LLMError:
+        raise
     except Exception as e:
+        raise LLMError(str(e)) from e
+    finally:
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    response = "".join(parts)
+    record.finished_at = time.monotonic()
+    record.output_chars = len(response)
+    record.output_tokens = getattr(usage, "output_tokens", None) or estimate_tokens(response)
+    if not record.early_stopped:
+        _print_stream_stats(step_name, record)
+
+    history = get_stage_history()
+    history.observe_latency(step_name, record.ttft_ms, None if record.early_stopped else record.duration_ms)
+    if _hedge_policy.enabled:
+        history.count_call(record.hedged)
+
+    # An early close can come from anywhere (a failing callback, a cancelled task):
+    # the partial text is not a response. _acollect caches deliberate stops itself.
+    if _cache_enabled and response and not record.early_stopped:
+        get_response_cache().put(cache_key, response, model_alias)
+
+
+def _print_stream_stats(step_name: str, record: CallRecord) -> None:
+    if record.ttft_ms is None:
+        return
+    rate = f" · {record.tokens_per_sec:.1f} tok/s" if record.tokens_per_sec else ""
+    console.print(f"[dim]⚡ {step_name}: first token {record.ttft_ms:.0f} ms{rate} ({record.output_tokens} tokens)[/dim]")
+
+
+async def acall_llm(
+    prompt_text: str,
+    step_name: str,
+    model_alias: str = "default",
+    on_event: Optional[FileBlockCallback] = None,
+    stop_after: Optional[str] = None,
+    timeout: Optional[float] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+) -> str:
+    """
+    Calls the LLM and returns the full response, honouring the concurrency limit
+    and retrying transient failures.
+
+    Args:
+        prompt_text: The prompt to send to the LLM.
+        step_name: A human-readable name for logging purposes.
+        model_alias: Model alias defined in llm.project.yaml.
+        on_event: Optional callback receiving |||FILE||| block events while streaming
+                  (e.g. a ContextStreamWriter). A retried attempt starts over with
+                  fresh "start" events.
+        stop_after: If set, cancel generation as soon as the block for this
+                    filename is closed by |||END_FILE|||. Calibration runs
+                    (see StageHistory.needs_calibration) still read to the end.
+        timeout: Deadline in seconds for each attempt, excluding time spent waiting
+                 for a concurrency slot. None waits indefinitely.
+        retry_policy: Backoff and attempt limits; defaults to DEFAULT_RETRY_POLICY.
+
+    Returns:
+        The LLM response as a string (truncated after stop_after's block if stopped early).
+
+    Raises:
+        LLMError: If the call fails with a non-retryable error or retries are exhausted.
+        LLMTimeoutError: If the last attempt timed out; the provider stream is cancelled.
+    """
+    policy = retry_policy or DEFAULT_RETRY_POLICY
+    record = telemetry.start(step_name, model_alias)
+    started = time.monotonic()
+
+    while True:
+        record.attempts += 1
+        attempt_timeout = timeout
+        if policy.deadline is not None:
+            remaining = policy.deadline - (time.monotonic() - started)
+            attempt_timeout = remaining if timeout is None else min(timeout, remaining)
+
+        try:
+            async with _get_semaphore():
+                record.started_at = time.monotonic()
+                record.first_token_at = None
+                collect = _acollect(prompt_text, step_name, model_alias, record, on_event, stop_after)
+                if attempt_timeout is None:
+                    return await collect
+                try:
+                    return await asyncio.wait_for(collect, attempt_timeout)
+                except asyncio.TimeoutError:
+                    raise LLMTimeoutError(f"{step_name} exceeded its {attempt_timeout:g}s deadline") from None
+        except LLMError as e:
+            error = e
+
+        delay = policy.backoff(record.attempts)
+        elapsed = time.monotonic() - started
+        out_of_time = policy.deadline is not None and elapsed + delay >= policy.deadline
+        if record.attempts >= policy.max_attempts or out_of_time or not policy.retryable(error):
+            record.error = str(error)
+            raise error
+
+        console.print(
+            f"[yellow]🔁 {step_name}: {error} — retrying in {delay:.1f}s "
+            f"(attempt {record.attempts + 1}/{policy.max_attempts})[/yellow]"
+        )
+        record.retry_wait_s += delay
+        await asyncio.sleep(delay)
+
+
+async def _acollect(
+    prompt_text: str,
+    step_name: str,
+    model_alias: str,
+    record: CallRecord,
+    on_event: Optional[FileBlockCallback],
+    stop_after: Optional[str],
+) -> str:
+    deltas = astream_llm(prompt_text, step_name, model_alias, record=record)
+    parser = IncrementalFileParser()
+    parts = []
+    stopped = False
+    may_stop = bool(stop_after) and not get_stage_history().needs_calibration(step_name)
+
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            for event in parser.feed(delta):
+                if on_event is not None:
+                    on_event(event)
+                if may_stop and event.kind == "end" and event.filename == stop_after:
+                    stopped = True
+            if stopped:
+                break
+    finally:
+        await deltas.aclose()
+
+    response = "".join(parts)
+    if stopped and record.early_stopped and _cache_enabled:
+        # Stopped on purpose after stop_after's END_FILE: complete for this step
+        get_response_cache().put(make_cache_key(prompt_text, model_alias), response, model_alias)
+    if stop_after and not record.cached:
+        _account_early_stop(record, response, stop_after)
+    return response
+
+
+def _account_early_stop(record: CallRecord, response: str, stop_after: str) -> None:
+    """
+    Learns how much chatter follows the needed block, and estimates what stopping saved.
+    Tokens never generated cannot be counted, so savings are the step's historical
+    trailing-token average priced at the measured throughput.
+    """
+    history = get_stage_history()
+    if not record.early_stopped:
+        start = response.find(f"{FILE_START_PREFIX}{stop_after}{MARKER_SUFFIX}")
+        end = response.find(FILE_END_MARKER, start) if start != -1 else -1
+        if end != -1:
+            trailing = response[end + len(FILE_END_MARKER):]
+            history.observe_trailing(record.step_name, estimate_tokens(trailing.strip()))
+        return
+
+    history.observe_stop(record.step_name)
+    expected = history.expected_trailing(record.step_name)
+    record.saved_tokens = int(expected) if expected else 0
+    rate = record.tokens_per_sec
+    record.saved_ms = record.saved_tokens / rate * 1000 if rate else 0.0
+    console.print(
+        f"[dim]✂️  {record.step_name}: stopped after {stop_after}, "
+        f"saved ~{record.saved_tokens} tokens / ~{record.saved_ms:.0f} ms[/dim]"
+    )
+
+
+def stream_llm(
+    prompt_text: str,
+    step_name: str,
+    model_alias: str = "default",
+    record: Optional[CallRecord] = None,
+) -> Iterator[str]:
+    """
+    Synchronous wrapper over astream_llm(). Exits the CLI on LLM errors.
+    Not subject to the concurrency limit; prefer call_llm()/acall_llm().
+    """
+    try:
+        yield from iterate_sync(astream_llm(prompt_text, step_name, model_alias, record=record))
+    except LLMError as e:
+        console.print(f"[bold red]❌ LLM Error:[/bold red] {e}")
+        sys.exit(1)
+
+
+def call_llm(
+    prompt_text: str,
+    step_name: str,
+    model_alias: str = "default",
+    on_event: Optional[FileBlockCallback] = None,
+    stop_after: Optional[str] = None,
+    timeout: Optional[float] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+) -> str:
+    """
+    Calls the LLM with the given prompt and waits for the full response.
+    Synchronous wrapper over acall_llm(); see it for the arguments.
+
+    Returns:
+        The LLM response as a string.
+    """
+    try:
+        return run_sync(acall_llm(
+            prompt_text,
+            step_name,
+            model_alias=model_alias,
+            on_event=on_event,
+            stop_after=stop_after,
+            timeout=timeout,
+            retry_policy=retry_policy,
+        ))
+    except LLMError as e:
         console.print(f"[bold red]❌ LLM Error:[/bold red] {e}")
         sys.exit(1)
@@ -0,0 +1,128 @@
+"""
+Hedged LLM requests.
+
+If the primary stream has not produced its first event within a threshold
+learned from the step's own latency history, a duplicate request is fired;
+whichever stream answers first is kept and the other is cancelled.
+"""
+import asyncio
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence
+
+from vibe.llm.telemetry import CallRecord
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Attributes:
+        enabled: Whether hedging is active.
+        percentile: Time-to-first-token percentile (0-100) used as the hedge threshold.
+        min_samples: History needed before a step is hedged at all.
+        budget: Maximum fraction of extra requests (0.1 = at most 10% more calls).
+        min_threshold_s: Lower bound on the threshold, to avoid hedging fast calls.
+    """
+    enabled: bool = False
+    percentile: float = 95.0
+    min_samples: int = 20
+    budget: float = 0.1
+    min_threshold_s: float = 1.0
+
+    def threshold(self, ttft_samples_ms: Sequence[float]) -> Optional[float]:
+        """
+        Seconds to wait for a first token before hedging, or None if history is too short.
+
+        Args:
+            ttft_samples_ms: Recent time-to-first-token samples for the step.
+        """
+        if len(ttft_samples_ms) < self.min_samples:
+            return None
+        return max(self.min_threshold_s, percentile(ttft_samples_ms, self.percentile) / 1000)
+
+
+DEFAULT_HEDGE_POLICY = HedgePolicy(enabled=os.environ.get("VIBE_LLM_HEDGE") == "1")
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+async def _discard(task: "asyncio.Future[Any]", stream: AsyncIterator[Any]) -> None:
+    """Cancels a pending first-event fetch and closes its stream."""
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+async def hedged_stream(
+    open_stream: Callable[[], AsyncIterator[Any]],
+    threshold: Optional[float],
+    may_hedge: Callable[[], bool],
+    record: Optional[CallRecord] = None,
+) -> AsyncIterator[Any]:
+    """
+    Yields events from whichever of the primary or hedge stream answers first.
+
+    Args:
+        open_stream: Opens a fresh provider stream.
+        threshold: Seconds to wait for the primary's first event; None disables hedging.
+        may_hedge: Budget check consulted right before firing the hedge.
+        record: Telemetry record updated with hedged / hedge_won.
+    """
+    primary = open_stream()
+    first = asyncio.ensure_future(primary.__anext__())
+    streams: List[AsyncIterator[Any]] = [primary]
+    fetches: List["asyncio.Future[Any]"] = [first]
+    winner = 0
+
+    try:
+        if threshold is not None and not (await asyncio.wait({first}, timeout=threshold))[0] and may_hedge():
+            secondary = open_stream()
+            streams.append(secondary)
+            fetches.append(asyncio.ensure_future(secondary.__anext__()))
+            if record is not None:
+                record.hedged = True
+
+            pending = set(fetches)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer a fetch that produced an event; a failed one only wins if both fail
+                succeeded = [f for f in done if not f.cancelled() and f.exception() is None]
+                if succeeded:
+                    winner = fetches.index(succeeded[0])
+                    break
+                winner = fetches.index(next(iter(done)))
+            if record is not None:
+                record.hedge_won = winner == 1
+
+            for index, fetch in enumerate(fetches):
+                if index != winner:
+                    await _discard(fetch, streams[index])
+
+        try:
+            event = await fetches[winner]
+        except StopAsyncIteration:
+            return
+        yield event
+        async for event in streams[winner]:
+            yield event
+    finally:
+        for index, fetch in enumerate(fetches):
+            if not fetch.done():
+                await _discard(fetch, streams[index])
+        aclose = getattr(streams[winner], "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -1,26 +1,209 @@
 """
 LLM Response Parser for Vibe-CLI.
+
+A response is scanned once into a FileIndex of every |||FILE: name||| block.
+Offsets refer to the UTF-8 encoding of the response, so block bodies can be
+handed out as memoryview slices without copying.
 """
-import re
-from typing import Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Block markers emitted by the prompt templates
+FILE_START_PREFIX = "|||FILE: "
+MARKER_SUFFIX = "|||"
+FILE_END_MARKER = "|||END_FILE|||"
+
+# Longest filename accepted between the FILE marker delimiters
+MAX_FILENAME_LENGTH = 255
+
+_START = FILE_START_PREFIX.encode()
+_SUFFIX = MARKER_SUFFIX.encode()
+_END = FILE_END_MARKER.encode()
+_FENCE = b"```"
+_WHITESPACE = b" \t\r\n\x0b\x0c"
+
+
+@dataclass(frozen=True)
+class FileBlock:
+    """
+    Location of one file block inside a response.
+
+    Attributes:
+        name: Filename given in the FILE marker.
+        start: Byte offset where the stripped content begins.
+        end: Byte offset where the stripped content ends (exclusive).
+        terminated: False if the block never saw |||END_FILE||| (truncated
+            response, or another FILE marker started first).
+        fence: (start, end) of the code inside a ``` fence wrapping the whole
+            content, or None if the content is not fenced.
+    """
+    name: str
+    start: int
+    end: int
+    terminated: bool = True
+    fence: Optional[Tuple[int, int]] = None
+
+    @property
+    def fenced(self) -> bool:
+        return self.fence is not None
+
+
+def _strip(data: bytes, start: int, end: int) -> Tuple[int, int]:
+    while start < end and data[start] in _WHITESPACE:
+        start += 1
+    while end > start and data[end - 1] in _WHITESPACE:
+        end -= 1
+    return start, end
+
+
+def _fence_span(data: bytes, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Span inside a ```lang ... ``` fence covering all of data[start:end]."""
+    if end - start < 2 * len(_FENCE) or not data.startswith(_FENCE, start) or not data.endswith(_FENCE, start, end):
+        return None
+    line_end = data.find(b"\n", start, end)
+    if line_end == -1:
+        return None
+    return _strip(data, line_end + 1, end - len(_FENCE))
+
+
+class FileIndex:
+    """
+    All file blocks of a response, in order of appearance.
+    Duplicate names are kept; lookups by name return the first terminated block.
+    """
+
+    def __init__(self, data: bytes, blocks: List[FileBlock]):
+        self.data = data
+        self.blocks = blocks
+        self._by_name: Dict[str, List[FileBlock]] = {}
+        for block in blocks:
+            self._by_name.setdefault(block.name, []).append(block)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __iter__(self) -> Iterator[FileBlock]:
+        return iter(self.blocks)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def names(self) -> List[str]:
+        """Distinct block names, in order of first appearance."""
+        return list(self._by_name)
+
+    def all(self, name: str) -> List[FileBlock]:
+        """Every block with the given name, including unterminated ones."""
+        return list(self._by_name.get(name, []))
+
+    def duplicates(self) -> Dict[str, int]:
+        """Names that appear more than once, with their block counts."""
+        return {name: len(blocks) for name, blocks in self._by_name.items() if len(blocks) > 1}
+
+    def get(self, name: str, allow_unterminated: bool = False) -> Optional[FileBlock]:
+        """
+        First block with the given name.
+
+        Args:
+            name: Filename to look up.
+            allow_unterminated: Fall back to a block missing its END_FILE marker.
+        """
+        blocks = self._by_name.get(name, [])
+        for block in blocks:
+            if block.terminated:
+                return block
+        if allow_unterminated and blocks:
+            return blocks[0]
+        return None
+
+    def _span(self, block: FileBlock, unfence: bool) -> Tuple[int, int]:
+        if unfence and block.fence is not None:
+            return block.fence
+        return block.start, block.end
+
+    def view(self, block: FileBlock, unfence: bool = False) -> memoryview:
+        """Zero-copy view of a block's content bytes."""
+        start, end = self._span(block, unfence)
+        return memoryview(self.data)[start:end]
+
+    def text(self, block: FileBlock, unfence: bool = False) -> str:
+        """Decoded content of a block."""
+        start, end = self._span(block, unfence)
+        return self.data[start:end].decode("utf-8")
+
+
+def parse_file_blocks(response: Union[str, bytes]) -> FileIndex:
+    """
+    Scans a response once and indexes every |||FILE: name||| block.
+
+    Args:
+        response: The raw LLM response (str, or its UTF-8 bytes).
+
+    Returns:
+        A FileIndex over the response's UTF-8 bytes.
+    """
+    data = response.encode("utf-8") if isinstance(response, str) else bytes(response)
+    blocks: List[FileBlock] = []
+    size = len(data)
+    pos = 0
+    # Next marker positions are remembered so no byte is searched twice
+    next_start = data.find(_START)
+    next_end = data.find(_END)
+
+    while next_start != -1:
+        name_start = next_start + len(_START)
+        name_end = data.find(_SUFFIX, name_start, name_start + MAX_FILENAME_LENGTH + len(_SUFFIX))
+        name = data[name_start:name_end] if name_end != -1 else b""
+        if name_end == -1 or b"\n" in name or not name.strip():
+            # Not a real marker; keep looking after it
+            next_start = data.find(_START, name_start)
+            continue
+
+        pos = name_end + len(_SUFFIX)
+        if next_end != -1 and next_end < pos:
+            next_end = data.find(_END, pos)
+        next_start = data.find(_START, pos)
+
+        terminated = next_end != -1 and (next_start == -1 or next_end < next_start)
+        content_end = next_end if terminated else (next_start if next_start != -1 else size)
+        start, end = _strip(data, pos, content_end)
+        blocks.append(FileBlock(
+            name=name.decode("utf-8", errors="replace").strip(),
+            start=start,
+            end=end,
+            terminated=terminated,
+            fence=_fence_span(data, start, end),
+        ))
+
+        if terminated:
+            pos = next_end + len(_END)
+            next_end = data.find(_END, pos)
+            if next_start != -1 and next_start < pos:
+                next_start = data.find(_START, pos)
+
+    return FileIndex(data, blocks)
+
+
+@lru_cache(maxsize=4)
+def _cached_index(response: str) -> FileIndex:
+    # Callers typically extract several files from the same response
+    return parse_file_blocks(response)
 
 
 def extract_file_content(response: str, filename: str) -> Optional[str]:
     """
     Extracts content between |||FILE: filename||| and |||END_FILE|||.
-    
+
     Args:
         response: The raw LLM response string.
         filename: The filename to extract (e.g., "productContext.md").
-    
+
     Returns:
         The extracted content, or None if not found.
     """
-    pattern = re.compile(
-        rf"\|\|\|FILE: {re.escape(filename)}\|\|\|(.*?)\|\|\|END_FILE\|\|\|",
-        re.DOTALL
-    )
-    match = pattern.search(response)
-    if match:
-        return match.group(1).strip()
-    return None
+    index = _cached_index(response)
+    block = index.get(filename)
+    if block is None:
+        return None
+    return index.text(block)
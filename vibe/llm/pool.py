@@ -0,0 +1,113 @@
+"""
+Managed LLM client pool for Vibe-CLI.
+
+Clients are created lazily, reused across agent calls and rebuilt when one
+of their config files changes on disk.
+"""
+import os
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PoolKey = Tuple[str, str, str]
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how the pool has been used."""
+    created: int = 0
+    reuses: int = 0
+    reloads: int = 0
+    shutdowns: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _PoolEntry:
+    client: Any
+    signature: Tuple[Optional[int], ...]
+
+
+def _config_signature(*paths: str) -> Tuple[Optional[int], ...]:
+    """Returns the mtime (ns) of each config path, or None if it is missing."""
+    signature = []
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class ClientPool:
+    """
+    Process-wide pool of LLM clients keyed by (user_config, project_config, model).
+    """
+
+    def __init__(self, factory: Callable[[str, str], Any]):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Callable building a client from (user_config, project_config).
+        """
+        self._factory = factory
+        self._entries: Dict[PoolKey, _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self.stats = PoolStats()
+
+    def get(self, user_config: str, project_config: str, model: str = "default") -> Any:
+        """
+        Get a warm client, creating or reloading it if necessary.
+
+        Args:
+            user_config: Path to the user config file.
+            project_config: Path to the project config file.
+            model: Model alias the client will be used with.
+
+        Returns:
+            The pooled client instance.
+        """
+        key = (user_config, project_config, model)
+        signature = _config_signature(user_config, project_config)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self.stats.reuses += 1
+                return entry.client
+
+            if entry is not None:
+                # Config changed on disk: drop the stale client
+                _close_client(entry.client)
+                self.stats.reloads += 1
+
+            client = self._factory(user_config, project_config)
+            self._entries[key] = _PoolEntry(client=client, signature=signature)
+            self.stats.created += 1
+            return client
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def shutdown(self) -> None:
+        """Closes and forgets every pooled client."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            if entries:
+                self.stats.shutdowns += 1
+        for entry in entries:
+            _close_client(entry.client)
+
+
+def _close_client(client: Any) -> None:
+    """Best-effort close for clients exposing close()."""
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
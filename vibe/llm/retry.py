@@ -0,0 +1,88 @@
+"""
+Retry policy for LLM calls.
+"""
+import asyncio
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# HTTP statuses worth retrying (timeouts, conflicts, throttling, server errors)
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Provider messages that indicate a transient condition. Status codes only
+# count next to "status"/"HTTP", so "max_tokens must be <= 500" is not retried.
+_RETRYABLE_MESSAGE = re.compile(
+    r"\b(?:status(?:[ _]code)?|http(?:/[\d.]+)?|error code)\s*[:=]?\s*(?:408|409|425|429|5\d\d)\b|"
+    r"rate.?limit|too many requests|timed out|deadline exceeded|gateway timeout|bad gateway|"
+    r"internal server error|temporarily unavailable|service unavailable|overloaded|resource.?exhausted|"
+    r"connection (?:reset|aborted|refused|error)",
+    re.IGNORECASE,
+)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Classifies an exception (and its causes) as transient.
+
+    Args:
+        error: The exception raised by an LLM attempt.
+
+    Returns:
+        True if retrying may succeed.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+            return True
+        for attr in ("status_code", "status", "code", "http_status"):
+            value = getattr(current, attr, None)
+            if isinstance(value, int) and value in RETRYABLE_STATUS_CODES:
+                return True
+        if _RETRYABLE_MESSAGE.search(str(current)):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Jittered exponential backoff.
+
+    Attributes:
+        max_attempts: Total attempts including the first one.
+        backoff_base: Delay before the first retry, in seconds.
+        backoff_cap: Upper bound for a single delay, in seconds.
+        jitter: Fraction of each delay that is randomised (0 = none, 1 = full jitter).
+        deadline: Overall budget in seconds for all attempts and waits (None = unbounded).
+        retryable: Predicate deciding whether an error is transient.
+    """
+    max_attempts: int = 4
+    backoff_base: float = 1.0
+    backoff_cap: float = 30.0
+    jitter: float = 1.0
+    deadline: Optional[float] = 600.0
+    retryable: Callable[[BaseException], bool] = field(default=is_retryable_error, repr=False)
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        Delay before the given retry (1 = first retry).
+
+        Args:
+            retry_number: How many attempts have failed so far.
+
+        Returns:
+            Seconds to wait.
+        """
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** (retry_number - 1)))
+        jitter = min(max(self.jitter, 0.0), 1.0)
+        return delay * (1 - jitter) + random.uniform(0, delay * jitter)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+# Single attempt, for callers that handle failures themselves
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,146 @@
+"""
+Incremental |||FILE||| block extraction for streamed LLM responses.
+"""
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, Iterable, List, Optional
+
+from vibe.llm.parser import FILE_START_PREFIX, MARKER_SUFFIX, FILE_END_MARKER, MAX_FILENAME_LENGTH
+
+
+@dataclass
+class FileBlockEvent:
+    """
+    Emitted while a response streams in.
+
+    kind is "start" when a |||FILE: name||| marker closes, "chunk" for raw text
+    inside the block and "end" when |||END_FILE||| arrives. For "end", text holds
+    the full stripped block content (same as extract_file_content would return).
+    """
+    kind: str
+    filename: str
+    text: str = ""
+
+
+FileBlockCallback = Callable[[FileBlockEvent], None]
+
+
+class IncrementalFileParser:
+    """
+    Recognises FILE/END_FILE boundaries across arbitrary chunk splits.
+    Only a marker-sized tail is buffered between feeds.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._current: Optional[str] = None
+        self._parts: List[str] = []
+        self.completed: List[str] = []
+
+    @property
+    def current_file(self) -> Optional[str]:
+        """Name of the block currently being streamed, if any."""
+        return self._current
+
+    def feed(self, delta: str) -> List[FileBlockEvent]:
+        """
+        Consume a chunk of the response.
+
+        Args:
+            delta: The next piece of streamed text.
+
+        Returns:
+            Events recognised so far, in order.
+        """
+        self._buffer += delta
+        events: List[FileBlockEvent] = []
+
+        while True:
+            if self._current is None:
+                start = self._buffer.find(FILE_START_PREFIX)
+                if start == -1:
+                    # Keep only what could be the beginning of a marker
+                    self._buffer = self._buffer[-(len(FILE_START_PREFIX) - 1):]
+                    break
+                name_start = start + len(FILE_START_PREFIX)
+                name_end = self._buffer.find(MARKER_SUFFIX, name_start)
+                if name_end == -1:
+                    if len(self._buffer) - name_start > MAX_FILENAME_LENGTH:
+                        # Not a real marker; skip past it
+                        self._buffer = self._buffer[name_start:]
+                        continue
+                    self._buffer = self._buffer[start:]
+                    break
+                self._current = self._buffer[name_start:name_end]
+                self._parts = []
+                self._buffer = self._buffer[name_end + len(MARKER_SUFFIX):]
+                events.append(FileBlockEvent("start", self._current))
+            else:
+                end = self._buffer.find(FILE_END_MARKER)
+                if end == -1:
+                    safe = len(self._buffer) - (len(FILE_END_MARKER) - 1)
+                    if safe > 0:
+                        self._emit_chunk(self._buffer[:safe], events)
+                        self._buffer = self._buffer[safe:]
+                    break
+                self._emit_chunk(self._buffer[:end], events)
+                self._buffer = self._buffer[end + len(FILE_END_MARKER):]
+                content = "".join(self._parts).strip()
+                events.append(FileBlockEvent("end", self._current, content))
+                self.completed.append(self._current)
+                self._current = None
+                self._parts = []
+
+        return events
+
+    def _emit_chunk(self, text: str, events: List[FileBlockEvent]) -> None:
+        if text:
+            self._parts.append(text)
+            events.append(FileBlockEvent("chunk", self._current, text))
+
+
+class ContextStreamWriter:
+    """
+    FileBlockCallback that writes selected blocks into a context directory as they stream.
+    The file grows with each chunk and is rewritten with the stripped content when the block ends.
+    """
+
+    def __init__(self, context_dir: Path, filenames: Optional[Iterable[str]] = None):
+        """
+        Args:
+            context_dir: Directory receiving the files (e.g. project/.context).
+            filenames: Block names to write. None accepts any plain filename.
+        """
+        self.context_dir = Path(context_dir)
+        self.filenames = set(filenames) if filenames is not None else None
+        self.written: List[Path] = []
+        self._handle: Optional[IO[str]] = None
+
+    def _accepts(self, filename: str) -> bool:
+        if self.filenames is not None:
+            return filename in self.filenames
+        # Never let a model-provided name escape the context directory
+        return bool(filename) and os.path.basename(filename) == filename and filename not in (".", "..")
+
+    def __call__(self, event: FileBlockEvent) -> None:
+        if not self._accepts(event.filename):
+            return
+        path = self.context_dir / event.filename
+
+        if event.kind == "start":
+            self.close()
+            self.context_dir.mkdir(parents=True, exist_ok=True)
+            self._handle = open(path, "w", encoding="utf-8")
+        elif event.kind == "chunk" and self._handle is not None:
+            self._handle.write(event.text)
+            self._handle.flush()
+        elif event.kind == "end":
+            self.close()
+            path.write_text(event.text, encoding="utf-8")
+            self.written.append(path)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
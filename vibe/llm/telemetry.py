@@ -0,0 +1,240 @@
+"""
+Per-call LLM telemetry for Vibe-CLI.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# Weight of the newest observation in exponentially weighted averages
+EWMA_ALPHA = 0.3
+
+# Early-stopped calls between full-length calibration runs
+CALIBRATION_INTERVAL = 20
+
+# Latency samples kept per step
+LATENCY_WINDOW = 200
+
+# CallRecords kept in memory; older ones only count towards the totals
+RECORD_WINDOW = 1000
+
+# Hedge counters are halved once this many calls have been counted
+HEDGE_COUNTER_WINDOW = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used when the provider reports no usage."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class CallRecord:
+    """Timing and volume of a single LLM call."""
+    step_name: str
+    model_alias: str = "default"
+    cached: bool = False
+    started_at: float = 0.0
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    output_chars: int = 0
+    output_tokens: int = 0
+    early_stopped: bool = False
+    saved_tokens: int = 0
+    saved_ms: float = 0.0
+    attempts: int = 0
+    retry_wait_s: float = 0.0
+    error: Optional[str] = None
+    hedged: bool = False
+    hedge_won: bool = False
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        """Time to first token in milliseconds."""
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self.started_at) * 1000
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000
+
+    @property
+    def tokens_per_sec(self) -> Optional[float]:
+        """Generation throughput measured from the first token to the end of the stream."""
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        elapsed = self.finished_at - self.first_token_at
+        if elapsed <= 0:
+            return None
+        return self.output_tokens / elapsed
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(
+            ttft_ms=self.ttft_ms,
+            duration_ms=self.duration_ms,
+            tokens_per_sec=self.tokens_per_sec,
+        )
+        return data
+
+
+class Telemetry:
+    """Thread-safe collector of CallRecords for the current process."""
+
+    def __init__(self, max_records: int = RECORD_WINDOW):
+        """
+        Args:
+            max_records: Most recent records kept; long-lived workers make
+                         unbounded numbers of calls.
+        """
+        self._records: Deque[CallRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        # Totals of the records that dropped out of the window
+        self._retired = {"retries": 0, "wait_s": 0.0}
+
+    def start(self, step_name: str, model_alias: str = "default") -> CallRecord:
+        """Creates and registers a record for a call that starts now."""
+        record = CallRecord(step_name=step_name, model_alias=model_alias, started_at=time.monotonic())
+        with self._lock:
+            if len(self._records) == self._records.maxlen:
+                # Records are updated until their call ends, so fold them in only when dropped
+                oldest = self._records[0]
+                self._retired["retries"] += max(oldest.attempts - 1, 0)
+                self._retired["wait_s"] += oldest.retry_wait_s
+            self._records.append(record)
+        return record
+
+    @property
+    def records(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def last(self, step_name: Optional[str] = None) -> Optional[CallRecord]:
+        """Returns the most recent record, optionally for a given step."""
+        with self._lock:
+            for record in reversed(self._records):
+                if step_name is None or record.step_name == step_name:
+                    return record
+        return None
+
+    def retry_totals(self) -> Dict[str, float]:
+        """Retries performed and seconds spent backing off, across every call of the process."""
+        with self._lock:
+            return {
+                "retries": self._retired["retries"] + sum(max(r.attempts - 1, 0) for r in self._records),
+                "wait_s": self._retired["wait_s"] + sum(r.retry_wait_s for r in self._records),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._retired = {"retries": 0, "wait_s": 0.0}
+
+
+class StageHistory:
+    """
+    Small JSON store of per-step statistics that outlive a single process.
+    Keeps an EWMA of the chatter models emit after the block a step needs,
+    recent latency samples, and counters for the hedging budget.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # History is an optimisation aid, never fatal
+
+    def observe_trailing(self, step_name: str, tokens: int) -> None:
+        """Records how many tokens followed the needed block in a full response."""
+        with self._lock:
+            stage = self._load().setdefault(step_name, {})
+            previous = stage.get("trailing_tokens")
+            stage["trailing_tokens"] = tokens if previous is None else (
+                EWMA_ALPHA * tokens + (1 - EWMA_ALPHA) * previous
+            )
+            stage["stops_since_calibration"] = 0
+            self._save()
+
+    def observe_stop(self, step_name: str) -> None:
+        """Counts an early-stopped call towards the next calibration run."""
+        with self._lock:
+            stage = self._load().setdefault(step_name, {})
+            stage["stops_since_calibration"] = stage.get("stops_since_calibration", 0) + 1
+            self._save()
+
+    def needs_calibration(self, step_name: str) -> bool:
+        """
+        True if the next call should run to completion so trailing chatter can be measured.
+        Happens when there is no history yet, and periodically afterwards.
+        """
+        with self._lock:
+            stage = self._load().get(step_name, {})
+            if stage.get("trailing_tokens") is None:
+                return True
+            return stage.get("stops_since_calibration", 0) >= CALIBRATION_INTERVAL
+
+    def expected_trailing(self, step_name: str) -> Optional[float]:
+        """Expected trailing tokens for a step, or None without history."""
+        with self._lock:
+            return self._load().get(step_name, {}).get("trailing_tokens")
+
+    def observe_latency(self, step_name: str, ttft_ms: Optional[float], duration_ms: Optional[float]) -> None:
+        """Appends latency samples for a completed provider call."""
+        with self._lock:
+            stage = self._load().setdefault(step_name, {})
+            for key, value in (("ttft_ms", ttft_ms), ("duration_ms", duration_ms)):
+                if value is None:
+                    continue
+                samples = stage.setdefault(key, [])
+                samples.append(round(value, 1))
+                del samples[:-LATENCY_WINDOW]
+            self._save()
+
+    def latencies(self, step_name: str, kind: str = "ttft_ms") -> List[float]:
+        """Recent latency samples for a step ("ttft_ms" or "duration_ms")."""
+        with self._lock:
+            return list(self._load().get(step_name, {}).get(kind, []))
+
+    def hedge_allowed(self, budget: float) -> bool:
+        """True if firing one more hedge keeps hedges within budget * calls."""
+        with self._lock:
+            counters = self._load().get("__hedging__", {})
+            return counters.get("hedges", 0) + 1 <= budget * counters.get("calls", 0)
+
+    def count_call(self, hedged: bool) -> None:
+        """Counts a hedge-eligible call towards the hedging budget."""
+        with self._lock:
+            counters = self._load().setdefault("__hedging__", {"calls": 0, "hedges": 0})
+            counters["calls"] += 1
+            counters["hedges"] += int(hedged)
+            if counters["calls"] > HEDGE_COUNTER_WINDOW:
+                counters["calls"] //= 2
+                counters["hedges"] //= 2
+            self._save()
+
+
+telemetry = Telemetry()
@@ -2,7 +2,19 @@
 Vibe-CLI Templates Module.
 """
 from vibe.templates.loader import TemplateLoader
+from vibe.templates.pack import TemplatePack, build_pack
+from vibe.templates.render import CompiledTemplate, TemplateRenderError, compile_template, render, render_checked
+from vibe.templates.store import TEMPLATE_STORE, TemplateStore
 
 __all__ = [
     "TemplateLoader",
+    "TemplateStore",
+    "TEMPLATE_STORE",
+    "TemplatePack",
+    "build_pack",
+    "CompiledTemplate",
+    "TemplateRenderError",
+    "compile_template",
+    "render",
+    "render_checked",
 ]
@@ -4,6 +4,8 @@ Template Loader for Vibe-CLI.
 from pathlib import Path
 from typing import Optional
 from vibe.cli.console import console
+from vibe.templates.store import TEMPLATE_STORE, TemplateStore
+from vibe.templates.render import render
 
 
 class TemplateLoader:
@@ -11,14 +13,16 @@ class TemplateLoader:
     Loads and manages template files.
     """
 
-    def __init__(self, templates_dir: Path):
+    def __init__(self, templates_dir: Path, store: Optional[TemplateStore] = None):
         """
         Initialize the loader with a templates directory.
         
         Args:
             templates_dir: Path to the templates directory.
+            store: Template cache to read through (defaults to the shared store).
         """
         self.templates_dir = templates_dir
+        self.store = store if store is not None else TEMPLATE_STORE
 
     def load(self, filename: str, subfolder: Optional[str] = None) -> str:
         """
@@ -39,10 +43,7 @@ class TemplateLoader:
         else:
             path = self.templates_dir / filename
 
-        if not path.exists():
-            raise FileNotFoundError(f"Template not found: {path}")
-
-        return path.read_text(encoding="utf-8")
+        return self.store.read(path)
 
     def load_prompt(self, filename: str) -> str:
         """Load a prompt template."""
@@ -52,19 +53,16 @@ class TemplateLoader:
         """Load a rule template."""
         return self.load(filename, "rules")
 
-    def render(self, template: str, **kwargs) -> str:
+    def render(self, template: str, strict: bool = False, **kwargs) -> str:
         """
         Render a template with variable substitution.
         
         Args:
             template: Template string with {{variable}} placeholders.
+            strict: Raise TemplateRenderError on missing or unknown variables.
             **kwargs: Variables to substitute.
         
         Returns:
             Rendered template string.
         """
-        result = template
-        for key, value in kwargs.items():
-            placeholder = "{{" + key + "}}"
-            result = result.replace(placeholder, str(value))
-        return result
+        return render(template, strict=strict, **kwargs)
@@ -0,0 +1,244 @@
+"""
+Precompiled template pack.
+
+`vibe pack-templates` bundles the whole vibe/templates tree into a
+single indexed file (templates.pack next to this module). At runtime the
+TemplateStore maps it once and serves templates, listings and hashes from
+memory, so a cold `create` does one open() instead of a stat(), open() and
+read per template; paths missing from the pack fall back to the directory.
+Each entry also records the mtime of the file it was packed from. In dev
+mode (a source checkout, or VIBE_TEMPLATE_DEV=1) every packed template is
+checked against the directory before it is served and folders are walked,
+so a stale pack never hides edited, removed or added templates.
+
+Layout: MAGIC, an 8-byte little-endian index length, a JSON index of
+{relative path: [offset, length, sha256, mtime_ns]}, then the concatenated blobs.
+Binary assets (images, archives in skills) are packed too, so they can be
+listed and hashed without touching the filesystem; tree() only returns text.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from vibe.config.paths import PACKAGE_ROOT, TEMPLATES_DIR
+
+MAGIC = b"VIBEPACK2\n"
+DEFAULT_PACK_PATH = TEMPLATES_DIR / "templates.pack"
+
+# "0"/"off" disables the pack; any other value is the pack path to use
+PACK_ENV = "VIBE_TEMPLATE_PACK"
+
+# "1" checks packed templates against the directory, "0" trusts the pack;
+# unset means on in a source checkout and off in an installed copy
+DEV_ENV = "VIBE_TEMPLATE_DEV"
+
+_HEADER = struct.Struct("<Q")
+
+
+def dev_mode() -> bool:
+    """True if templates may be edited after packing (see DEV_ENV)."""
+    setting = os.environ.get(DEV_ENV, "").lower()
+    if setting:
+        return setting in ("1", "true", "yes", "on")
+    return (PACKAGE_ROOT.parent / ".git").exists()
+
+# Templates only: build artefacts and the package's own modules stay out
+_SKIP_DIRS = {"__pycache__"}
+# The one module at the package root that is a template (copied into projects)
+_SHIPPED_MODULES = {"preflight.py"}
+
+
+def _is_template(name: str, at_root: bool) -> bool:
+    if name.endswith(".pyc"):
+        return False
+    if at_root and (name.endswith(".pack") or (name.endswith(".py") and name not in _SHIPPED_MODULES)):
+        return False
+    return True
+
+
+def _collect(root: Path) -> List[Tuple[str, bytes, int]]:
+    files: List[Tuple[str, bytes, int]] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+        at_root = os.path.samefile(dirpath, root)
+        for name in sorted(filenames):
+            if not _is_template(name, at_root):
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                data = f.read()
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            files.append((Path(os.path.relpath(path, root)).as_posix(), data, mtime_ns))
+    return files
+
+
+def build_pack(root: Path = TEMPLATES_DIR, output: Path = DEFAULT_PACK_PATH) -> int:
+    """
+    Writes the template pack for a template tree.
+
+    Args:
+        root: Template directory to bundle.
+        output: Pack file to (atomically) write.
+
+    Returns:
+        Number of templates in the pack.
+    """
+    index: Dict[str, List] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for rel_path, data, mtime_ns in _collect(Path(root)):
+        index[rel_path] = [offset, len(data), hashlib.sha256(data).hexdigest(), mtime_ns]
+        blobs.append(data)
+        offset += len(data)
+
+    index_bytes = json.dumps(index, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(len(index_bytes)))
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, output)
+    return len(index)
+
+
+class TemplatePack:
+    """
+    Read-only view of a template pack, backed by one mmap.
+    """
+
+    def __init__(self, path: Union[str, Path], root: Union[str, Path] = TEMPLATES_DIR, verify: bool = False):
+        """
+        Args:
+            path: Pack file.
+            root: Directory the packed paths are relative to.
+            verify: Dev mode: TemplateStore serves an entry only while fresh()
+                    and lists folders from the directory.
+
+        Raises:
+            ValueError: If the file is not a template pack.
+        """
+        self.path = Path(path)
+        self.root = os.path.abspath(root)
+        self.verify = verify
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a template pack")
+        start = len(MAGIC) + _HEADER.size
+        (index_len,) = _HEADER.unpack(self._map[len(MAGIC):start])
+        self._index: Dict[str, List] = json.loads(self._map[start:start + index_len].decode("utf-8"))
+        self._data_start = start + index_len
+        self._texts: Dict[str, str] = {}
+
+    def relative(self, path: Union[str, Path]) -> Optional[str]:
+        """Pack key of an absolute path, or None if it lies outside the pack root."""
+        path = os.path.abspath(path)
+        if path != self.root and not path.startswith(self.root + os.sep):
+            return None
+        return Path(os.path.relpath(path, self.root)).as_posix()
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._index
+
+    def names(self) -> List[str]:
+        return sorted(self._index)
+
+    def fresh(self, rel_path: str) -> bool:
+        """
+        True if the file is packed and unchanged on disk since (same size and
+        mtime). Costs one stat(); the content is not read.
+        """
+        entry = self._index.get(rel_path)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(os.path.join(self.root, rel_path))
+        except OSError:
+            return False
+        return st.st_size == entry[1] and st.st_mtime_ns == entry[3]
+
+    def read(self, rel_path: str) -> str:
+        """
+        Returns a packed template.
+
+        Raises:
+            FileNotFoundError: If the template is not in the pack.
+            UnicodeDecodeError: If it is a binary asset.
+        """
+        text = self._texts.get(rel_path)
+        if text is None:
+            text = self.read_bytes(rel_path).decode("utf-8")
+            self._texts[rel_path] = text
+        return text
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        """
+        Returns a packed file's bytes (text or binary).
+
+        Raises:
+            FileNotFoundError: If the file is not in the pack.
+        """
+        try:
+            offset, length = self._index[rel_path][:2]
+        except KeyError:
+            raise FileNotFoundError(f"Template not found: {rel_path} (not in {self.path.name})") from None
+        start = self._data_start + offset
+        return self._map[start:start + length]
+
+    def sha256(self, rel_path: str) -> str:
+        """Precomputed content hash of a packed template."""
+        return self._index[rel_path][2]
+
+    def tree(self, rel_folder: str) -> Dict[str, str]:
+        """Packed templates below a folder, keyed by path relative to it."""
+        prefix = self._prefix(rel_folder)
+        files: Dict[str, str] = {}
+        for name in self.names():
+            if not name.startswith(prefix):
+                continue
+            try:
+                files[name[len(prefix):]] = self.read(name)
+            except UnicodeDecodeError:
+                continue  # Binary asset
+        return files
+
+    def list(self, rel_folder: str) -> List[str]:
+        """Packed files (text and binary) below a folder, relative to it."""
+        prefix = self._prefix(rel_folder)
+        return [name[len(prefix):] for name in self.names() if name.startswith(prefix)]
+
+    @staticmethod
+    def _prefix(rel_folder: str) -> str:
+        return "" if rel_folder == "." else rel_folder.rstrip("/") + "/"
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def load_default_pack() -> Optional[TemplatePack]:
+    """
+    Opens the pack runtime templates are served from.
+
+    Returns:
+        The pack (verified against the directory in dev mode), or None to
+        read templates from the directory (no pack built, or disabled with
+        VIBE_TEMPLATE_PACK=0).
+    """
+    setting = os.environ.get(PACK_ENV, "")
+    if setting.lower() in ("0", "off", "false", "no"):
+        return None
+    path = Path(setting) if setting else DEFAULT_PACK_PATH
+    try:
+        return TemplatePack(path, verify=dev_mode())
+    except (OSError, ValueError):
+        return None
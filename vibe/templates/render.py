@@ -0,0 +1,138 @@
+"""
+Compiled placeholder rendering for Vibe-CLI templates.
+
+A template is split once into literal segments and `{{name}}` slots, so
+rendering is a single join instead of one full scan-and-copy per
+placeholder. Values are inserted in one pass: a value that itself contains
+`{{...}}` (e.g. a user request quoting a template) is never expanded again.
+
+Only the exact form `{{name}}` is a slot. Spaced forms such as
+`{{ target_file }}` are literal text that generated skills keep verbatim.
+
+Prompts are rendered strictly: a misspelled slot raises instead of reaching
+the LLM. Generated files use render_checked(), which fills what it can and
+warns about slots nothing fills (other than declared pass-through slots that
+a later stage renders, like `{{SKILLS_DIR}}` in skills).
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+from vibe.cli.console import console
+
+PLACEHOLDER_RE = re.compile(r"\{\{([A-Za-z_][A-Za-z0-9_]*)\}\}")
+
+
+class TemplateRenderError(ValueError):
+    """Raised by strict rendering when slots and values do not match."""
+
+    def __init__(self, missing: List[str], unknown: List[str]):
+        self.missing = missing
+        self.unknown = unknown
+        problems = []
+        if missing:
+            problems.append(f"missing values for {', '.join(missing)}")
+        if unknown:
+            problems.append(f"unknown placeholders {', '.join(unknown)}")
+        super().__init__("; ".join(problems))
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template parsed into parts; odd indices of `parts` are slot names.
+    """
+    parts: Tuple[str, ...]
+
+    @property
+    def placeholders(self) -> FrozenSet[str]:
+        """Names of all slots in the template."""
+        return frozenset(self.parts[1::2])
+
+    def check(self, values: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """
+        Compares the template's slots with the supplied values.
+
+        Returns:
+            (missing, unknown): slots without a value, and values the template
+            has no slot for, both sorted.
+        """
+        names = self.placeholders
+        return sorted(names - values.keys()), sorted(values.keys() - names)
+
+    def render(self, values: Dict[str, Any], strict: bool = False) -> str:
+        """
+        Fills the slots in one pass.
+
+        Args:
+            values: Slot values (converted with str()).
+            strict: Raise TemplateRenderError on missing or unknown placeholders
+                    instead of leaving unfilled slots as they are.
+
+        Returns:
+            The rendered text.
+        """
+        if strict:
+            missing, unknown = self.check(values)
+            if missing or unknown:
+                raise TemplateRenderError(missing, unknown)
+        out = list(self.parts)
+        for i in range(1, len(out), 2):
+            name = out[i]
+            out[i] = str(values[name]) if name in values else "{{" + name + "}}"
+        return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> CompiledTemplate:
+    """
+    Parses a template once; repeated calls with the same text hit the cache.
+
+    Args:
+        text: Template source with `{{name}}` placeholders.
+
+    Returns:
+        The CompiledTemplate.
+    """
+    return CompiledTemplate(tuple(PLACEHOLDER_RE.split(text)))
+
+
+def render(text: str, strict: bool = False, **values: Any) -> str:
+    """
+    Renders a template string (compiled on first use).
+
+    Args:
+        text: Template source.
+        strict: See CompiledTemplate.render.
+        **values: Slot values.
+    """
+    return compile_template(text).render(values, strict=strict)
+
+
+@lru_cache(maxsize=256)
+def _warn_unfilled(source: str, missing: Tuple[str, ...]) -> None:
+    # Cached: batch runs render the same templates for every project
+    console.print(f"[yellow]⚠️  {source}: no value for placeholder(s) {', '.join(missing)}[/yellow]")
+
+
+def render_checked(text: str, source: str, values: Dict[str, Any], passthrough: Iterable[str] = ()) -> str:
+    """
+    Renders leniently, warning once per template about slots with no value.
+
+    Args:
+        text: Template source.
+        source: Name shown in the warning (e.g. the rule or target file).
+        values: Slot values. Values the template does not use are fine: not
+                every rule mentions {{SKILLS_DIR}}.
+        passthrough: Slots left for a later render, not reported.
+
+    Returns:
+        The rendered text; unfilled slots stay as they are.
+    """
+    compiled = compile_template(text)
+    missing, _ = compiled.check(values)
+    missing = [name for name in missing if name not in passthrough]
+    if missing:
+        _warn_unfilled(source, tuple(missing))
+    return compiled.render(values)
@@ -0,0 +1,237 @@
+"""
+In-process template store for Vibe-CLI.
+
+Templates are read through a single cache keyed by path. Every read costs
+one stat(); the file is only opened again when its mtime or size changed,
+so batch and queue runs that render the same templates thousands of times
+stop re-reading them from disk. When a template pack is built (see
+vibe.templates.pack), templates below its root are served from the pack
+without touching the filesystem; only paths the pack does not hold are read
+from the directory. In dev mode packed templates are used only while they
+match the directory, so edited, removed and new templates are picked up.
+"""
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from vibe.config.paths import TEMPLATES_DIR
+from vibe.templates.pack import TemplatePack, load_default_pack
+
+# Never cached: build artefacts next to the templates
+_SKIP_DIRS = {"__pycache__"}
+_SKIP_SUFFIXES = (".pyc",)
+
+
+@dataclass
+class _Entry:
+    mtime_ns: int
+    size: int
+    text: str
+
+
+class TemplateStore:
+    """
+    Thread-safe cache of template files with stat-based invalidation.
+    """
+
+    def __init__(self, pack: Optional[TemplatePack] = None):
+        """
+        Args:
+            pack: Template pack to serve packed paths from (None = filesystem only).
+        """
+        self.pack = pack
+        self._entries: Dict[str, _Entry] = {}
+        # path -> (mtime_ns, size, sha256 of the bytes) for file_digest
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.abspath(path)
+
+    def _packed(self, key: str) -> Optional[str]:
+        """Pack key of a path if the pack serves it (in dev mode: only while fresh), else None."""
+        if self.pack is None:
+            return None
+        rel_path = self.pack.relative(key)
+        if rel_path is None or rel_path not in self.pack:
+            return None
+        if self.pack.verify and not self.pack.fresh(rel_path):
+            return None
+        return rel_path
+
+    def _packed_folder(self, root: str) -> Optional[List[str]]:
+        """Files below a folder from the pack index, or None to walk the directory (dev mode, or not packed)."""
+        if self.pack is None or self.pack.verify:
+            return None
+        rel_folder = self.pack.relative(root)
+        if rel_folder is None:
+            return None
+        return self.pack.list(rel_folder) or None
+
+    def _load(self, key: str, st: os.stat_result) -> str:
+        with open(key, encoding="utf-8") as f:
+            text = f.read()
+        with self._lock:
+            self._entries[key] = _Entry(st.st_mtime_ns, st.st_size, text)
+            self.misses += 1
+        return text
+
+    def read(self, path: Union[str, Path]) -> str:
+        """
+        Returns the content of a template file.
+
+        Args:
+            path: Template file path.
+
+        Returns:
+            The file content, from the cache if the file is unchanged.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        key = self._key(path)
+        rel_path = self._packed(key)
+        if rel_path is not None:
+            text = self.pack.read(rel_path)
+            with self._lock:
+                self.hits += 1
+            return text
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(key, None)
+            raise FileNotFoundError(f"Template not found: {path}") from None
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            with self._lock:
+                self.hits += 1
+            return entry.text
+        return self._load(key, st)
+
+    def tree(self, folder: Union[str, Path], suffix: Optional[str] = None) -> Dict[str, str]:
+        """
+        Reads every file below a folder through the cache.
+
+        Args:
+            folder: Directory to walk.
+            suffix: Only include files with this suffix (e.g. ".py").
+
+        Returns:
+            Mapping of POSIX path relative to folder to content, sorted by path.
+            Files that are not UTF-8 text are left out.
+        """
+        files: Dict[str, str] = {}
+        root = self._key(folder)
+        names = self._packed_folder(root)
+        if names is not None:
+            for name in names:
+                if suffix and not name.endswith(suffix):
+                    continue
+                try:
+                    files[name] = self.read(Path(root, name))
+                except (OSError, UnicodeDecodeError):
+                    continue
+            return files
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            for name in sorted(filenames):
+                if name.endswith(_SKIP_SUFFIXES) or (suffix and not name.endswith(suffix)):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    files[Path(os.path.relpath(path, root)).as_posix()] = self.read(path)
+                except (OSError, UnicodeDecodeError):
+                    continue
+        return files
+
+    def listing(self, folder: Union[str, Path]) -> Dict[str, Path]:
+        """
+        Lists every file below a folder (text and binary) without reading it.
+
+        Args:
+            folder: Directory to list.
+
+        Returns:
+            Mapping of POSIX path relative to folder to the file's absolute path, sorted by path.
+        """
+        root = self._key(folder)
+        names = self._packed_folder(root)
+        if names is not None:
+            return {name: Path(root, name) for name in names}
+        files: Dict[str, Path] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+            # Relative prefix once per directory, not one relpath() per file
+            rel_dir = Path(os.path.relpath(dirpath, root)).as_posix()
+            prefix = "" if rel_dir == "." else rel_dir + "/"
+            directory = Path(dirpath)
+            for name in sorted(filenames):
+                if not name.endswith(_SKIP_SUFFIXES):
+                    files[prefix + name] = directory / name
+        return dict(sorted(files.items()))
+
+    def file_digest(self, path: Union[str, Path]) -> str:
+        """
+        sha256 of a file's bytes: precomputed for packed files that are
+        unchanged on disk, otherwise hashed once and cached until the file's
+        mtime or size changes.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        key = self._key(path)
+        rel_path = self._packed(key)
+        if rel_path is not None:
+            return self.pack.sha256(rel_path)
+        st = os.stat(key)
+        cached = self._digests.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(key, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._digests[key] = (st.st_mtime_ns, st.st_size, digest.hexdigest())
+        return digest.hexdigest()
+
+    def digest(self, path: Union[str, Path]) -> str:
+        """sha256 of a template (precomputed when it comes from the pack)."""
+        rel_path = self._packed(self._key(path))
+        if rel_path is not None:
+            return self.pack.sha256(rel_path)
+        return hashlib.sha256(self.read(path).encode("utf-8")).hexdigest()
+
+    def preload(self, root: Union[str, Path] = TEMPLATES_DIR) -> int:
+        """
+        Reads a whole template tree into the cache in one pass.
+
+        Args:
+            root: Directory to preload (defaults to the bundled templates).
+
+        Returns:
+            Number of files now cached under root.
+        """
+        return len(self.tree(root))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by read_template, TemplateLoader and the scaffolding
+TEMPLATE_STORE = TemplateStore(pack=load_default_pack())